@@ -0,0 +1,59 @@
+"""Micro-benchmark clean_content against the split/join/regex version it replaced.
+
+Usage: python benchmarks/bench_clean_content.py [--repeat N]
+"""
+
+import argparse
+import re
+import timeit
+
+from nyxdocs.scrapers.processing import clean_content
+
+MAX_LENGTH = 1_000_000
+
+
+def legacy_clean_content(content: str, max_length: int) -> str:
+    """The previous implementation, kept as the reference."""
+    if not content:
+        return ""
+    lines = content.split('\n')
+    cleaned_lines = []
+    for line in lines:
+        cleaned_lines.append(line.strip())
+    cleaned_content = '\n'.join(cleaned_lines)
+    cleaned_content = re.sub(r'\n{3,}', '\n\n', cleaned_content)
+    if len(cleaned_content) > max_length:
+        cleaned_content = cleaned_content[:max_length] + "\n\n[Content truncated]"
+    return cleaned_content.strip()
+
+
+def documents():
+    """Representative inputs: typical extracted pages and an oversized one."""
+    paragraph = "   Liquidity providers earn fees on every swap routed through the pool.   \n"
+    page = ("## Section\n\n\n" + paragraph * 8 + "\n\n\n\n") * 60
+    code = "    const pool = await getPool();  \n" * 4000
+    huge = page * 40
+    return {"page (~40 KB)": page, "code listing (~140 KB)": code, "oversized (~1.6 MB)": huge}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="calls per measurement")
+    args = parser.parse_args()
+
+    for name, content in documents().items():
+        assert clean_content(content, MAX_LENGTH) == legacy_clean_content(content, MAX_LENGTH)
+        legacy = min(timeit.repeat(
+            lambda content=content: legacy_clean_content(content, MAX_LENGTH), number=args.repeat, repeat=3
+        ))
+        current = min(timeit.repeat(
+            lambda content=content: clean_content(content, MAX_LENGTH), number=args.repeat, repeat=3
+        ))
+        print(
+            f"{name:>24}: legacy {legacy / args.repeat * 1000:7.2f} ms, "
+            f"single-pass {current / args.repeat * 1000:7.2f} ms ({legacy / current:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
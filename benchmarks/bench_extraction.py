@@ -0,0 +1,56 @@
+"""Benchmark the HTML extraction engines over the fixture corpus.
+
+Usage: python benchmarks/bench_extraction.py [--repeat N] [--scale N]
+
+``--scale`` repeats each fixture's body to approximate long documentation
+pages; both engines must produce identical output for every document.
+"""
+
+import argparse
+import re
+import time
+from pathlib import Path
+
+from nyxdocs.scrapers.extraction import ENGINES, extract_html
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "html"
+
+
+def load_corpus(scale: int):
+    """Fixture pages, with their body content repeated ``scale`` times."""
+    corpus = []
+    for path in sorted(FIXTURES.glob("*.html")):
+        html = path.read_text(encoding="utf-8")
+        body = re.search(r"<body>(.*)</body>", html, re.S)
+        if body and scale > 1:
+            html = html.replace(body.group(1), body.group(1) * scale)
+        corpus.append((f"https://docs.example.com/{path.stem}", html))
+    return corpus
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="passes over the corpus")
+    parser.add_argument("--scale", type=int, default=50, help="body repetitions per page")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.scale)
+    size = sum(len(html) for _, html in corpus)
+    print(f"{len(corpus)} pages, {size / 1024:.0f} KiB per pass, {args.repeat} passes")
+
+    results = {}
+    timings = {}
+    for engine in ENGINES:
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            results[engine] = [extract_html(html, url, engine) for url, html in corpus]
+        timings[engine] = time.perf_counter() - started
+        per_page = timings[engine] / (args.repeat * len(corpus)) * 1000
+        print(f"{engine:>12}: {timings[engine]:.3f}s ({per_page:.2f} ms/page)")
+
+    assert results["lxml"] == results["html.parser"], "engines disagree"
+    print(f"{'speedup':>12}: {timings['html.parser'] / timings['lxml']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ from rich.table import Table
 from .config import get_settings
 from .database.session import DatabaseManager, set_db_manager
 from .server import create_server
+from .utils.http import close_http_pool
 from .utils.logging import setup_logging
 
 app = typer.Typer(
@@ -92,6 +93,123 @@ def init_db(
         sys.exit(1)
 
 
+@app.command()
+def reindex(
+    database_url: Optional[str] = typer.Option(None, help="Database URL"),
+) -> None:
+    """Rebuild the documentation full-text index."""
+    settings = get_settings()
+    db_url = database_url or settings.get_database_url()
+
+    console.print("[bold blue]Rebuilding full-text index[/bold blue]")
+    console.print(f"Database URL: {db_url}")
+
+    async def _reindex():
+        from .database.fulltext import FullTextIndex
+
+        db_manager = DatabaseManager(db_url)
+        await db_manager.initialize()
+
+        try:
+            async with db_manager.engine.begin() as conn:
+                count = await conn.run_sync(FullTextIndex.rebuild)
+        finally:
+            await db_manager.close()
+
+        console.print(f"[green]Indexed {count:,} documents[/green]")
+
+    try:
+        asyncio.run(_reindex())
+    except Exception as e:
+        console.print(f"[red]Reindexing failed: {e}[/red]")
+        sys.exit(1)
+
+
+@app.command()
+def collect(
+    source: str = typer.Option("coingecko", help="Collector to run (coingecko or github)"),
+    limit: int = typer.Option(1000, help="Maximum number of projects to collect"),
+    database_url: Optional[str] = typer.Option(None, help="Database URL"),
+) -> None:
+    """Collect projects from an external source and upsert them."""
+    settings = get_settings()
+    db_url = database_url or settings.get_database_url()
+
+    console.print(f"[bold blue]Collecting projects from {source}[/bold blue]")
+
+    async def _collect():
+        from .collectors import CoinGeckoCollector, GitHubCollector
+        from .services.ingestion import ProjectIngestor
+
+        collectors = {"coingecko": CoinGeckoCollector, "github": GitHubCollector}
+        if source not in collectors:
+            raise ValueError(f"Unknown source: {source}")
+
+        db_manager = DatabaseManager(db_url)
+        await db_manager.initialize()
+
+        try:
+            async with collectors[source]() as collector:
+                if hasattr(collector, "iter_projects"):
+                    # Stream pages into the ingestor as they arrive
+                    projects = collector.iter_projects(limit=limit)
+                else:
+                    projects = await collector.collect_projects(limit=limit)
+                stats = await ProjectIngestor(db_manager).upsert_projects(projects)
+        finally:
+            await close_http_pool()
+            await db_manager.close()
+
+        console.print(
+            f"[green]{stats.inserted:,} inserted, {stats.updated:,} updated, "
+            f"{stats.unchanged:,} unchanged, {stats.skipped:,} skipped[/green]"
+        )
+
+    try:
+        asyncio.run(_collect())
+    except Exception as e:
+        console.print(f"[red]Collection failed: {e}[/red]")
+        sys.exit(1)
+
+
+@app.command()
+def enrich(
+    limit: int = typer.Option(500, help="Maximum number of projects to enrich"),
+    database_url: Optional[str] = typer.Option(None, help="Database URL"),
+) -> None:
+    """Fetch CoinGecko details for projects missing or outside the freshness window."""
+    settings = get_settings()
+    db_url = database_url or settings.get_database_url()
+
+    console.print(f"[bold blue]Enriching up to {limit:,} projects[/bold blue]")
+
+    async def _enrich():
+        from .collectors import CoinGeckoCollector
+        from .services.enrichment import ProjectEnricher
+
+        db_manager = DatabaseManager(db_url)
+        await db_manager.initialize()
+
+        try:
+            async with CoinGeckoCollector() as collector:
+                enricher = ProjectEnricher(db_manager, collector)
+                stats = await enricher.enrich(await enricher.stale_project_ids(limit=limit))
+        finally:
+            await close_http_pool()
+            await db_manager.close()
+
+        console.print(
+            f"[green]{stats.updated:,} updated, {stats.unchanged:,} unchanged, "
+            f"{stats.skipped:,} skipped[/green]"
+        )
+
+    try:
+        asyncio.run(_enrich())
+    except Exception as e:
+        console.print(f"[red]Enrichment failed: {e}[/red]")
+        sys.exit(1)
+
+
 @app.command()
 def config(
     show_all: bool = typer.Option(False, help="Show all configuration values"),
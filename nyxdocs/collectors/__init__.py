@@ -2,5 +2,6 @@
 
 from .coingecko import CoinGeckoCollector
 from .github import GitHubCollector
+from .github_graphql import GitHubGraphQLFetcher, RepositoryBundle
 
-__all__ = ["CoinGeckoCollector", "GitHubCollector"]
+__all__ = ["CoinGeckoCollector", "GitHubCollector", "GitHubGraphQLFetcher", "RepositoryBundle"]
@@ -9,6 +9,8 @@ import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from ..config import get_settings
+from ..utils.http import SharedClient, get_http_pool
+from ..utils.rate_limit import TokenBucket
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +22,11 @@ class BaseCollector(ABC):
         """Initialize the collector."""
         self.name = name
         self.settings = get_settings()
-        self.client: Optional[httpx.AsyncClient] = None
+        self.client: Optional[SharedClient] = None
+        self.rate_limiter = TokenBucket(
+            self.settings.rate_limit_requests_per_minute,
+            self.settings.rate_limit_burst,
+        )
         
     async def __aenter__(self):
         """Async context manager entry."""
@@ -32,20 +38,17 @@ class BaseCollector(ABC):
         await self.stop()
         
     async def start(self) -> None:
-        """Start the collector and initialize HTTP client."""
+        """Start the collector with a client borrowed from the shared pool."""
         if self.client is None:
-            self.client = httpx.AsyncClient(
-                timeout=httpx.Timeout(self.settings.request_timeout),
+            self.client = get_http_pool().session(
+                timeout=self.settings.request_timeout,
                 headers={"User-Agent": self.settings.user_agent},
-                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5)
             )
         logger.info(f"Started {self.name} collector")
         
     async def stop(self) -> None:
-        """Stop the collector and cleanup resources."""
-        if self.client:
-            await self.client.aclose()
-            self.client = None
+        """Stop the collector; pooled connections stay open for reuse."""
+        self.client = None
         logger.info(f"Stopped {self.name} collector")
         
     @retry(
@@ -89,3 +92,24 @@ class BaseCollector(ABC):
     async def get_project_details(self, project_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed information for a specific project."""
         pass
+        
+    async def get_projects_details(
+        self, project_ids: List[str], concurrency: int = 8
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Get details for many projects, keyed by id (None where unavailable).
+        
+        Collectors with a batch API override this; by default it makes one
+        ``get_project_details`` call per id, ``concurrency`` at a time.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def fetch(project_id: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    return await self.get_project_details(project_id)
+                except Exception as e:
+                    logger.error(f"Error getting {self.name} details for {project_id}: {e}")
+                    return None
+                    
+        details = await asyncio.gather(*(fetch(project_id) for project_id in project_ids))
+        return dict(zip(project_ids, details, strict=True))
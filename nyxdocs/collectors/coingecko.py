@@ -1,9 +1,13 @@
 """CoinGecko data collector for cryptocurrency projects."""
 
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
 
 from ..models import BlockchainNetwork, ProjectCategory
+from ..utils.rate_limit import parse_retry_after
 from .base import BaseCollector
 
 logger = logging.getLogger(__name__)
@@ -13,6 +17,7 @@ class CoinGeckoCollector(BaseCollector):
     """Collector for CoinGecko cryptocurrency data."""
     
     BASE_URL = "https://api.coingecko.com/api/v3"
+    MAX_PER_PAGE = 250
     
     def __init__(self):
         """Initialize CoinGecko collector."""
@@ -28,66 +33,111 @@ class CoinGeckoCollector(BaseCollector):
         
     async def collect_projects(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Collect cryptocurrency projects from CoinGecko."""
-        logger.info(f"Collecting {limit} projects from CoinGecko")
+        projects = [project async for project in self.iter_projects(limit)]
+        logger.info(f"Collected {len(projects)} projects from CoinGecko")
+        return projects
         
-        projects = []
-        per_page = min(250, limit)  # CoinGecko max per page
-        pages_needed = (limit + per_page - 1) // per_page
+    async def iter_projects(self, limit: int = 100) -> AsyncIterator[Dict[str, Any]]:
+        """Stream projects from the markets endpoint as pages arrive.
         
-        for page in range(1, pages_needed + 1):
-            current_limit = min(per_page, limit - len(projects))
+        Pages are fetched concurrently, paced by the collector's token bucket.
+        A 429/503 pauses the whole bucket for the server's ``Retry-After`` and
+        only the failed page is retried; a page that keeps failing is logged
+        and skipped without aborting the others. Pages are yielded in
+        completion order, not page order.
+        """
+        logger.info(f"Collecting {limit} projects from CoinGecko")
+        if limit <= 0:
+            return
             
-            try:
-                data = await self.make_request(
-                    f"{self.BASE_URL}/coins/markets",
-                    params={
-                        "vs_currency": "usd",
-                        "order": "market_cap_desc",
-                        "per_page": current_limit,
-                        "page": page,
-                        "sparkline": False,
-                        "price_change_percentage": "24h"
-                    },
-                    headers=self._get_headers()
-                )
-                
-                for coin in data:
+        per_page = min(self.MAX_PER_PAGE, limit)
+        pages_needed = (limit + per_page - 1) // per_page
+        
+        tasks = [
+            asyncio.create_task(self._fetch_markets_page(page, per_page))
+            for page in range(1, pages_needed + 1)
+        ]
+        try:
+            for next_page in asyncio.as_completed(tasks):
+                page, coins = await next_page
+                # Pages are fixed-size; trim the overshoot on the last one
+                coins = coins[:max(0, limit - (page - 1) * per_page)]
+                for coin in coins:
                     project = await self._convert_coin_to_project(coin)
                     if project:
-                        projects.append(project)
-                
-                # Rate limiting
-                await self.rate_limit(1.0)
-                
-            except Exception as e:
-                logger.error(f"Error collecting CoinGecko page {page}: {e}")
-                break
-                
-        logger.info(f"Collected {len(projects)} projects from CoinGecko")
-        return projects
+                        yield project
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            
+    async def _fetch_markets_page(self, page: int, per_page: int) -> Tuple[int, List[Dict[str, Any]]]:
+        """Fetch one markets page."""
+        data = await self._get_with_budget(
+            f"{self.BASE_URL}/coins/markets",
+            params={
+                "vs_currency": "usd",
+                "order": "market_cap_desc",
+                "per_page": per_page,
+                "page": page,
+                "sparkline": False,
+                "price_change_percentage": "24h"
+            },
+            label=f"page {page}",
+        )
+        return page, data or []
         
     async def get_project_details(self, project_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed project information from CoinGecko."""
-        try:
-            data = await self.make_request(
-                f"{self.BASE_URL}/coins/{project_id}",
-                params={
-                    "localization": False,
-                    "tickers": False,
-                    "market_data": True,
-                    "community_data": False,
-                    "developer_data": False,
-                    "sparkline": False
-                },
-                headers=self._get_headers()
-            )
-            
-            return await self._convert_detailed_coin_to_project(data)
-            
-        except Exception as e:
-            logger.error(f"Error getting CoinGecko details for {project_id}: {e}")
+        data = await self._get_with_budget(
+            f"{self.BASE_URL}/coins/{project_id}",
+            params={
+                "localization": False,
+                "tickers": False,
+                "market_data": True,
+                "community_data": False,
+                "developer_data": False,
+                "sparkline": False
+            },
+            label=f"details for {project_id}",
+        )
+        if data is None:
             return None
+        return await self._convert_detailed_coin_to_project(data)
+        
+    async def _get_with_budget(self, url: str, params: Dict[str, Any], label: str) -> Optional[Any]:
+        """GET a JSON document under the shared rate budget.
+        
+        Throttled (429/503) and transient failures are retried up to
+        ``max_retries``; other client errors are not. Returns None on failure.
+        """
+        if not self.client:
+            raise RuntimeError("Collector not started")
             
+        for attempt in range(self.settings.max_retries + 1):
+            await self.rate_limiter.acquire()
+            try:
+                response = await self.client.get(url, params=params, headers=self._get_headers())
+                if response.status_code in (429, 503):
+                    delay = parse_retry_after(response.headers.get("Retry-After"))
+                    if delay is None:
+                        delay = self.settings.retry_delay * 2 ** attempt
+                    logger.warning(f"CoinGecko throttled {label}, retrying in {delay:.1f}s")
+                    self.rate_limiter.pause(delay)
+                    continue
+                if 400 <= response.status_code < 500:
+                    logger.error(f"CoinGecko returned {response.status_code} for {label}")
+                    return None
+                response.raise_for_status()
+                return response.json()
+            except (httpx.HTTPStatusError, httpx.RequestError, ValueError) as e:
+                logger.warning(f"Error fetching CoinGecko {label} (attempt {attempt + 1}): {e}")
+                if attempt < self.settings.max_retries:
+                    await asyncio.sleep(self.settings.retry_delay * 2 ** attempt)
+                    
+        logger.error(f"Giving up on CoinGecko {label} after {self.settings.max_retries + 1} attempts")
+        return None
+        
     async def _convert_coin_to_project(self, coin: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Convert CoinGecko coin data to project format."""
         try:
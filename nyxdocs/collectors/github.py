@@ -5,6 +5,7 @@ from typing import Any, Dict, List, Optional
 
 from ..models import BlockchainNetwork, ProjectCategory
 from .base import BaseCollector
+from .github_graphql import GitHubGraphQLFetcher
 
 logger = logging.getLogger(__name__)
 
@@ -84,6 +85,33 @@ class GitHubCollector(BaseCollector):
             logger.error(f"Error getting GitHub details for {project_id}: {e}")
             return None
             
+    async def get_projects_details(
+        self, project_ids: List[str], concurrency: int = 8
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Get repository information for many "owner/repo" ids.
+        
+        With a token this batches repositories through GraphQL; without one
+        (GraphQL requires authentication) it falls back to one REST call each.
+        """
+        if not self.token:
+            return await super().get_projects_details(project_ids, concurrency)
+            
+        details: Dict[str, Optional[Dict[str, Any]]] = dict.fromkeys(project_ids)
+        fetcher = GitHubGraphQLFetcher(self.settings)
+        await fetcher.start()
+        try:
+            bundles = await fetcher.fetch_all(project_ids)
+        finally:
+            await fetcher.stop()
+            
+        for project_id in project_ids:
+            bundle = bundles.get(project_id.lower())
+            if bundle is not None:
+                details[project_id] = await self._convert_repo_to_project(bundle.repo, detailed=True)
+                
+        logger.info(f"Fetched {len(bundles)} of {len(project_ids)} GitHub repositories in {fetcher.queries} queries")
+        return details
+        
     async def _search_repositories(self, query: str, limit: int) -> List[Dict[str, Any]]:
         """Search GitHub repositories with a specific query."""
         try:
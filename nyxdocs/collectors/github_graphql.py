@@ -0,0 +1,280 @@
+"""Batched GitHub GraphQL fetcher for repository metadata and documentation text."""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence
+
+import httpx
+
+from ..config import Settings, get_settings
+from ..utils.http import SharedClient, get_http_pool
+from ..utils.rate_limit import parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+_BLOB_FIELDS = "... on Blob { text isBinary }"
+
+_REPOSITORY_FIELDS = """
+    databaseId name nameWithOwner description homepageUrl url stargazerCount isArchived
+    primaryLanguage { name }
+    repositoryTopics(first: 20) { nodes { topic { name } } }
+    defaultBranchRef { name target { oid } }
+"""
+
+# GraphQL error types that mean the query itself was too expensive
+_TOO_LARGE_ERRORS = {"MAX_NODE_LIMIT_EXCEEDED", "TIMEOUT"}
+
+
+class _BatchTooLarge(Exception):
+    """The server could not answer a batch of this size."""
+
+
+class _RateLimited(Exception):
+    """The server asked us to wait before the next query."""
+
+    def __init__(self, delay: float):
+        super().__init__(f"rate limited for {delay:.0f}s")
+        self.delay = delay
+
+
+@dataclass
+class RepositoryBundle:
+    """A repository's metadata and requested file text from one query.
+
+    ``full_name`` is the name as requested; ``repo["full_name"]`` is the
+    canonical one, which differs for renamed or transferred repositories.
+    ``files`` maps default-branch paths to their text: each requested file,
+    and the files directly inside each requested directory. Missing,
+    binary and oversized blobs are left out.
+    """
+
+    full_name: str
+    repo: Dict[str, Any]
+    files: Dict[str, str] = field(default_factory=dict)
+
+
+class GitHubGraphQLFetcher:
+    """Fetch many repositories per GraphQL query under the rate-limit budget.
+
+    Each query asks for up to ``batch_size`` repositories (aliased ``r0``,
+    ``r1``, ...), the blob text of ``paths`` in each, and for
+    ``rateLimit { cost remaining resetAt }``. The batch grows while
+    queries succeed, is capped so the next query's expected cost stays within
+    ``remaining`` minus ``github_graphql_reserve``, and is halved when GitHub
+    times out or rejects a query as too large. When the budget is spent the
+    fetcher sleeps until ``resetAt``.
+    """
+
+    GRAPHQL_URL = "https://api.github.com/graphql"
+
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        endpoint: Optional[str] = None,
+        paths: Sequence[str] = (),
+    ):
+        """Initialize the fetcher; ``paths`` are files or directories to read from each repository."""
+        self.settings = settings or get_settings()
+        self.endpoint = endpoint or self.settings.github_graphql_url or self.GRAPHQL_URL
+        self.paths = list(paths)
+        self.token = self.settings.github_token
+        self.max_batch = self.settings.github_graphql_max_batch
+        self.batch_size = min(self.settings.github_graphql_batch_size, self.max_batch)
+        self.reserve = self.settings.github_graphql_reserve
+        self.client: Optional[SharedClient] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.cost_per_repo = 0.0
+        self.queries = 0
+
+    async def start(self) -> None:
+        """Borrow a client from the shared pool."""
+        if self.client is None:
+            headers = {"User-Agent": self.settings.user_agent}
+            if self.token:
+                headers["Authorization"] = f"bearer {self.token}"
+            self.client = get_http_pool().session(timeout=self.settings.request_timeout, headers=headers)
+
+    async def stop(self) -> None:
+        """Release the client; pooled connections stay open for reuse."""
+        self.client = None
+
+    async def fetch(self, full_names: Iterable[str]) -> AsyncIterator[RepositoryBundle]:
+        """Yield a bundle for every ``owner/repo`` that exists, in batches."""
+        if not self.client:
+            raise RuntimeError("Fetcher not started")
+
+        pending = deque(dict.fromkeys(name for name in full_names if "/" in name))
+        failures = 0
+        while pending:
+            await self._wait_for_budget()
+            batch = [pending.popleft() for _ in range(min(self.batch_size, len(pending)))]
+
+            try:
+                data = await self._query(batch)
+            except _RateLimited as e:
+                logger.warning(f"GitHub GraphQL rate limited, waiting {e.delay:.0f}s")
+                pending.extendleft(reversed(batch))
+                await asyncio.sleep(e.delay)
+                continue
+            except _BatchTooLarge:
+                if len(batch) > 1:
+                    self.batch_size = max(1, len(batch) // 2)
+                    logger.debug(f"GitHub GraphQL batch too large, shrinking to {self.batch_size}")
+                    pending.extendleft(reversed(batch))
+                else:
+                    logger.error(f"GitHub GraphQL cannot fetch {batch[0]}, skipping")
+                continue
+            except (httpx.HTTPError, ValueError) as e:
+                failures += 1
+                if failures > self.settings.max_retries:
+                    logger.error(f"Giving up on GitHub GraphQL batch of {len(batch)}: {e}")
+                    failures = 0
+                    continue
+                logger.warning(f"GitHub GraphQL error (attempt {failures}): {e}")
+                pending.extendleft(reversed(batch))
+                await asyncio.sleep(self.settings.retry_delay * 2 ** (failures - 1))
+                continue
+
+            failures = 0
+            self._observe(data.get("rateLimit"), len(batch))
+            for index, full_name in enumerate(batch):
+                node = data.get(f"r{index}")
+                if node is None:
+                    logger.debug(f"GitHub repository {full_name} not found")
+                    continue
+                yield self._bundle(full_name, node)
+
+    async def fetch_all(self, full_names: Iterable[str]) -> Dict[str, RepositoryBundle]:
+        """Fetch every repository, keyed by lower-cased ``owner/repo``."""
+        return {bundle.full_name.lower(): bundle async for bundle in self.fetch(full_names)}
+
+    def build_query(self, count: int) -> str:
+        """GraphQL query for ``count`` repositories passed as ``$o{i}``/``$n{i}``."""
+        selection = _REPOSITORY_FIELDS + "".join(
+            f'    p{i}: object(expression: {json.dumps("HEAD:" + path)}) {{ {_BLOB_FIELDS} '
+            f"... on Tree {{ entries {{ path type object {{ {_BLOB_FIELDS} }} }} }} }}\n"
+            for i, path in enumerate(self.paths)
+        )
+        variables = ", ".join(f"$o{i}: String!, $n{i}: String!" for i in range(count))
+        repositories = "\n".join(
+            f"  r{i}: repository(owner: $o{i}, name: $n{i}) {{{selection}  }}" for i in range(count)
+        )
+        return f"query({variables}) {{\n  rateLimit {{ cost remaining resetAt }}\n{repositories}\n}}"
+
+    async def _query(self, batch: List[str]) -> Dict[str, Any]:
+        variables: Dict[str, str] = {}
+        for index, full_name in enumerate(batch):
+            owner, name = full_name.split("/", 1)
+            variables[f"o{index}"] = owner
+            variables[f"n{index}"] = name
+
+        self.queries += 1
+        try:
+            response = await self.client.post(
+                self.endpoint, json={"query": self.build_query(len(batch)), "variables": variables}
+            )
+        except httpx.TimeoutException as e:
+            raise _BatchTooLarge() from e
+
+        if response.status_code in (502, 504):
+            raise _BatchTooLarge()
+        if response.status_code in (403, 429):
+            delay = parse_retry_after(response.headers.get("Retry-After"))
+            if delay is None and response.headers.get("X-RateLimit-Remaining") == "0":
+                delay = max(0.0, float(response.headers.get("X-RateLimit-Reset", 0)) - time.time())
+            if delay is not None:
+                raise _RateLimited(delay)
+        response.raise_for_status()
+
+        payload = response.json()
+        errors = payload.get("errors") or []
+        error_types = {error.get("type") for error in errors}
+        if error_types & _TOO_LARGE_ERRORS:
+            raise _BatchTooLarge()
+        if "RATE_LIMITED" in error_types:
+            raise _RateLimited(self._seconds_until_reset())
+
+        data = payload.get("data")
+        if data is None:
+            raise ValueError(f"GraphQL query failed: {errors[0].get('message') if errors else 'no data'}")
+        # NOT_FOUND errors leave the repository's alias null
+        return data
+
+    def _observe(self, rate_limit: Optional[Dict[str, Any]], count: int) -> None:
+        """Adapt the batch size to the cost and budget the server reported."""
+        if self.batch_size < self.max_batch:
+            self.batch_size = min(self.max_batch, self.batch_size * 2)
+        if not rate_limit:
+            return
+
+        self.remaining = rate_limit.get("remaining")
+        reset_at = rate_limit.get("resetAt")
+        if reset_at:
+            self.reset_at = datetime.fromisoformat(reset_at.replace("Z", "+00:00")).timestamp()
+        self.cost_per_repo = max(rate_limit.get("cost") or 1, 1) / count
+
+        if self.remaining is not None:
+            affordable = int((self.remaining - self.reserve) / self.cost_per_repo)
+            self.batch_size = max(1, min(self.batch_size, affordable))
+
+    async def _wait_for_budget(self) -> None:
+        """Sleep until the reset if the next query would eat into the reserve."""
+        if self.remaining is None:
+            return
+        if self.remaining - self.reserve >= max(self.cost_per_repo, 1):
+            return
+
+        delay = self._seconds_until_reset()
+        logger.warning(f"GitHub GraphQL budget exhausted ({self.remaining} left), waiting {delay:.0f}s")
+        await asyncio.sleep(delay)
+        self.remaining = None
+
+    def _seconds_until_reset(self) -> float:
+        if self.reset_at is None:
+            return float(self.settings.retry_delay)
+        return max(0.0, self.reset_at - time.time())
+
+    def _bundle(self, requested: str, node: Dict[str, Any]) -> RepositoryBundle:
+        """Map a repository node onto the REST shape and collect its file text."""
+        full_name = node["nameWithOwner"]
+        repo = {
+            "id": node.get("databaseId"),
+            "name": node["name"],
+            "full_name": full_name,
+            "description": node.get("description"),
+            "homepage": node.get("homepageUrl") or None,
+            "html_url": node["url"],
+            "stargazers_count": node.get("stargazerCount", 0),
+            "archived": node.get("isArchived", False),
+            "language": (node.get("primaryLanguage") or {}).get("name"),
+            "topics": [
+                topic["topic"]["name"] for topic in (node.get("repositoryTopics") or {}).get("nodes", [])
+            ],
+            "default_branch": (node.get("defaultBranchRef") or {}).get("name"),
+            "head_sha": ((node.get("defaultBranchRef") or {}).get("target") or {}).get("oid"),
+        }
+        files: Dict[str, str] = {}
+        for index, path in enumerate(self.paths):
+            target = node.get(f"p{index}") or {}
+            if "entries" in target:
+                for entry in target["entries"]:
+                    text = _blob_text(entry.get("object")) if entry.get("type") == "blob" else None
+                    if text is not None:
+                        files[entry["path"]] = text
+            elif _blob_text(target) is not None:
+                files[path] = target["text"]
+        return RepositoryBundle(full_name=requested, repo=repo, files=files)
+
+
+def _blob_text(blob: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Text of a blob node; None for missing, binary or oversized blobs."""
+    if not blob or blob.get("isBinary"):
+        return None
+    return blob.get("text")
+
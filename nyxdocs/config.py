@@ -1,10 +1,12 @@
 """Configuration management for NyxDocs."""
 
 import os
+from pathlib import Path
 from typing import List, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy.engine import make_url
 
 
 class Settings(BaseSettings):
@@ -27,6 +29,9 @@ class Settings(BaseSettings):
     db_pool_size: int = Field(10, description="Database connection pool size")
     db_max_overflow: int = Field(20, description="Database max overflow connections")
     db_pool_timeout: int = Field(30, description="Database pool timeout")
+    blob_compression: str = Field(
+        "zstd", description="Document blob compression (zstd when the zstandard package is installed, zlib, or none)"
+    )
 
     # Server
     log_level: str = Field("INFO", description="Logging level")
@@ -40,6 +45,12 @@ class Settings(BaseSettings):
     doc_update_interval: int = Field(7200, description="Documentation update interval (seconds)")
     max_concurrent_scrapes: int = Field(5, description="Maximum concurrent scraping operations")
     request_timeout: int = Field(30, description="Request timeout (seconds)")
+    enrichment_freshness: int = Field(604800, description="Skip re-enriching projects enriched within this window (seconds)")
+    enrichment_concurrency: int = Field(8, description="Maximum concurrent project detail requests")
+    github_graphql_url: Optional[str] = Field(None, description="GitHub GraphQL endpoint (defaults to api.github.com)")
+    github_graphql_batch_size: int = Field(20, description="Initial repositories per GitHub GraphQL query")
+    github_graphql_max_batch: int = Field(50, description="Maximum repositories per GitHub GraphQL query")
+    github_graphql_reserve: int = Field(200, description="GitHub GraphQL rate-limit points left untouched")
 
     # Rate Limiting
     rate_limit_requests_per_minute: int = Field(60, description="Rate limit requests per minute")
@@ -51,15 +62,52 @@ class Settings(BaseSettings):
         description="User agent for web scraping"
     )
     max_content_length: int = Field(1000000, description="Maximum content length to scrape")
+    max_download_bytes: Optional[int] = Field(
+        None, description="Stop downloading a page after this many bytes (default 8x max_content_length)"
+    )
+    html_parser: str = Field("lxml", description="HTML extraction engine (lxml or html.parser)")
+    segment_max_chars: int = Field(4000, description="Maximum characters per stored document segment")
+    segment_min_chars: int = Field(500, description="Sections shorter than this are merged into the next segment")
+    diff_summary_max_chars: int = Field(2000, description="Maximum characters of diff kept per update record")
     scrape_timeout: int = Field(60, description="Scraping timeout (seconds)")
     max_retries: int = Field(3, description="Maximum retry attempts")
     retry_delay: int = Field(5, description="Retry delay (seconds)")
+    respect_robots_txt: bool = Field(True, description="Honor robots.txt rules and crawl-delay")
+    robots_cache_ttl: int = Field(86400, description="How long robots.txt is cached per host (seconds)")
+    robots_retry_ttl: int = Field(
+        300, description="How long an erroring or unreachable robots.txt blocks a host before a retry (seconds)"
+    )
+    politeness_initial_per_host: int = Field(2, description="Initial concurrent requests per host")
+    politeness_max_per_host: int = Field(8, description="Maximum concurrent requests per host")
+    politeness_target_latency: float = Field(2.0, description="Responses slower than this reduce host concurrency (seconds)")
+
+    # Job Queue
+    job_poll_interval: float = Field(5.0, description="Idle job queue poll interval (seconds)")
+    job_schedule_interval: int = Field(300, description="How often due documentation is queued for checks (seconds)")
+    job_stale_timeout: int = Field(900, description="Running jobs older than this are reclaimed (seconds)")
+    job_max_backoff: int = Field(3600, description="Maximum retry backoff for failed jobs (seconds)")
 
     # Cache
     cache_ttl_projects: int = Field(3600, description="Cache TTL for projects (seconds)")
     cache_ttl_docs: int = Field(1800, description="Cache TTL for docs (seconds)")
     cache_ttl_search: int = Field(300, description="Cache TTL for search (seconds)")
     cache_max_size: int = Field(1000, description="Maximum cache size")
+    cache_max_bytes: int = Field(64 * 1024 * 1024, description="Maximum in-memory cache size (bytes)")
+    cache_cleanup_interval: int = Field(300, description="Expired cache cleanup interval (seconds)")
+    doc_page_cache_chars: int = Field(
+        32 * 1024 * 1024, description="Decompressed documentation kept for paginated reads (characters)"
+    )
+
+    # Search
+    catalog_refresh_interval: int = Field(60, description="Project catalog refresh interval (seconds)")
+    fuzzy_match_threshold: float = Field(0.3, description="Minimum trigram similarity for fuzzy project matches")
+    ranking_index_dir: Optional[str] = Field(
+        None, description="Directory of the saved project ranking index (defaults next to the SQLite database)"
+    )
+    ranking_rebuild_interval: int = Field(3600, description="Project ranking index rebuild interval (seconds)")
+    ranking_market_cap_weight: float = Field(
+        0.25, description="Largest relevance boost from market cap in project ranking (0.25 = +25%)"
+    )
 
     # Feature Flags
     enable_auto_discovery: bool = Field(True, description="Enable automatic project discovery")
@@ -113,12 +161,19 @@ class Settings(BaseSettings):
     )
 
     # Performance
-    worker_processes: int = Field(1, description="Number of worker processes")
+    worker_processes: int = Field(1, description="Number of worker processes (0 processes documents in-process)")
     worker_connections: int = Field(1000, description="Worker connections")
     max_memory_usage: str = Field("512MB", description="Maximum memory usage")
     async_pool_size: int = Field(100, description="Async pool size")
     async_timeout: int = Field(30, description="Async timeout (seconds)")
 
+    # HTTP Client Pool
+    http_max_connections_per_host: int = Field(20, description="Maximum connections per host")
+    http_max_keepalive_per_host: int = Field(10, description="Maximum idle keep-alive connections per host")
+    http_keepalive_expiry: float = Field(30.0, description="Idle keep-alive connection expiry (seconds)")
+    http_dns_cache_ttl: int = Field(300, description="DNS resolution cache TTL (seconds)")
+    http2_enabled: bool = Field(True, description="Use HTTP/2 when the h2 package is installed")
+
     @property
     def is_development(self) -> bool:
         """Check if running in development mode."""
@@ -135,6 +190,21 @@ class Settings(BaseSettings):
             return self.test_database_url
         return self.database_url
 
+    def get_ranking_index_dir(self, database_url: Optional[str] = None) -> Path:
+        """Absolute directory of the saved project ranking index for a database.
+
+        Unless ``ranking_index_dir`` is set, the index lives next to a SQLite
+        database file, and in the user cache directory for other databases.
+        """
+        if self.ranking_index_dir:
+            return Path(self.ranking_index_dir).expanduser().resolve()
+
+        url = make_url(database_url or self.get_database_url())
+        if url.get_backend_name() == "sqlite" and url.database and url.database != ":memory:":
+            return Path(url.database).expanduser().resolve().parent / "ranking_index"
+        cache_home = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+        return Path(cache_home) / "nyxdocs" / "ranking_index"
+
 
 # Global settings instance
 settings = Settings()
@@ -1,13 +1,27 @@
 """Database module for NyxDocs."""
 
-from .models import Base, DocumentationTable, ProjectTable, UpdateRecordTable
+from .blobs import BlobStore
+from .fulltext import FullTextIndex, SearchHit
+from .models import (
+    Base,
+    DocumentationTable,
+    DocumentBlobTable,
+    DocumentSegmentTable,
+    ProjectTable,
+    UpdateRecordTable,
+)
 from .session import DatabaseManager, get_db_session
 
 __all__ = [
     "Base",
     "ProjectTable",
     "DocumentationTable", 
+    "DocumentBlobTable",
+    "DocumentSegmentTable",
     "UpdateRecordTable",
     "DatabaseManager",
     "get_db_session",
+    "FullTextIndex",
+    "SearchHit",
+    "BlobStore",
 ]
@@ -0,0 +1,289 @@
+"""Content-addressed storage for documentation text.
+
+Identical documents (forks, mirrored READMEs, one page under several URLs)
+share a single ``DocumentBlobTable`` row keyed by the SHA-256 of their text.
+The text is split into heading-aware segments (see ``utils.segments``), each
+stored compressed in ``DocumentSegmentTable``, so a slice of a document can
+be read without the rest. ``DocumentationTable`` rows hold only the hash;
+each blob counts the rows pointing at it and is deleted with its segments
+when the last one lets go. Counts are kept from ORM flush events, so
+assigning ``doc.content`` is all a writer does.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+
+from ..config import get_settings
+from ..utils.compression import compress_text, decompress_text
+from ..utils.segments import Segment, split_segments
+from .models import DocumentationTable, DocumentBlobTable, DocumentSegmentTable
+
+logger = logging.getLogger(__name__)
+
+_blobs = DocumentBlobTable.__table__
+_segments = DocumentSegmentTable.__table__
+
+_SEGMENT_COLUMNS = (
+    _segments.c.ordinal,
+    _segments.c.heading_path,
+    _segments.c.start_offset,
+    _segments.c.end_offset,
+    _segments.c.segment_hash,
+)
+
+
+class BlobStore:
+    """Reference-counted access to documentation blobs and their segments."""
+
+    @classmethod
+    def acquire(
+        cls,
+        connection: Connection,
+        content_hash: str,
+        text: Optional[str],
+        segments: Optional[List[Segment]] = None,
+    ) -> None:
+        """Take a reference to a blob, storing ``text`` under its hash if it is new.
+
+        ``segments`` are used for a new blob when given; otherwise the text
+        is split with the configured segment sizes.
+        """
+        if cls._add_reference(connection, content_hash):
+            return
+        if text is None:
+            raise ValueError(f"No stored content for hash {content_hash}")
+
+        settings = get_settings()
+        if segments is None:
+            segments = split_segments(text, settings.segment_max_chars, settings.segment_min_chars)
+        rows = []
+        for segment in segments:
+            codec, data = compress_text(text[segment.start:segment.end], settings.blob_compression)
+            rows.append({
+                "content_hash": content_hash,
+                "ordinal": segment.ordinal,
+                "heading_path": segment.heading_path,
+                "start_offset": segment.start,
+                "end_offset": segment.end,
+                "segment_hash": segment.segment_hash,
+                "codec": codec,
+                "data": data,
+            })
+
+        values = {
+            "content_hash": content_hash,
+            "size": len(text),
+            "stored_size": sum(len(row["data"]) for row in rows),
+            "segment_count": len(rows),
+            "refcount": 1,
+        }
+        dialect = connection.dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            # A concurrent writer may have stored the same text since the update above
+            insert = (sqlite if dialect == "sqlite" else postgresql).insert(_blobs).values(values)
+            inserted = connection.execute(insert.on_conflict_do_nothing(index_elements=[_blobs.c.content_hash]))
+            if not inserted.rowcount:
+                cls._add_reference(connection, content_hash)
+                return
+        else:
+            connection.execute(_blobs.insert().values(values))
+        if rows:
+            connection.execute(_segments.insert(), rows)
+
+    @staticmethod
+    def release(connection: Connection, content_hash: str) -> None:
+        """Drop a reference to a blob, deleting it once nothing points at it."""
+        connection.execute(
+            _blobs.update()
+            .where(_blobs.c.content_hash == content_hash)
+            .values(refcount=_blobs.c.refcount - 1)
+        )
+        unreferenced = select(_blobs.c.content_hash).where(
+            _blobs.c.content_hash == content_hash, _blobs.c.refcount <= 0
+        )
+        connection.execute(
+            _segments.delete().where(
+                _segments.c.content_hash == content_hash, _segments.c.content_hash.in_(unreferenced)
+            )
+        )
+        connection.execute(
+            _blobs.delete().where(_blobs.c.content_hash == content_hash, _blobs.c.refcount <= 0)
+        )
+
+    @classmethod
+    def get(cls, connection: Connection, content_hash: str) -> Optional[str]:
+        """Decompressed text of a blob, or None if there is none."""
+        return cls.get_many(connection, [content_hash]).get(content_hash)
+
+    @staticmethod
+    def get_many(connection: Connection, content_hashes: Iterable[str]) -> Dict[str, str]:
+        """Decompressed text of every stored blob among ``content_hashes``."""
+        hashes = list(dict.fromkeys(content_hashes))
+        if not hashes:
+            return {}
+
+        parts: Dict[str, List[str]] = {
+            content_hash: []
+            for content_hash in connection.execute(
+                select(_blobs.c.content_hash).where(_blobs.c.content_hash.in_(hashes))
+            ).scalars()
+        }
+        rows = connection.execute(
+            select(_segments.c.content_hash, _segments.c.codec, _segments.c.data)
+            .where(_segments.c.content_hash.in_(hashes))
+            .order_by(_segments.c.content_hash, _segments.c.ordinal)
+        )
+        for content_hash, codec, data in rows:
+            parts[content_hash].append(decompress_text(codec, data))
+        return {content_hash: "".join(texts) for content_hash, texts in parts.items()}
+
+    @staticmethod
+    def segments(
+        connection: Connection,
+        content_hash: str,
+        start: int = 0,
+        end: Optional[int] = None,
+    ) -> List[Segment]:
+        """Segments of a blob overlapping ``[start, end)``, in order, without their text."""
+        query = select(*_SEGMENT_COLUMNS).where(
+            _segments.c.content_hash == content_hash, _segments.c.end_offset > start
+        )
+        if end is not None:
+            query = query.where(_segments.c.start_offset < end)
+        return [Segment(*row) for row in connection.execute(query.order_by(_segments.c.ordinal))]
+
+    @staticmethod
+    def segment_texts(connection: Connection, content_hash: str, ordinals: Iterable[int]) -> Dict[int, str]:
+        """Decompressed text of some of a blob's segments, by ordinal."""
+        ordinals = list(ordinals)
+        if not ordinals:
+            return {}
+        rows = connection.execute(
+            select(_segments.c.ordinal, _segments.c.codec, _segments.c.data).where(
+                _segments.c.content_hash == content_hash, _segments.c.ordinal.in_(ordinals)
+            )
+        )
+        return {ordinal: decompress_text(codec, data) for ordinal, codec, data in rows}
+
+    @classmethod
+    def text_of(cls, connection: Connection, doc: DocumentationTable) -> Optional[str]:
+        """A document's text, from what was assigned in this session or from its blob."""
+        pending = _pending(doc)
+        if pending is not None:
+            return pending[1]
+        if doc.content_hash is None:
+            return None
+        return cls.get(connection, doc.content_hash)
+
+    @classmethod
+    def segment_list(cls, connection: Connection, doc: DocumentationTable) -> List[Segment]:
+        """A document's segments without their text; those assigned in this session if known."""
+        if doc.content_hash is None:
+            return []
+        pending = _pending(doc)
+        if pending is not None and pending[2] is not None:
+            return list(pending[2])
+        return cls.segments(connection, doc.content_hash)
+
+    @classmethod
+    def segments_of(
+        cls,
+        connection: Connection,
+        doc: DocumentationTable,
+        segments: Optional[List[Segment]] = None,
+    ) -> List[Tuple[Segment, str]]:
+        """Segments of a document (all of them if unset) with their text.
+
+        Assigned text is sliced when there is some; otherwise only the
+        requested segments are read and decompressed.
+        """
+        if doc.content_hash is None:
+            return []
+        if segments is None:
+            segments = cls.segment_list(connection, doc)
+        pending = _pending(doc)
+        if pending is not None and pending[1] is not None:
+            text = pending[1]
+            return [(segment, text[segment.start:segment.end]) for segment in segments]
+        texts = cls.segment_texts(connection, doc.content_hash, (segment.ordinal for segment in segments))
+        return [(segment, texts[segment.ordinal]) for segment in segments]
+
+    @staticmethod
+    def stats(connection: Connection) -> Dict[str, Any]:
+        """Blob and segment counts, references, and text versus stored sizes."""
+        row = connection.execute(
+            select(
+                func.count(),
+                func.coalesce(func.sum(_blobs.c.refcount), 0),
+                func.coalesce(func.sum(_blobs.c.segment_count), 0),
+                func.coalesce(func.sum(_blobs.c.size), 0),
+                func.coalesce(func.sum(_blobs.c.stored_size), 0),
+            )
+        ).one()
+        return {
+            "blobs": row[0],
+            "references": row[1],
+            "segments": row[2],
+            "text_chars": row[3],
+            "stored_bytes": row[4],
+        }
+
+    @staticmethod
+    def _add_reference(connection: Connection, content_hash: str) -> bool:
+        """Bump an existing blob's count; False if there is no such blob."""
+        bumped = connection.execute(
+            _blobs.update()
+            .where(_blobs.c.content_hash == content_hash)
+            .values(refcount=_blobs.c.refcount + 1)
+        )
+        return bool(bumped.rowcount)
+
+
+def _pending(doc: DocumentationTable) -> Optional[Tuple[Optional[str], Optional[str], Optional[List[Segment]]]]:
+    """(hash, text, segments) assigned to the row in this session, if still current."""
+    pending = doc.__dict__.get("_pending_content")
+    if pending is not None and pending[0] == doc.content_hash:
+        return pending
+    return None
+
+
+def _committed_hash(target: DocumentationTable) -> Optional[str]:
+    """The hash the row held in the database before this flush."""
+    history = inspect(target).attrs.content_hash.history
+    previous = history.deleted or history.unchanged
+    return previous[0] if previous else None
+
+
+def _acquire_new(mapper: Any, connection: Connection, target: DocumentationTable) -> None:
+    """Reference the new blob before the row points at it."""
+    if target.content_hash is not None:
+        _, text, segments = _pending(target) or (None, None, None)
+        BlobStore.acquire(connection, target.content_hash, text, segments)
+
+
+def _acquire_changed(mapper: Any, connection: Connection, target: DocumentationTable) -> None:
+    if inspect(target).attrs.content_hash.history.has_changes():
+        _acquire_new(mapper, connection, target)
+
+
+def _release_replaced(mapper: Any, connection: Connection, target: DocumentationTable) -> None:
+    """Release the old blob once the row no longer points at it."""
+    history = inspect(target).attrs.content_hash.history
+    if history.has_changes() and history.deleted and history.deleted[0] is not None:
+        BlobStore.release(connection, history.deleted[0])
+
+
+def _release_deleted(mapper: Any, connection: Connection, target: DocumentationTable) -> None:
+    content_hash = _committed_hash(target)
+    if content_hash is not None:
+        BlobStore.release(connection, content_hash)
+
+
+event.listen(DocumentationTable, "before_insert", _acquire_new)
+event.listen(DocumentationTable, "before_update", _acquire_changed)
+event.listen(DocumentationTable, "after_update", _release_replaced)
+event.listen(DocumentationTable, "after_delete", _release_deleted)
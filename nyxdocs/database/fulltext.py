@@ -0,0 +1,367 @@
+"""Full-text search index for documentation content.
+
+SQLite keeps an FTS5 virtual table and PostgreSQL a table with a GIN-indexed
+tsvector column. Both hold one row per distinct segment of a document (see
+``database.blobs``), keyed by the segment's hash, so a match points at the
+section it came from. They are kept in sync from ORM flush events, so every
+write path gets indexing for free. When a document's content changes only
+the segments whose hash or heading changed are removed and re-indexed;
+segments that merely moved keep their rows.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from itertools import groupby
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import DDL, event, inspect, select, text
+from sqlalchemy.engine import Connection
+
+from ..utils.compression import decompress_text
+from ..utils.segments import Segment
+from .blobs import BlobStore
+from .models import Base, DocumentationTable, DocumentSegmentTable
+
+logger = logging.getLogger(__name__)
+
+SQLITE_TABLE = "documentation_segment_fts"
+POSTGRES_TABLE = "documentation_segment_search"
+
+_SQLITE_DDL = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_TABLE} USING fts5(
+    documentation_id UNINDEXED,
+    segment_hash UNINDEXED,
+    title,
+    heading,
+    content,
+    tokenize = 'porter unicode61'
+)
+"""
+
+_POSTGRES_DDL = f"""
+CREATE TABLE IF NOT EXISTS {POSTGRES_TABLE} (
+    documentation_id VARCHAR NOT NULL REFERENCES documentation(id) ON DELETE CASCADE,
+    segment_hash VARCHAR NOT NULL,
+    title TEXT NOT NULL,
+    heading TEXT NOT NULL,
+    content TEXT NOT NULL,
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(heading, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'B')
+    ) STORED,
+    PRIMARY KEY (documentation_id, segment_hash)
+)
+"""
+
+_POSTGRES_INDEX_DDL = f"""
+CREATE INDEX IF NOT EXISTS ix_{POSTGRES_TABLE}_vector
+ON {POSTGRES_TABLE} USING GIN (search_vector)
+"""
+
+event.listen(Base.metadata, "after_create", DDL(_SQLITE_DDL).execute_if(dialect="sqlite"))
+event.listen(Base.metadata, "after_create", DDL(_POSTGRES_DDL).execute_if(dialect="postgresql"))
+event.listen(Base.metadata, "after_create", DDL(_POSTGRES_INDEX_DDL).execute_if(dialect="postgresql"))
+event.listen(
+    Base.metadata, "before_drop", DDL(f"DROP TABLE IF EXISTS {SQLITE_TABLE}").execute_if(dialect="sqlite")
+)
+event.listen(
+    Base.metadata, "before_drop", DDL(f"DROP TABLE IF EXISTS {POSTGRES_TABLE}").execute_if(dialect="postgresql")
+)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class SearchHit:
+    """A ranked full-text match, from the best-matching segment of a document."""
+
+    documentation_id: str
+    project_id: str
+    project_name: str
+    title: str
+    url: str
+    snippet: str
+    rank: float
+    heading: str = ""
+
+
+class FullTextIndex:
+    """Dialect-aware access to the documentation full-text index."""
+
+    @staticmethod
+    def is_supported(connection: Connection) -> bool:
+        """Check whether the connected database has a full-text index."""
+        return connection.dialect.name in ("sqlite", "postgresql")
+
+    @staticmethod
+    def _table(connection: Connection) -> Optional[str]:
+        dialect = connection.dialect.name
+        if dialect == "sqlite":
+            return SQLITE_TABLE
+        if dialect == "postgresql":
+            return POSTGRES_TABLE
+        return None
+
+    @classmethod
+    def index(
+        cls,
+        connection: Connection,
+        documentation_id: str,
+        title: str,
+        segments: Iterable[Tuple[Segment, str]],
+    ) -> None:
+        """Index (or re-index) a document's segments, replacing what was there."""
+        cls.remove(connection, documentation_id)
+        cls.index_segments(connection, documentation_id, title, segments)
+
+    @classmethod
+    def index_segments(
+        cls,
+        connection: Connection,
+        documentation_id: str,
+        title: str,
+        segments: Iterable[Tuple[Segment, str]],
+    ) -> None:
+        """Add segments of a document to the index; repeats of a hash are indexed once."""
+        table = cls._table(connection)
+        rows: Dict[str, Dict[str, Any]] = {}
+        for segment, segment_text in segments:
+            if segment_text.strip() and segment.segment_hash not in rows:
+                rows[segment.segment_hash] = {
+                    "id": documentation_id,
+                    "segment_hash": segment.segment_hash,
+                    "title": title or "",
+                    "heading": segment.heading_path,
+                    "content": segment_text,
+                }
+        if table is None or not rows:
+            return
+        connection.execute(
+            text(
+                f"INSERT INTO {table} (documentation_id, segment_hash, title, heading, content) "
+                "VALUES (:id, :segment_hash, :title, :heading, :content)"
+            ),
+            list(rows.values()),
+        )
+
+    @classmethod
+    def remove_segments(cls, connection: Connection, documentation_id: str, segment_hashes: Iterable[str]) -> None:
+        """Drop some of a document's segments from the index."""
+        table = cls._table(connection)
+        rows = [{"id": documentation_id, "segment_hash": segment_hash} for segment_hash in segment_hashes]
+        if table is not None and rows:
+            connection.execute(
+                text(f"DELETE FROM {table} WHERE documentation_id = :id AND segment_hash = :segment_hash"),
+                rows,
+            )
+
+    @classmethod
+    def indexed_segments(cls, connection: Connection, documentation_id: str) -> Dict[str, str]:
+        """Heading path of each segment hash indexed for a document."""
+        table = cls._table(connection)
+        if table is None:
+            return {}
+        rows = connection.execute(
+            text(f"SELECT segment_hash, heading FROM {table} WHERE documentation_id = :id"),
+            {"id": documentation_id},
+        )
+        return dict(rows.all())
+
+    @classmethod
+    def stale_segments(
+        cls, connection: Connection, documentation_id: str, segments: Iterable[Segment]
+    ) -> Tuple[List[str], List[Segment]]:
+        """(indexed hashes to remove, segments to index) to bring a document up to ``segments``."""
+        indexed = cls.indexed_segments(connection, documentation_id)
+        current: Dict[str, Segment] = {}
+        for segment in segments:
+            current.setdefault(segment.segment_hash, segment)
+
+        removed = [
+            segment_hash for segment_hash, heading in indexed.items()
+            if segment_hash not in current or current[segment_hash].heading_path != heading
+        ]
+        kept = set(indexed).difference(removed)
+        return removed, [segment for segment_hash, segment in current.items() if segment_hash not in kept]
+
+    @classmethod
+    def set_title(cls, connection: Connection, documentation_id: str, title: str) -> None:
+        """Update the indexed title of a document."""
+        table = cls._table(connection)
+        if table is not None:
+            connection.execute(
+                text(f"UPDATE {table} SET title = :title WHERE documentation_id = :id"),
+                {"id": documentation_id, "title": title or ""},
+            )
+
+    @classmethod
+    def remove(cls, connection: Connection, documentation_id: str) -> None:
+        """Drop a document from the index."""
+        table = cls._table(connection)
+        if table is not None:
+            connection.execute(text(f"DELETE FROM {table} WHERE documentation_id = :id"), {"id": documentation_id})
+
+    @classmethod
+    def rebuild(cls, connection: Connection) -> int:
+        """Rebuild the index from stored segments. Returns documents indexed."""
+        table = cls._table(connection)
+        if table is None:
+            return 0
+        connection.execute(text(f"DELETE FROM {table}"))
+
+        segments = DocumentSegmentTable.__table__
+        rows = connection.execute(
+            select(
+                DocumentationTable.id,
+                DocumentationTable.title,
+                segments.c.ordinal,
+                segments.c.heading_path,
+                segments.c.start_offset,
+                segments.c.end_offset,
+                segments.c.segment_hash,
+                segments.c.codec,
+                segments.c.data,
+            )
+            .join_from(
+                DocumentationTable.__table__,
+                segments,
+                DocumentationTable.content_hash == segments.c.content_hash,
+            )
+            .order_by(DocumentationTable.id, segments.c.ordinal)
+        )
+
+        indexed = 0
+        for (doc_id, title), doc_rows in groupby(rows, key=lambda row: (row[0], row[1])):
+            cls.index_segments(connection, doc_id, title, [
+                (Segment(ordinal, heading, start, end, segment_hash), decompress_text(codec, data))
+                for _, _, ordinal, heading, start, end, segment_hash, codec, data in doc_rows
+            ])
+            indexed += 1
+
+        logger.info(f"Rebuilt full-text index with {indexed} documents")
+        return indexed
+
+    @classmethod
+    def search(
+        cls,
+        connection: Connection,
+        query: str,
+        project_id: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[SearchHit]:
+        """Return ranked matches with highlighted snippets."""
+        dialect = connection.dialect.name
+        if dialect == "sqlite":
+            match = cls._to_fts5_query(query)
+            if not match:
+                return []
+            # Materialized so FTS5 auxiliary functions run against the MATCH;
+            # the bare columns of MIN(rank) come from each document's best segment
+            sql = f"""
+                WITH matches AS MATERIALIZED (
+                    SELECT documentation_id, heading,
+                           snippet({SQLITE_TABLE}, 4, '**', '**', ' … ', 32) AS snippet,
+                           bm25({SQLITE_TABLE}, 0.0, 0.0, 5.0, 2.0, 1.0) AS rank
+                    FROM {SQLITE_TABLE}
+                    WHERE {SQLITE_TABLE} MATCH :match
+                ),
+                best AS (
+                    SELECT documentation_id, heading, snippet, MIN(rank) AS rank
+                    FROM matches
+                    GROUP BY documentation_id
+                )
+                SELECT d.id, d.project_id, p.name, d.title, d.url, best.snippet, best.rank, best.heading
+                FROM best
+                JOIN documentation d ON d.id = best.documentation_id
+                JOIN projects p ON p.id = d.project_id
+                {"WHERE d.project_id = :project_id" if project_id else ""}
+                ORDER BY best.rank
+                LIMIT :limit
+            """
+            params: dict[str, Any] = {"match": match, "project_id": project_id, "limit": limit}
+            # bm25() is lower-is-better; flip it so callers always sort descending
+            return [cls._to_hit(row, rank=-row[6]) for row in connection.execute(text(sql), params)]
+
+        if dialect == "postgresql":
+            # Rank the best segment per document, then build headlines only for returned rows
+            sql = f"""
+                WITH q AS (SELECT websearch_to_tsquery('english', :query) AS tsq),
+                best AS (
+                    SELECT DISTINCT ON (s.documentation_id)
+                           s.documentation_id, s.heading, s.content, ts_rank_cd(s.search_vector, q.tsq) AS rank
+                    FROM {POSTGRES_TABLE} s
+                    CROSS JOIN q
+                    JOIN documentation d ON d.id = s.documentation_id
+                    WHERE s.search_vector @@ q.tsq
+                    {"AND d.project_id = :project_id" if project_id else ""}
+                    ORDER BY s.documentation_id, rank DESC
+                ),
+                ranked AS (
+                    SELECT * FROM best ORDER BY rank DESC LIMIT :limit
+                )
+                SELECT d.id, d.project_id, p.name, d.title, d.url,
+                       ts_headline('english', r.content, q.tsq,
+                                   'StartSel=**, StopSel=**, MaxWords=35, MinWords=15, MaxFragments=2') AS snippet,
+                       r.rank, r.heading
+                FROM ranked r
+                CROSS JOIN q
+                JOIN documentation d ON d.id = r.documentation_id
+                JOIN projects p ON p.id = d.project_id
+                ORDER BY r.rank DESC
+            """
+            params = {"query": query, "project_id": project_id, "limit": limit}
+            return [cls._to_hit(row, rank=row[6]) for row in connection.execute(text(sql), params)]
+
+        return []
+
+    @staticmethod
+    def _to_fts5_query(query: str) -> str:
+        """Turn free text into an FTS5 query of quoted, AND-ed terms."""
+        tokens = _TOKEN_RE.findall(query)
+        return " ".join(f'"{token}"' for token in tokens)
+
+    @staticmethod
+    def _to_hit(row: Any, rank: float) -> SearchHit:
+        """Convert a result row into a search hit."""
+        return SearchHit(
+            documentation_id=row[0],
+            project_id=row[1],
+            project_name=row[2],
+            title=row[3],
+            url=row[4],
+            snippet=row[5] or "",
+            rank=float(rank or 0.0),
+            heading=row[7] or "",
+        )
+
+
+def _sync_document(mapper: Any, connection: Connection, target: DocumentationTable) -> None:
+    """Keep the index in step with inserted or updated documentation rows."""
+    if not FullTextIndex.is_supported(connection):
+        return
+
+    state = inspect(target)
+    if state.attrs.title.history.has_changes():
+        FullTextIndex.set_title(connection, target.id, target.title)
+    if state.attrs.content_hash.history.has_changes():
+        # Only segments whose text or heading changed are read and re-indexed
+        removed, added = FullTextIndex.stale_segments(
+            connection, target.id, BlobStore.segment_list(connection, target)
+        )
+        FullTextIndex.remove_segments(connection, target.id, removed)
+        FullTextIndex.index_segments(
+            connection, target.id, target.title, BlobStore.segments_of(connection, target, added)
+        )
+
+
+def _remove_document(mapper: Any, connection: Connection, target: DocumentationTable) -> None:
+    """Remove deleted documentation rows from the index."""
+    if FullTextIndex.is_supported(connection):
+        FullTextIndex.remove(connection, target.id)
+
+
+event.listen(DocumentationTable, "after_insert", _sync_document)
+event.listen(DocumentationTable, "after_update", _sync_document)
+event.listen(DocumentationTable, "after_delete", _remove_document)
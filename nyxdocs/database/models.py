@@ -1,22 +1,27 @@
 """SQLAlchemy database models."""
 
+import hashlib
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, List, Optional
 
 from sqlalchemy import (
+    DDL,
     Boolean,
     Column,
     DateTime,
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     String,
     Text,
     UniqueConstraint,
+    event,
 )
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import column_property, deferred, relationship
 from sqlalchemy.sql import func
 
 from ..models import (
@@ -26,6 +31,7 @@ from ..models import (
     ProjectStatus,
     ScrapeStatus,
 )
+from ..utils.compression import decompress_text
 
 Base = declarative_base()
 
@@ -40,13 +46,15 @@ class ProjectTable(Base):
     symbol = Column(String, nullable=True, index=True)
     blockchain = Column(Enum(BlockchainNetwork), nullable=True, index=True)
     category = Column(Enum(ProjectCategory), nullable=True, index=True)
-    description = Column(Text, nullable=True)
+    # Large columns are deferred and raise if touched unloaded; readers undefer() them
+    description = deferred(Column(Text, nullable=True), raiseload=True)
     website = Column(String, nullable=True)
     github_repo = Column(String, nullable=True)
     market_cap = Column(Float, nullable=True)
     status = Column(Enum(ProjectStatus), default=ProjectStatus.ACTIVE, index=True)
+    enriched_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=func.now(), nullable=False)
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False, index=True)
     
     # Relationships
     documentation = relationship("DocumentationTable", back_populates="project", cascade="all, delete-orphan")
@@ -54,11 +62,79 @@ class ProjectTable(Base):
     # Constraints
     __table_args__ = (
         UniqueConstraint("name", "blockchain", name="uq_project_name_blockchain"),
+        # Case-insensitive exact and prefix lookups (see services.resolver)
+        Index("ix_projects_name_lower", func.lower(name)),
+        Index("ix_projects_symbol_lower", func.lower(symbol)),
     )
 
 
+# Fuzzy project name matching on PostgreSQL; other databases use an in-process index
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL(
+        "CREATE INDEX IF NOT EXISTS ix_projects_name_trgm "
+        "ON projects USING GIN (lower(name) gin_trgm_ops)"
+    ).execute_if(dialect="postgresql"),
+)
+
+
+class DocumentBlobTable(Base):
+    """Documentation text, stored once per content hash (see database.blobs).
+    
+    The text itself is held compressed in ``DocumentSegmentTable`` rows.
+    """
+    
+    __tablename__ = "document_blobs"
+    
+    content_hash = Column(String, primary_key=True)  # SHA-256 of the UTF-8 text
+    size = Column(Integer, nullable=False)  # Characters of text
+    stored_size = Column(Integer, nullable=False)  # Compressed bytes across all segments
+    segment_count = Column(Integer, nullable=False, default=0)
+    refcount = Column(Integer, nullable=False, default=0)  # Documentation rows pointing here
+    created_at = Column(DateTime, default=func.now(), nullable=False)
+    
+    # Relationships
+    segments = relationship(
+        "DocumentSegmentTable", order_by="DocumentSegmentTable.ordinal", lazy="raise", viewonly=True
+    )
+    
+    @property
+    def text(self) -> str:
+        """Decompressed text (needs ``segments`` eager-loaded)."""
+        return "".join(segment.text for segment in self.segments)
+
+
+class DocumentSegmentTable(Base):
+    """One heading-aware segment of a blob's text (see utils.segments)."""
+    
+    __tablename__ = "document_segments"
+    
+    content_hash = Column(String, ForeignKey("document_blobs.content_hash", ondelete="CASCADE"), primary_key=True)
+    ordinal = Column(Integer, primary_key=True)
+    heading_path = Column(Text, nullable=False, default="")  # Enclosing headings, outermost first
+    start_offset = Column(Integer, nullable=False)  # Character offsets of the segment in the text
+    end_offset = Column(Integer, nullable=False)
+    segment_hash = Column(String, nullable=False, index=True)
+    codec = Column(String, nullable=False)  # zstd, zlib or none
+    data = Column(LargeBinary, nullable=False)
+    
+    @property
+    def text(self) -> str:
+        """Decompressed segment text."""
+        return decompress_text(self.codec, self.data)
+
+
 class DocumentationTable(Base):
-    """Documentation database table."""
+    """Documentation database table.
+    
+    Text lives in ``DocumentBlobTable``; rows only hold its ``content_hash``.
+    """
     
     __tablename__ = "documentation"
     
@@ -67,22 +143,53 @@ class DocumentationTable(Base):
     title = Column(String, nullable=False)
     url = Column(String, nullable=False)
     doc_type = Column(Enum(DocumentationType), nullable=False, index=True)
-    content = Column(Text, nullable=True)
-    content_hash = Column(String, nullable=True, index=True)
+    # Active history so the blob listeners always see the hash being replaced
+    content_hash = column_property(
+        Column(String, ForeignKey("document_blobs.content_hash"), nullable=True, index=True),
+        active_history=True,
+    )
+    etag = Column(String, nullable=True)  # Validators from the last fetch, sent back on re-scrape
+    last_modified = Column(String, nullable=True)
+    truncated = Column(Boolean, nullable=False, default=False)  # Download stopped at max_download_bytes
     scrape_status = Column(Enum(ScrapeStatus), default=ScrapeStatus.PENDING, index=True)
     last_scraped = Column(DateTime, nullable=True)
-    error_message = Column(Text, nullable=True)
+    error_message = deferred(Column(Text, nullable=True), raiseload=True)
     created_at = Column(DateTime, default=func.now(), nullable=False)
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False, index=True)
     
     # Relationships
     project = relationship("ProjectTable", back_populates="documentation")
     update_records = relationship("UpdateRecordTable", back_populates="documentation", cascade="all, delete-orphan")
+    # Never lazy-loaded: readers that need the text ask for it with selectinload()
+    blob = relationship("DocumentBlobTable", lazy="raise", viewonly=True)
     
     # Constraints
     __table_args__ = (
         UniqueConstraint("project_id", "url", name="uq_documentation_project_url"),
     )
+    
+    @property
+    def content(self) -> Optional[str]:
+        """Document text: text assigned since loading, else the eager-loaded blob's."""
+        pending = self.__dict__.get("_pending_content")
+        if pending is not None and pending[0] == self.content_hash:
+            return pending[1]
+        if self.content_hash is None:
+            return None
+        return self.blob.text
+    
+    @content.setter
+    def content(self, text: Optional[str]) -> None:
+        self.set_content(text)
+    
+    def set_content(self, text: Optional[str], segments: Optional[List[Any]] = None) -> None:
+        """Point the row at the blob for ``text``; the blob is written on flush.
+        
+        ``segments`` from the processing stage are stored with a new blob;
+        without them the text is split on flush.
+        """
+        self.content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest() if text is not None else None
+        self._pending_content = (self.content_hash, text, segments)
 
 
 class UpdateRecordTable(Base):
@@ -97,6 +204,15 @@ class UpdateRecordTable(Base):
     changes_detected = Column(Boolean, nullable=False, default=False)
     checked_at = Column(DateTime, default=func.now(), nullable=False, index=True)
     
+    # Segment diff of a content change (null when the content was unchanged)
+    segments_added = Column(Integer, nullable=True)
+    segments_removed = Column(Integer, nullable=True)
+    segments_unchanged = Column(Integer, nullable=True)
+    lines_added = Column(Integer, nullable=True)
+    lines_removed = Column(Integer, nullable=True)
+    changed_headings = Column(Text, nullable=True)  # JSON list of heading paths
+    diff_summary = Column(Text, nullable=True)  # Truncated unified diff of the changed lines
+    
     # Relationships
     documentation = relationship("DocumentationTable", back_populates="update_records")
 
@@ -122,6 +238,12 @@ class ScrapingJobTable(Base):
     # Relationships
     project = relationship("ProjectTable")
     documentation = relationship("DocumentationTable")
+    
+    # Constraints
+    __table_args__ = (
+        # Claim order for services.job_queue
+        Index("ix_scraping_jobs_claim", "status", "priority", "scheduled_at"),
+    )
 
 
 class CacheTable(Base):
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 from sqlalchemy.pool import StaticPool
 
 from .models import Base
+from .upgrade import upgrade_schema
 
 logger = logging.getLogger(__name__)
 
@@ -53,9 +54,10 @@ class DatabaseManager:
             expire_on_commit=False,
         )
         
-        # Create tables
+        # Create tables, then upgrade any left by an older release
         async with self.engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(upgrade_schema)
         
         logger.info("Database initialized successfully")
     
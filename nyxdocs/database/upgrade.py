@@ -0,0 +1,108 @@
+"""In-place upgrade of databases created by older releases.
+
+``create_all`` only creates missing tables, so a database from before
+content-addressed storage keeps its old ``documentation`` table: text
+inline in a ``content`` column, and no ``etag``, ``truncated`` and other
+later columns. :func:`upgrade_schema` runs after ``create_all`` and
+
+* adds columns and indexes the models define but existing tables lack,
+* moves inline ``content`` into blobs (hashed, segmented and compressed
+  through :class:`BlobStore`), pointing ``content_hash`` at them, and
+  then drops the column,
+* rebuilds the full-text index from the moved text.
+
+It runs in the startup transaction, so an interrupted upgrade is rolled
+back and simply runs again on the next start.
+"""
+
+import hashlib
+import logging
+from typing import Dict, Set
+
+from sqlalchemy import Column, Table, inspect, literal, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateIndex
+
+from .blobs import BlobStore
+from .fulltext import FullTextIndex
+from .models import Base, DocumentationTable
+
+logger = logging.getLogger(__name__)
+
+# Legacy documentation rows moved into blobs per batch
+_BATCH_SIZE = 200
+
+
+def upgrade_schema(connection: Connection) -> None:
+    """Bring tables created by an older release up to the current models."""
+    inspector = inspect(connection)
+    existing = set(inspector.get_table_names())
+    columns: Dict[str, Set[str]] = {
+        name: {column["name"] for column in inspector.get_columns(name)} for name in existing
+    }
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing:
+            continue
+        for column in table.columns:
+            if column.name not in columns[table.name]:
+                _add_column(connection, table, column)
+        for index in table.indexes:
+            # Reflection misses expression indexes, so let the database check
+            connection.execute(CreateIndex(index, if_not_exists=True))
+
+    if "content" in columns.get(DocumentationTable.__tablename__, set()):
+        _move_inline_content(connection)
+
+
+def _add_column(connection: Connection, table: Table, column: Column) -> None:
+    """``ALTER TABLE ... ADD COLUMN`` for a column missing from an existing table."""
+    dialect = connection.dialect
+    ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=dialect)}"
+    default = column.default.arg if column.default is not None and column.default.is_scalar else None
+    if default is not None:
+        value = literal(default, column.type).compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+        ddl += f" DEFAULT {value}"
+        if not column.nullable:
+            ddl += " NOT NULL"
+    connection.execute(text(ddl))
+    logger.info(f"Added column {table.name}.{column.name}")
+
+
+def _move_inline_content(connection: Connection) -> None:
+    """Move legacy inline ``documentation.content`` into blobs and drop the column."""
+    # Legacy hashes of rows without text point at no blob
+    connection.execute(text(
+        "UPDATE documentation SET content_hash = NULL "
+        "WHERE content IS NULL AND content_hash IS NOT NULL "
+        "AND content_hash NOT IN (SELECT content_hash FROM document_blobs)"
+    ))
+
+    moved = 0
+    last_id = ""
+    while True:
+        rows = connection.execute(
+            text(
+                "SELECT id, content FROM documentation "
+                "WHERE content IS NOT NULL AND id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": _BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+
+        for doc_id, content in rows:
+            content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+            BlobStore.acquire(connection, content_hash, content)
+            connection.execute(
+                text("UPDATE documentation SET content_hash = :hash WHERE id = :id"),
+                {"hash": content_hash, "id": doc_id},
+            )
+        moved += len(rows)
+        last_id = rows[-1][0]
+        logger.info(f"Moved {moved} documents into content-addressed storage")
+
+    connection.execute(text("ALTER TABLE documentation DROP COLUMN content"))
+    if moved:
+        FullTextIndex.rebuild(connection)
+    logger.info(f"Upgraded documentation storage ({moved} documents moved, inline content column dropped)")
@@ -69,6 +69,32 @@ class ScrapeStatus(str, Enum):
     SKIPPED = "skipped"
 
 
+class DocumentationField(str, Enum):
+    """Documentation fields a reader can ask for (id, project, title, URL and type always come back)."""
+    
+    TITLE = "title"
+    URL = "url"
+    DOC_TYPE = "doc_type"
+    CONTENT = "content"
+    CONTENT_HASH = "content_hash"
+    TRUNCATED = "truncated"
+    SCRAPE_STATUS = "scrape_status"
+    LAST_SCRAPED = "last_scraped"
+    ERROR_MESSAGE = "error_message"
+    CREATED_AT = "created_at"
+    UPDATED_AT = "updated_at"
+
+
+# What a documentation listing shows: everything small
+DOCUMENTATION_SUMMARY_FIELDS = [
+    DocumentationField.TITLE,
+    DocumentationField.URL,
+    DocumentationField.DOC_TYPE,
+    DocumentationField.SCRAPE_STATUS,
+    DocumentationField.LAST_SCRAPED,
+]
+
+
 class Project(BaseModel):
     """Cryptocurrency project model."""
     
@@ -99,6 +125,7 @@ class Documentation(BaseModel):
     doc_type: DocumentationType = Field(..., description="Documentation type")
     content: Optional[str] = Field(None, description="Documentation content")
     content_hash: Optional[str] = Field(None, description="Content hash for change detection")
+    truncated: bool = Field(False, description="Whether the download was cut at the size limit")
     scrape_status: ScrapeStatus = Field(ScrapeStatus.PENDING, description="Scraping status")
     last_scraped: Optional[datetime] = Field(None, description="Last scraping time")
     error_message: Optional[str] = Field(None, description="Error message if scraping failed")
@@ -118,6 +145,13 @@ class UpdateRecord(BaseModel):
     new_hash: str = Field(..., description="New content hash")
     changes_detected: bool = Field(..., description="Whether changes were detected")
     checked_at: datetime = Field(..., description="When the check was performed")
+    segments_added: Optional[int] = Field(None, description="Segments new in this version")
+    segments_removed: Optional[int] = Field(None, description="Segments dropped from the previous version")
+    segments_unchanged: Optional[int] = Field(None, description="Segments carried over unchanged")
+    lines_added: Optional[int] = Field(None, description="Lines added")
+    lines_removed: Optional[int] = Field(None, description="Lines removed")
+    changed_headings: List[str] = Field(default_factory=list, description="Headings of the changed sections")
+    diff_summary: Optional[str] = Field(None, description="Truncated unified diff of the changed lines")
     
     class Config:
         use_enum_values = True
@@ -141,6 +175,7 @@ class SearchResult(BaseModel):
     project: Project
     documentation_count: int = Field(..., description="Number of available documents")
     last_updated: Optional[datetime] = Field(None, description="Last update time")
+    score: Optional[float] = Field(None, description="Relevance score, for ranked searches")
 
 
 class SearchResponse(BaseModel):
@@ -157,6 +192,10 @@ class ProjectInfoRequest(BaseModel):
     project_name: str = Field(..., description="Project name or symbol")
     include_documentation: bool = Field(True, description="Include documentation list")
     include_blockchain_info: bool = Field(True, description="Include blockchain information")
+    documentation_fields: List[DocumentationField] = Field(
+        default_factory=lambda: list(DOCUMENTATION_SUMMARY_FIELDS),
+        description="Documentation fields to load for the list"
+    )
 
 
 class ProjectInfoResponse(BaseModel):
@@ -173,6 +212,7 @@ class DocumentationRequest(BaseModel):
     project_name: str = Field(..., description="Project name or symbol")
     doc_title: Optional[str] = Field(None, description="Specific document title")
     format: str = Field("markdown", description="Output format")
+    fields: Optional[List[DocumentationField]] = Field(None, description="Documentation fields to load (all if unset)")
 
 
 class DocumentationResponse(BaseModel):
@@ -182,6 +222,63 @@ class DocumentationResponse(BaseModel):
     documents: List[Documentation] = Field(..., description="Documentation list")
 
 
+class DocumentationPageRequest(BaseModel):
+    """Paginated documentation read request model.
+    
+    Either a ``cursor`` from a previous page, a ``documentation_id``, or a
+    ``project_name`` (optionally with ``doc_title``) picks the document.
+    """
+    
+    project_name: Optional[str] = Field(None, description="Project name or symbol")
+    doc_title: Optional[str] = Field(None, description="Specific document title")
+    documentation_id: Optional[str] = Field(None, description="Documentation ID")
+    cursor: Optional[str] = Field(None, description="Continuation cursor from a previous page")
+    max_chars: int = Field(10000, ge=500, le=100000, description="Maximum characters per page")
+
+
+class DocumentationPage(BaseModel):
+    """One window of a document's content."""
+    
+    documentation_id: str = Field(..., description="Documentation ID")
+    project_name: str = Field(..., description="Project name")
+    title: str = Field(..., description="Documentation title")
+    url: str = Field(..., description="Documentation URL")
+    doc_type: DocumentationType = Field(..., description="Documentation type")
+    content: str = Field(..., description="Content of this page")
+    section: Optional[str] = Field(None, description="Headings the page starts under")
+    offset: int = Field(..., description="Character offset of the page in the document")
+    total_chars: int = Field(..., description="Characters in the whole document")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (None on the last page)")
+
+
+class DocumentationSearchRequest(BaseModel):
+    """Full-text documentation search request model."""
+    
+    query: str = Field(..., description="Full-text search query")
+    project_name: Optional[str] = Field(None, description="Restrict search to a project")
+    limit: int = Field(10, ge=1, le=50, description="Maximum number of matches")
+
+
+class DocumentationSearchHit(BaseModel):
+    """A ranked documentation match with a highlighted snippet."""
+    
+    documentation_id: str = Field(..., description="Documentation ID")
+    project_name: str = Field(..., description="Project name")
+    title: str = Field(..., description="Documentation title")
+    url: str = Field(..., description="Documentation URL")
+    snippet: str = Field(..., description="Highlighted excerpt around the match")
+    rank: float = Field(..., description="Relevance score (higher is better)")
+    section: Optional[str] = Field(None, description="Headings of the best-matching section")
+
+
+class DocumentationSearchResponse(BaseModel):
+    """Full-text documentation search response model."""
+    
+    hits: List[DocumentationSearchHit] = Field(..., description="Ranked matches")
+    total: int = Field(..., description="Number of matches returned")
+    query: str = Field(..., description="Original search query")
+
+
 class UpdateCheckRequest(BaseModel):
     """Update check request model."""
     
@@ -1,7 +1,14 @@
 """Documentation scrapers for NyxDocs."""
 
-from .base import BaseScraper
+from .base import BaseScraper, FetchResult, UnsupportedContentType
 from .github_scraper import GitHubScraper
+from .processing import ProcessedDocument
 from .web_scraper import WebScraper
 
-__all__ = ["BaseScraper", "GitHubScraper", "WebScraper"]
+__all__ = [
+    "BaseScraper",
+    "FetchResult",
+    "GitHubScraper", "ProcessedDocument",
+    "UnsupportedContentType",
+    "WebScraper",
+]
@@ -1,28 +1,101 @@
 """Base scraper class for documentation extraction."""
 
-import hashlib
+import codecs
 import logging
+import re
 from abc import ABC, abstractmethod
-from typing import Optional, Tuple
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
 
 import httpx
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import (
+    retry,
+    retry_if_not_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+)
 
 from ..config import get_settings
 from ..models import DocumentationType
+from ..utils.http import SharedClient, get_http_pool
+from .politeness import DisallowedByRobots, get_host_scheduler
+from .processing import (
+    ProcessedDocument,
+    ProcessingStage,
+    clean_content,
+    content_hash,
+    extract_document,
+    get_processing_stage,
+    process_document,
+)
 
 logger = logging.getLogger(__name__)
 
+# Content types worth downloading; anything else (PDF, images, archives) is rejected
+TEXT_CONTENT_TYPES = (
+    "text/",
+    "application/xhtml+xml",
+    "application/xml",
+    "application/json",
+    "application/yaml",
+    "application/x-yaml",
+)
+
+# Default download budget per character of max_content_length; markup
+# usually outweighs the text extracted from it several times over
+DOWNLOAD_BYTES_PER_CHAR = 8
+
+# <meta charset> or http-equiv declarations near the top of an HTML page
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-zA-Z0-9_.:-]+)""", re.I)
+
+
+class UnsupportedContentType(Exception):
+    """Raised when a response is not a text document."""
+
+
+@dataclass
+class FetchResult:
+    """Outcome of a (possibly conditional) fetch."""
+    
+    url: str
+    status_code: int
+    content: Optional[bytes] = None
+    encoding: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    truncated: bool = False
+    
+    @property
+    def text(self) -> Optional[str]:
+        """The body decoded with the response charset."""
+        if self.content is None:
+            return None
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+        
+    @property
+    def not_modified(self) -> bool:
+        """Whether the server answered 304 Not Modified."""
+        return self.status_code == 304
+
 
 class BaseScraper(ABC):
     """Base class for documentation scrapers."""
     
+    # Whether requests consult the target host's robots.txt
+    respect_robots = True
+    
+    # How fetched bodies are extracted ("html" or "text", see processing.py)
+    extractor = "text"
+    
     def __init__(self, name: str, doc_type: DocumentationType):
         """Initialize the scraper."""
         self.name = name
         self.doc_type = doc_type
         self.settings = get_settings()
-        self.client: Optional[httpx.AsyncClient] = None
+        self.client: Optional[SharedClient] = None
+        self.scheduler = get_host_scheduler()
+        # None uses the process-wide stage sized by worker_processes
+        self.stage: Optional[ProcessingStage] = None
         
     async def __aenter__(self):
         """Async context manager entry."""
@@ -34,83 +107,167 @@ class BaseScraper(ABC):
         await self.stop()
         
     async def start(self) -> None:
-        """Start the scraper and initialize HTTP client."""
+        """Start the scraper with a client borrowed from the shared pool."""
         if self.client is None:
-            self.client = httpx.AsyncClient(
-                timeout=httpx.Timeout(self.settings.scrape_timeout),
+            self.client = get_http_pool().session(
+                timeout=self.settings.scrape_timeout,
                 headers={"User-Agent": self.settings.user_agent},
-                limits=httpx.Limits(max_connections=5, max_keepalive_connections=2),
-                follow_redirects=True
+                follow_redirects=True,
             )
         logger.info(f"Started {self.name} scraper")
         
     async def stop(self) -> None:
-        """Stop the scraper and cleanup resources."""
-        if self.client:
-            await self.client.aclose()
-            self.client = None
+        """Stop the scraper; pooled connections stay open for reuse."""
+        self.client = None
         logger.info(f"Stopped {self.name} scraper")
         
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a request through the per-host politeness scheduler."""
+        if not self.client:
+            raise RuntimeError("Scraper not started")
+        return await self.scheduler.request(
+            self.client, method, url, respect_robots=self.respect_robots, **kwargs
+        )
+        
     @retry(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=8)
+        wait=wait_exponential(multiplier=1, min=2, max=8),
+        retry=retry_if_not_exception_type((DisallowedByRobots, UnsupportedContentType)),
+        reraise=True,
     )
-    async def fetch_content(self, url: str) -> str:
-        """Fetch content from URL with retry logic."""
-        if not self.client:
-            raise RuntimeError("Scraper not started")
+    async def fetch(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> FetchResult:
+        """Fetch URL, sending validators from a previous fetch when given.
+        
+        A ``304 Not Modified`` is returned as a result with ``not_modified``
+        set and no body; other non-2xx responses raise. The body is streamed
+        and only read up to ``max_download_bytes``; anything that is not a
+        text document is rejected before its body is downloaded.
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
             
         try:
-            response = await self.client.get(url)
-            response.raise_for_status()
-            return response.text
+            async with self.scheduler.stream(
+                self.client, "GET", url, respect_robots=self.respect_robots, headers=headers
+            ) as response:
+                if response.status_code == 304:
+                    # Some servers omit validators on 304; keep the ones we sent
+                    return FetchResult(
+                        url=url,
+                        status_code=304,
+                        etag=response.headers.get("ETag") or etag,
+                        last_modified=response.headers.get("Last-Modified") or last_modified,
+                    )
+                response.raise_for_status()
+                
+                content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+                if content_type and not content_type.startswith(TEXT_CONTENT_TYPES):
+                    raise UnsupportedContentType(f"{url} is {content_type}")
+                    
+                content, truncated = await self._read_body(response)
+                if truncated:
+                    logger.warning(f"Truncated {url} at {len(content):,} bytes")
+                return FetchResult(
+                    url=url,
+                    status_code=response.status_code,
+                    content=content,
+                    encoding=self._response_encoding(response, content),
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                    truncated=truncated,
+                )
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error {e.response.status_code} for {url}: {e}")
             raise
         except httpx.RequestError as e:
             logger.error(f"Request error for {url}: {e}")
             raise
+        except DisallowedByRobots:
+            logger.info(f"Skipping {url}: disallowed by robots.txt")
+            raise
+        except UnsupportedContentType as e:
+            logger.info(f"Skipping {e}")
+            raise
         except Exception as e:
             logger.error(f"Unexpected error for {url}: {e}")
             raise
             
-    def calculate_content_hash(self, content: str) -> str:
-        """Calculate SHA-256 hash of content for change detection."""
-        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+    async def _read_body(self, response: httpx.Response) -> Tuple[bytes, bool]:
+        """Read at most ``max_download_bytes`` of a streamed body.
         
-    def clean_content(self, content: str) -> str:
-        """Clean and normalize content."""
-        if not content:
-            return ""
+        Returns the body and whether it was cut short. A cut body ends on a
+        whole character of the response charset.
+        """
+        budget = self.settings.max_download_bytes or self.settings.max_content_length * DOWNLOAD_BYTES_PER_CHAR
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body += chunk
+            if len(body) >= budget:
+                break
+        else:
+            return bytes(body), False
             
-        # Remove excessive whitespace
-        lines = content.split('\n')
-        cleaned_lines = []
+        del body[budget:]
+        encoding = self._response_encoding(response, body)
+        try:
+            # Bytes the decoder holds back are an incomplete trailing character
+            decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+            decoder.decode(bytes(body), final=False)
+            pending = decoder.getstate()[0]
+            if pending:
+                del body[-len(pending):]
+        except LookupError:
+            pass
+        return bytes(body), True
         
-        for line in lines:
-            # Strip whitespace from each line
-            cleaned_line = line.strip()
-            cleaned_lines.append(cleaned_line)
+    @staticmethod
+    def _response_encoding(response: httpx.Response, content: bytes) -> str:
+        """Charset from the Content-Type header, else a ``<meta>`` declaration, else UTF-8."""
+        for candidate in (response.charset_encoding, _sniff_meta_charset(content)):
+            if candidate:
+                try:
+                    return codecs.lookup(candidate).name
+                except LookupError:
+                    continue
+        return "utf-8"
         
-        # Join lines and remove excessive empty lines
-        cleaned_content = '\n'.join(cleaned_lines)
+    async def fetch_content(self, url: str) -> str:
+        """Fetch content from URL with retry logic."""
+        result = await self.fetch(url)
+        return result.text or ""
         
-        # Remove more than 2 consecutive newlines
-        import re
-        cleaned_content = re.sub(r'\n{3,}', '\n\n', cleaned_content)
+    def fetch_url(self, url: str) -> str:
+        """URL to download for a documentation URL."""
+        return url
         
-        # Limit content length
-        if len(cleaned_content) > self.settings.max_content_length:
-            cleaned_content = cleaned_content[:self.settings.max_content_length] + "\n\n[Content truncated]"
+    async def prefetch(self, urls: List[str]) -> None:
+        """Fetch many documents ahead of their checks where the source can batch them.
         
-        return cleaned_content.strip()
+        The default does nothing, and each document is fetched on its own.
+        """
+        return
+        
+    def calculate_content_hash(self, content: str) -> str:
+        """Calculate SHA-256 hash of content for change detection."""
+        return content_hash(content)
+        
+    def clean_content(self, content: str) -> str:
+        """Clean and normalize content."""
+        return clean_content(content, self.settings.max_content_length)
         
     @abstractmethod
     async def can_scrape(self, url: str) -> bool:
         """Check if this scraper can handle the given URL."""
         pass
         
-    @abstractmethod
     async def scrape(self, url: str) -> Tuple[str, str]:
         """
         Scrape documentation from URL.
@@ -118,7 +275,40 @@ class BaseScraper(ABC):
         Returns:
             Tuple of (title, content)
         """
-        pass
+        try:
+            result = await self.fetch(self.fetch_url(url))
+            document = await self.process(url, result)
+            return document.title, document.content
+        except Exception as e:
+            logger.error(f"Error scraping {self.name} URL {url}: {e}")
+            raise
+            
+    def extract(self, url: str, raw: str) -> Tuple[str, str]:
+        """
+        Extract documentation from a fetched body in the calling thread.
+        
+        Returns:
+            Tuple of (title, cleaned content)
+        """
+        return extract_document(
+            self.extractor, url, raw, self.settings.html_parser, self.settings.max_content_length
+        )
+        
+    async def process(self, url: str, result: FetchResult) -> ProcessedDocument:
+        """Decode, extract, clean, hash and segment a fetched body in the processing stage."""
+        stage = self.stage or get_processing_stage()
+        processed = await stage.run(
+            process_document,
+            self.extractor,
+            url,
+            result.content or b"",
+            result.encoding,
+            self.settings.html_parser,
+            self.settings.max_content_length,
+            self.settings.segment_max_chars,
+            self.settings.segment_min_chars,
+        )
+        return ProcessedDocument._make(processed)
         
     @abstractmethod
     async def discover_docs(self, project_url: str) -> list[dict]:
@@ -129,3 +319,8 @@ class BaseScraper(ABC):
             List of dicts with 'url', 'title', and 'type' keys
         """
         pass
+
+
+def _sniff_meta_charset(content: bytes) -> Optional[str]:
+    match = _META_CHARSET.search(content[:2048])
+    return match.group(1).decode("ascii") if match else None
@@ -0,0 +1,169 @@
+"""HTML title and main-content extraction engines.
+
+Two engines share the same rules. ``html.parser`` is BeautifulSoup with the
+standard-library parser. ``lxml`` walks an lxml tree with XPath equivalents
+of the content selectors and is several times faster. Extraction is plain
+functions of strings so it can run in a worker process.
+"""
+
+import logging
+from typing import Any, List, Tuple
+from urllib.parse import urlparse
+
+import lxml.etree
+import lxml.html
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+ENGINES = ("lxml", "html.parser")
+
+# Elements never part of the main content
+UNWANTED_TAGS = ["script", "style", "nav", "header", "footer", "aside", "iframe"]
+
+# Main content candidates, most specific first
+CONTENT_SELECTORS = [
+    "main",
+    '[role="main"]',
+    ".content",
+    ".documentation",
+    ".docs",
+    ".markdown-body",
+    ".post-content",
+    "article",
+    ".container .row .col",
+    "body",
+]
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# XPath equivalents of CONTENT_SELECTORS (first match in document order)
+_CONTENT_XPATHS = [
+    lxml.etree.XPath(path)
+    for path in (
+        "(//main)[1]",
+        "(//*[@role='main'])[1]",
+        f"(//*[{_has_class('content')}])[1]",
+        f"(//*[{_has_class('documentation')}])[1]",
+        f"(//*[{_has_class('docs')}])[1]",
+        f"(//*[{_has_class('markdown-body')}])[1]",
+        f"(//*[{_has_class('post-content')}])[1]",
+        "(//article)[1]",
+        f"(//*[{_has_class('container')}]//*[{_has_class('row')}]//*[{_has_class('col')}])[1]",
+        "(//body)[1]",
+    )
+]
+
+_TITLE_XPATHS = [
+    ("text", lxml.etree.XPath("(//title)[1]")),
+    ("text", lxml.etree.XPath("(//h1)[1]")),
+    ("text", lxml.etree.XPath("(//h2)[1]")),
+    ("meta", lxml.etree.XPath("(//meta[@property='og:title'])[1]")),
+    ("meta", lxml.etree.XPath("(//meta[@name='title'])[1]")),
+]
+
+
+def extract_html(html: str, url: str, engine: str = "lxml") -> Tuple[str, str]:
+    """Extract (title, uncleaned main content) from an HTML page."""
+    if engine == "lxml":
+        return _extract_lxml(html, url)
+    if engine == "html.parser":
+        soup = BeautifulSoup(html, "html.parser")
+        return soup_title(soup, url), soup_content(soup)
+    raise ValueError(f"Unknown HTML extraction engine: {engine}")
+
+
+def title_from_url(url: str) -> str:
+    """Fallback title from the last URL path segment."""
+    path = urlparse(url).path.strip("/")
+    if path:
+        return path.split("/")[-1] or "Documentation"
+    return "Documentation"
+
+
+def soup_title(soup: BeautifulSoup, url: str) -> str:
+    """Extract the title from a parsed page."""
+    # Try different title sources
+    title_sources = [
+        soup.find("title"),
+        soup.find("h1"),
+        soup.find("h2"),
+        soup.find("meta", {"property": "og:title"}),
+        soup.find("meta", {"name": "title"}),
+    ]
+
+    for source in title_sources:
+        if source:
+            if source.name == "meta":
+                title = source.get("content", "")
+            else:
+                title = source.get_text(strip=True)
+
+            if title:
+                return title[:100]  # Limit title length
+
+    return title_from_url(url)
+
+
+def soup_content(soup: BeautifulSoup) -> str:
+    """Extract the main content text from a parsed page (modifies ``soup``)."""
+    # Remove unwanted elements
+    for element in soup(UNWANTED_TAGS):
+        element.decompose()
+
+    # Try to find main content area
+    content_element = None
+    for selector in CONTENT_SELECTORS:
+        content_element = soup.select_one(selector)
+        if content_element:
+            break
+
+    if not content_element:
+        content_element = soup.find("body") or soup
+
+    return content_element.get_text(separator="\n", strip=True)
+
+
+def _extract_lxml(html: str, url: str) -> Tuple[str, str]:
+    try:
+        root = lxml.html.document_fromstring(html)
+    except ValueError:
+        # Strings with an XML encoding declaration must be parsed as bytes
+        root = lxml.html.document_fromstring(html.encode("utf-8"))
+    except lxml.etree.ParserError:
+        # Empty document
+        return title_from_url(url), ""
+
+    title = None
+    for kind, xpath in _TITLE_XPATHS:
+        found = xpath(root)
+        if not found:
+            continue
+        element = found[0]
+        title = element.get("content", "") if kind == "meta" else "".join(_strings(element))
+        if title:
+            break
+    title = title[:100] if title else title_from_url(url)
+
+    for element in list(root.iter(*UNWANTED_TAGS)):
+        # drop_tree keeps the element's tail text, as decompose() does
+        element.drop_tree()
+
+    content_element = root
+    for xpath in _CONTENT_XPATHS:
+        found = xpath(root)
+        if found:
+            content_element = found[0]
+            break
+
+    return title, "\n".join(_strings(content_element))
+
+
+def _strings(element: Any) -> List[str]:
+    """Non-empty stripped text nodes under ``element``, in document order."""
+    # itertext() skips comment and processing-instruction text, like get_text()
+    return [text for text in (node.strip() for node in element.itertext()) if text]
+
@@ -1,12 +1,16 @@
 """GitHub documentation scraper."""
 
+import asyncio
 import logging
 import re
-from typing import List, Tuple
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 
+from ..collectors.github_graphql import GitHubGraphQLFetcher
 from ..models import DocumentationType
-from .base import BaseScraper
+from .base import BaseScraper, FetchResult
 
 logger = logging.getLogger(__name__)
 
@@ -14,36 +18,104 @@ logger = logging.getLogger(__name__)
 class GitHubScraper(BaseScraper):
     """Scraper for GitHub repository documentation."""
     
+    # API and raw-file endpoints are meant for programmatic access
+    respect_robots = False
+    
+    API_URL = "https://api.github.com"
+    README_NAMES = ["README.md", "README.rst", "README.txt", "README"]
+    DOC_DIRS = ["docs", "documentation", "doc", "wiki"]
+    
+    # Repositories whose discovered docs are remembered
+    TREE_CACHE_SIZE = 1024
+    
+    # Prefetched files held for fetch(), and for how long (seconds)
+    PREFETCH_CACHE_SIZE = 4096
+    PREFETCH_TTL = 3600
+    
     def __init__(self):
         """Initialize GitHub scraper."""
         super().__init__("GitHub", DocumentationType.GITHUB)
         self.github_token = self.settings.github_token
+        # owner/repo -> (HEAD ETag, commit SHA, discovered docs)
+        self._tree_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        # raw URL -> (monotonic time fetched, text)
+        self._prefetched: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
         
     async def can_scrape(self, url: str) -> bool:
         """Check if URL is a GitHub repository or documentation."""
-        return "github.com" in url
+        # Discovered files are stored as raw.githubusercontent.com URLs
+        return "github.com" in url or "raw.githubusercontent.com" in url
         
-    async def scrape(self, url: str) -> Tuple[str, str]:
-        """Scrape documentation from GitHub URL."""
-        try:
-            # Convert GitHub URL to raw content URL if needed
-            raw_url = self._convert_to_raw_url(url)
-            
-            # Fetch content
-            content = await self.fetch_content(raw_url)
-            
-            # Extract title from URL or content
-            title = self._extract_title(url, content)
-            
-            # Clean content
-            cleaned_content = self.clean_content(content)
+    def fetch_url(self, url: str) -> str:
+        """Download GitHub files from raw.githubusercontent.com."""
+        return self._convert_to_raw_url(url)
+        
+    async def prefetch(self, urls: List[str]) -> None:
+        """Read README and docs-directory files of many repositories through GraphQL.
+        
+        Raw file URLs on a repository's default branch are answered by one
+        batched query per group of repositories instead of one download each;
+        :meth:`fetch` then serves them from memory. GraphQL needs a token, so
+        without one every file is still downloaded on its own.
+        """
+        if not self.github_token:
+            return
             
-            return title, cleaned_content
+        # owner/repo -> [(raw URL, ref, path)] for files not already held
+        wanted: Dict[str, List[Tuple[str, str, str]]] = {}
+        for url in urls[:self.PREFETCH_CACHE_SIZE]:
+            raw_url = self._convert_to_raw_url(url)
+            parsed = urlparse(raw_url)
+            parts = parsed.path.strip("/").split("/", 3)
+            if parsed.netloc != "raw.githubusercontent.com" or len(parts) < 4 or self._fresh(raw_url):
+                continue
+            wanted.setdefault(f"{parts[0]}/{parts[1]}", []).append((raw_url, parts[2], parts[3]))
+        if not wanted:
+            return
             
+        fetcher = GitHubGraphQLFetcher(self.settings, paths=self.README_NAMES + self.DOC_DIRS)
+        await fetcher.start()
+        try:
+            async for bundle in fetcher.fetch(wanted):
+                branch = bundle.repo["default_branch"]
+                for raw_url, ref, path in wanted[bundle.full_name]:
+                    if ref in ("HEAD", branch) and path in bundle.files:
+                        self._prefetched[raw_url] = (time.monotonic(), bundle.files[path])
+                        self._prefetched.move_to_end(raw_url)
         except Exception as e:
-            logger.error(f"Error scraping GitHub URL {url}: {e}")
-            raise
+            logger.warning(f"GitHub prefetch failed, files will be downloaded one by one: {e}")
+        finally:
+            await fetcher.stop()
+            
+        while len(self._prefetched) > self.PREFETCH_CACHE_SIZE:
+            self._prefetched.popitem(last=False)
             
+    async def fetch(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> FetchResult:
+        """Serve a prefetched file once, otherwise download it."""
+        if self._fresh(url):
+            _, text = self._prefetched.pop(url)
+            # The validators still describe the last download, so later conditional GETs stay correct
+            return FetchResult(
+                url=url,
+                status_code=200,
+                content=text.encode("utf-8"),
+                encoding="utf-8",
+                etag=etag,
+                last_modified=last_modified,
+            )
+        self._prefetched.pop(url, None)
+        return await super().fetch(url, etag, last_modified)
+        
+    def _fresh(self, url: str) -> bool:
+        """Whether prefetched text for a URL is held and younger than ``PREFETCH_TTL``."""
+        held = self._prefetched.get(url)
+        return held is not None and time.monotonic() - held[0] < self.PREFETCH_TTL
+        
     async def discover_docs(self, project_url: str) -> List[dict]:
         """Discover documentation in a GitHub repository."""
         docs = []
@@ -54,16 +126,12 @@ class GitHubScraper(BaseScraper):
             if not owner or not repo:
                 return docs
             
-            # Check for README files
-            readme_docs = await self._find_readme_files(owner, repo)
-            docs.extend(readme_docs)
-            
-            # Check for docs directory
-            docs_dir = await self._find_docs_directory(owner, repo)
-            docs.extend(docs_dir)
-            
-            # Check for wiki
-            wiki_docs = await self._check_wiki(owner, repo)
+            # Repository files and the wiki are independent lookups
+            repo_docs, wiki_docs = await asyncio.gather(
+                self._find_repo_docs(owner, repo),
+                self._check_wiki(owner, repo),
+            )
+            docs.extend(repo_docs)
             docs.extend(wiki_docs)
             
         except Exception as e:
@@ -71,6 +139,103 @@ class GitHubScraper(BaseScraper):
             
         return docs
         
+    async def _find_repo_docs(self, owner: str, repo: str) -> List[dict]:
+        """Find README and docs files, reusing results while HEAD is unchanged."""
+        key = f"{owner}/{repo}".lower()
+        cached = self._tree_cache.get(key)
+        etag, sha = await self._head_sha(owner, repo, cached)
+        
+        if cached is not None and sha == cached[1]:
+            self._tree_cache.move_to_end(key)
+            return list(cached[2])
+            
+        docs = await self._docs_from_tree(owner, repo, sha) if sha else None
+        if docs is None:
+            # Tree unavailable (empty repo, truncated listing, API error)
+            readme_docs, dir_docs = await asyncio.gather(
+                self._find_readme_files(owner, repo),
+                self._find_docs_directory(owner, repo),
+            )
+            docs = readme_docs + dir_docs
+            
+        if sha:
+            self._tree_cache[key] = (etag, sha, docs)
+            self._tree_cache.move_to_end(key)
+            while len(self._tree_cache) > self.TREE_CACHE_SIZE:
+                self._tree_cache.popitem(last=False)
+        return list(docs)
+        
+    async def _head_sha(
+        self, owner: str, repo: str, cached: Optional[tuple]
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Resolve the default branch's (ETag, commit SHA), conditionally when possible."""
+        headers = self._api_headers()
+        headers["Accept"] = "application/vnd.github.sha"
+        if cached is not None and cached[0]:
+            headers["If-None-Match"] = cached[0]
+            
+        try:
+            url = f"{self.API_URL}/repos/{owner}/{repo}/commits/HEAD"
+            response = await self.request("GET", url, headers=headers)
+            if response.status_code == 304 and cached is not None:
+                # Not counted against the rate limit
+                return cached[0], cached[1]
+            if response.status_code == 200:
+                return response.headers.get("ETag"), response.text.strip() or None
+        except Exception as e:
+            logger.debug(f"Could not resolve HEAD for {owner}/{repo}: {e}")
+        return None, None
+        
+    async def _docs_from_tree(self, owner: str, repo: str, sha: str) -> Optional[List[dict]]:
+        """List README and docs files from one recursive git tree call."""
+        try:
+            url = f"{self.API_URL}/repos/{owner}/{repo}/git/trees/{sha}"
+            response = await self.request("GET", url, headers=self._api_headers(), params={"recursive": "1"})
+            if response.status_code != 200:
+                return None
+            data = response.json()
+            if data.get("truncated"):
+                return None
+        except Exception as e:
+            logger.debug(f"Git tree not available for {owner}/{repo}: {e}")
+            return None
+            
+        blobs = set()
+        trees = set()
+        for entry in data.get("tree", []):
+            (blobs if entry.get("type") == "blob" else trees).add(entry.get("path", ""))
+            
+        def raw_url(path: str) -> str:
+            # HEAD keeps the URL tracking the default branch for later updates
+            return f"https://raw.githubusercontent.com/{owner}/{repo}/HEAD/{path}"
+            
+        docs = []
+        
+        # Only take the first README found
+        for readme_name in self.README_NAMES:
+            if readme_name in blobs:
+                docs.append({"url": raw_url(readme_name), "title": readme_name, "type": "readme"})
+                break
+                
+        # Only list the first docs directory found
+        for doc_dir in self.DOC_DIRS:
+            if doc_dir in trees:
+                prefix = f"{doc_dir}/"
+                for path in sorted(blobs):
+                    name = path[len(prefix):]
+                    if path.startswith(prefix) and "/" not in name and self._is_doc_file(name):
+                        docs.append({"url": raw_url(path), "title": path, "type": "docs"})
+                break
+                
+        return docs
+        
+    def _api_headers(self) -> dict:
+        """Headers for GitHub REST API calls."""
+        headers = {"Accept": "application/vnd.github.v3+json"}
+        if self.github_token:
+            headers["Authorization"] = f"token {self.github_token}"
+        return headers
+        
     def _convert_to_raw_url(self, url: str) -> str:
         """Convert GitHub URL to raw content URL."""
         if "raw.githubusercontent.com" in url:
@@ -82,27 +247,6 @@ class GitHubScraper(BaseScraper):
         
         return url
         
-    def _extract_title(self, url: str, content: str) -> str:
-        """Extract title from URL or content."""
-        # Try to get title from URL path
-        path_parts = urlparse(url).path.strip('/').split('/')
-        if len(path_parts) >= 2:
-            filename = path_parts[-1]
-            if filename:
-                return filename
-        
-        # Try to extract title from markdown content
-        if content:
-            lines = content.split('\n')
-            for line in lines[:10]:  # Check first 10 lines
-                line = line.strip()
-                if line.startswith('# '):
-                    return line[2:].strip()
-                elif line.startswith('## '):
-                    return line[3:].strip()
-        
-        return "Documentation"
-        
     def _extract_owner_repo(self, url: str) -> Tuple[str, str]:
         """Extract owner and repository name from GitHub URL."""
         try:
@@ -116,67 +260,57 @@ class GitHubScraper(BaseScraper):
         
     async def _find_readme_files(self, owner: str, repo: str) -> List[dict]:
         """Find README files in the repository."""
-        docs = []
-        
-        readme_names = ["README.md", "README.rst", "README.txt", "README"]
+        responses = await asyncio.gather(*[
+            self._get_contents(owner, repo, readme_name) for readme_name in self.README_NAMES
+        ])
         
-        for readme_name in readme_names:
-            try:
-                url = f"https://api.github.com/repos/{owner}/{repo}/contents/{readme_name}"
-                headers = {}
-                if self.github_token:
-                    headers["Authorization"] = f"token {self.github_token}"
+        # Only take the first README found
+        for readme_name, data in zip(self.README_NAMES, responses, strict=True):
+            if isinstance(data, dict):
+                return [{
+                    "url": data["download_url"],
+                    "title": readme_name,
+                    "type": "readme"
+                }]
                 
-                response = await self.client.get(url, headers=headers)
-                if response.status_code == 200:
-                    data = response.json()
-                    docs.append({
-                        "url": data["download_url"],
-                        "title": readme_name,
-                        "type": "readme"
-                    })
-                    break  # Only take the first README found
-                    
-            except Exception as e:
-                logger.debug(f"README {readme_name} not found for {owner}/{repo}: {e}")
-                continue
-                
-        return docs
+        return []
         
     async def _find_docs_directory(self, owner: str, repo: str) -> List[dict]:
         """Find documentation directory and files."""
         docs = []
         
-        doc_dirs = ["docs", "documentation", "doc", "wiki"]
+        responses = await asyncio.gather(*[
+            self._get_contents(owner, repo, doc_dir) for doc_dir in self.DOC_DIRS
+        ])
         
-        for doc_dir in doc_dirs:
-            try:
-                url = f"https://api.github.com/repos/{owner}/{repo}/contents/{doc_dir}"
-                headers = {}
-                if self.github_token:
-                    headers["Authorization"] = f"token {self.github_token}"
-                
-                response = await self.client.get(url, headers=headers)
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    if isinstance(data, list):
-                        # Directory listing
-                        for item in data:
-                            if item["type"] == "file" and self._is_doc_file(item["name"]):
-                                docs.append({
-                                    "url": item["download_url"],
-                                    "title": f"{doc_dir}/{item['name']}",
-                                    "type": "docs"
-                                })
-                    break  # Only check the first docs directory found
-                    
-            except Exception as e:
-                logger.debug(f"Docs directory {doc_dir} not found for {owner}/{repo}: {e}")
+        for doc_dir, data in zip(self.DOC_DIRS, responses, strict=True):
+            if data is None:
                 continue
                 
+            if isinstance(data, list):
+                # Directory listing
+                for item in data:
+                    if item["type"] == "file" and self._is_doc_file(item["name"]):
+                        docs.append({
+                            "url": item["download_url"],
+                            "title": f"{doc_dir}/{item['name']}",
+                            "type": "docs"
+                        })
+            break  # Only check the first docs directory found
+            
         return docs
         
+    async def _get_contents(self, owner: str, repo: str, path: str) -> Optional[Any]:
+        """Fetch a contents API entry, or None if it is missing."""
+        try:
+            url = f"{self.API_URL}/repos/{owner}/{repo}/contents/{path}"
+            response = await self.request("GET", url, headers=self._api_headers())
+            if response.status_code == 200:
+                return response.json()
+        except Exception as e:
+            logger.debug(f"{path} not found for {owner}/{repo}: {e}")
+        return None
+        
     async def _check_wiki(self, owner: str, repo: str) -> List[dict]:
         """Check if repository has a wiki."""
         docs = []
@@ -184,7 +318,7 @@ class GitHubScraper(BaseScraper):
         try:
             # Check if wiki exists by trying to access it
             wiki_url = f"https://github.com/{owner}/{repo}/wiki"
-            response = await self.client.head(wiki_url)
+            response = await self.request("HEAD", wiki_url)
             
             if response.status_code == 200:
                 docs.append({
@@ -0,0 +1,226 @@
+"""Per-host politeness scheduling for scrapers."""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+from ..config import Settings, get_settings
+from ..utils.rate_limit import parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+# Responses that mean "slow down"
+_THROTTLE_STATUSES = (429, 503)
+
+# robots.txt statuses that mean "crawl anything" and "crawl nothing"
+_ROBOTS_MISSING = (404, 410)
+_ROBOTS_FORBIDDEN = (401, 403)
+
+
+class DisallowedByRobots(Exception):
+    """Raised when robots.txt forbids fetching a URL."""
+
+
+class _HostState:
+    """Scheduling state for one host."""
+
+    __slots__ = (
+        "limit",
+        "in_flight",
+        "next_start",
+        "paused_until",
+        "crawl_delay",
+        "robots",
+        "robots_expires",
+        "robots_lock",
+        "condition",
+    )
+
+    def __init__(self, initial_limit: float) -> None:
+        self.limit = initial_limit
+        self.in_flight = 0
+        self.next_start = 0.0
+        self.paused_until = 0.0
+        self.crawl_delay = 0.0
+        self.robots: Optional[RobotFileParser] = None
+        self.robots_expires = 0.0
+        self.robots_lock = asyncio.Lock()
+        self.condition = asyncio.Condition()
+
+
+class HostScheduler:
+    """Queue requests per host under an adaptive concurrency limit.
+
+    Each host starts at ``politeness_initial_per_host`` concurrent requests.
+    The limit grows additively (about one slot per window of fast responses)
+    and is halved on 429/503, connection errors, or responses slower than
+    ``politeness_target_latency`` (AIMD). A ``Retry-After`` pauses the host,
+    and robots.txt ``Crawl-delay`` spaces out request starts. A missing
+    robots.txt (404/410) allows everything and a forbidden one (401/403)
+    nothing; a server error or unreachable host blocks the host for
+    ``robots_retry_ttl`` before trying again. Waiters are served in arrival
+    order, so one busy host cannot starve the others.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None) -> None:
+        """Initialize the scheduler."""
+        self.settings = settings or get_settings()
+        self.min_limit = 1.0
+        self.max_limit = float(self.settings.politeness_max_per_host)
+        self.initial_limit = float(min(self.settings.politeness_initial_per_host, self.max_limit))
+        self.target_latency = self.settings.politeness_target_latency
+        self._hosts: Dict[str, _HostState] = {}
+
+    def in_flight(self, host: Optional[str] = None) -> Any:
+        """In-flight requests for one host, or a mapping for every busy host."""
+        if host is not None:
+            state = self._hosts.get(host)
+            return state.in_flight if state else 0
+        return {name: state.in_flight for name, state in self._hosts.items() if state.in_flight}
+
+    def limit(self, host: str) -> int:
+        """Current concurrency limit for a host."""
+        state = self._hosts.get(host)
+        return int(state.limit if state else self.initial_limit)
+
+    async def request(
+        self,
+        client: Any,
+        method: str,
+        url: str,
+        respect_robots: bool = True,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send a request through ``client`` once the host has a free slot."""
+        async with self.stream(client, method, url, respect_robots, **kwargs) as response:
+            await response.aread()
+        return response
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        client: Any,
+        method: str,
+        url: str,
+        respect_robots: bool = True,
+        **kwargs: Any,
+    ) -> AsyncIterator[httpx.Response]:
+        """Like :meth:`request`, but yield the response before reading its body.
+
+        The host slot is held until the block exits.
+        """
+        parsed = httpx.URL(url)
+        host = parsed.host
+        state = self._state(host)
+
+        if respect_robots and self.settings.respect_robots_txt:
+            robots = await self._robots(client, parsed, state)
+            if robots is not None and not robots.can_fetch(self.settings.user_agent, url):
+                raise DisallowedByRobots(url)
+
+        await self._acquire(state)
+        try:
+            started = time.monotonic()
+            async with client.stream(method, url, **kwargs) as response:
+                self._feedback(host, state, response, time.monotonic() - started)
+                yield response
+        except (httpx.ConnectError, httpx.TimeoutException):
+            self._decrease(host, state)
+            raise
+        finally:
+            await self._release(state)
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.initial_limit)
+        return state
+
+    async def _acquire(self, state: _HostState) -> None:
+        """Wait for a slot, then for the host's pause and crawl delay."""
+        async with state.condition:
+            await state.condition.wait_for(lambda: state.in_flight < int(state.limit))
+            state.in_flight += 1
+            now = time.monotonic()
+            start_at = max(now, state.next_start, state.paused_until)
+            state.next_start = start_at + state.crawl_delay
+
+        if start_at > now:
+            try:
+                await asyncio.sleep(start_at - now)
+            except asyncio.CancelledError:
+                await self._release(state)
+                raise
+
+    async def _release(self, state: _HostState) -> None:
+        async with state.condition:
+            state.in_flight -= 1
+            state.condition.notify(max(1, int(state.limit) - state.in_flight))
+
+    def _feedback(self, host: str, state: _HostState, response: httpx.Response, latency: float) -> None:
+        if response.status_code in _THROTTLE_STATUSES:
+            delay = parse_retry_after(response.headers.get("Retry-After"))
+            if delay:
+                state.paused_until = max(state.paused_until, time.monotonic() + delay)
+            self._decrease(host, state)
+        elif latency > self.target_latency:
+            self._decrease(host, state)
+        else:
+            state.limit = min(self.max_limit, state.limit + 1.0 / state.limit)
+
+    def _decrease(self, host: str, state: _HostState) -> None:
+        limit = max(self.min_limit, state.limit / 2)
+        if int(limit) < int(state.limit):
+            logger.debug(f"Reducing concurrency for {host} to {int(limit)}")
+        state.limit = limit
+
+    async def _robots(self, client: Any, url: httpx.URL, state: _HostState) -> Optional[RobotFileParser]:
+        """Load (and cache) robots.txt for the URL's host."""
+        if time.monotonic() < state.robots_expires:
+            return state.robots
+
+        async with state.robots_lock:
+            if time.monotonic() < state.robots_expires:
+                return state.robots
+
+            robots: Optional[RobotFileParser] = RobotFileParser()
+            ttl = self.settings.robots_cache_ttl
+            try:
+                response = await client.request("GET", f"{url.scheme}://{url.netloc.decode('ascii')}/robots.txt")
+                status = response.status_code
+                if 200 <= status < 300:
+                    robots.parse(response.text.splitlines())
+                elif status in _ROBOTS_MISSING:
+                    robots = None
+                elif status in _ROBOTS_FORBIDDEN:
+                    robots.disallow_all = True
+                else:
+                    # Server errors and anything unexpected block the host until a retry
+                    logger.debug(f"robots.txt for {url.host} returned {status}; retrying later")
+                    robots.disallow_all = True
+                    ttl = self.settings.robots_retry_ttl
+            except httpx.HTTPError as e:
+                logger.debug(f"Could not load robots.txt for {url.host}: {e}")
+                robots.disallow_all = True
+                ttl = self.settings.robots_retry_ttl
+
+            state.robots = robots
+            state.crawl_delay = float((robots.crawl_delay(self.settings.user_agent) if robots else None) or 0.0)
+            state.robots_expires = time.monotonic() + ttl
+            return robots
+
+
+_host_scheduler: Optional[HostScheduler] = None
+
+
+def get_host_scheduler() -> HostScheduler:
+    """Get the process-wide host scheduler."""
+    global _host_scheduler
+    if _host_scheduler is None:
+        _host_scheduler = HostScheduler()
+    return _host_scheduler
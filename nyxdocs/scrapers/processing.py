@@ -0,0 +1,204 @@
+"""CPU-bound document processing, kept off the event loop.
+
+Turning a fetched body into stored documentation means decoding it, parsing
+and extracting it, cleaning the text, hashing it and splitting it into
+segments. All of that is done by :func:`process_document`, a plain function
+of bytes and settings values. A :class:`ProcessingStage` decides where it
+runs. With ``worker_processes`` above zero that is a process pool, so the
+event loop only does I/O. Each worker returns a plain
+``(title, content, content_hash, segments)`` tuple, which is cheap to pickle.
+"""
+
+import asyncio
+import hashlib
+import io
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlparse
+
+from ..config import get_settings
+from ..utils.segments import Segment, split_segments
+from .extraction import extract_html
+
+logger = logging.getLogger(__name__)
+
+# Extractors selectable by BaseScraper.extractor
+EXTRACTORS = ("html", "text")
+
+# Separators for collapsed newline runs
+_NEWLINES = ("", "\n", "\n\n")
+
+
+class ProcessedDocument(NamedTuple):
+    """Title, cleaned content, content hash and segments of one document."""
+
+    title: str
+    content: str
+    content_hash: str
+    segments: List[Segment]
+
+
+def clean_content(content: str, max_length: int) -> str:
+    """Clean and normalize content.
+
+    Strips every line, collapses runs of blank lines to one, trims the ends
+    and cuts at ``max_length`` characters with a ``[Content truncated]``
+    marker. This is done in one pass that stops reading once the cap is
+    exceeded. The cap counts the text before its ends are trimmed.
+    """
+    if not content:
+        return ""
+
+    out = io.StringIO()
+    length = 0      # Characters of normalized text so far, leading newlines included
+    leading = 0     # Leading newlines counted in ``length`` but never written
+    newlines = 0    # Newlines since the last non-blank line
+    started = False
+
+    # Iterating a StringIO splits on "\n" only, keeping the terminators
+    for raw_line in io.StringIO(content):
+        line = raw_line.strip()
+        if line:
+            # Runs of three or more newlines collapse to two
+            run = newlines if newlines < 2 else 2
+            if started:
+                out.write(_NEWLINES[run])
+            else:
+                leading = run
+                started = True
+            out.write(line)
+            length += run + len(line)
+            newlines = 0
+            if length > max_length:
+                return _truncated(out, max_length - leading)
+        newlines += 1
+
+    # Every line above counted a terminator; the last one may not have had one
+    if not content.endswith('\n'):
+        newlines -= 1
+    trailing = newlines if newlines < 2 else 2
+    if length + trailing > max_length:
+        if started:
+            out.write(_NEWLINES[trailing])
+        else:
+            leading = trailing
+        return _truncated(out, max_length - leading)
+    return out.getvalue()
+
+
+def _truncated(out: io.StringIO, keep: int) -> str:
+    """Normalized text cut to ``keep`` written characters, with the marker."""
+    out.truncate(max(keep, 0))
+    text = out.getvalue()
+    # An empty remainder leaves only the marker once the ends are trimmed
+    return text + "\n\n[Content truncated]" if text else "[Content truncated]"
+
+
+def content_hash(content: str) -> str:
+    """SHA-256 of content for change detection."""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def text_title(url: str, content: str) -> str:
+    """Title of a plain-text or markdown file from its URL or first heading."""
+    # Try to get title from URL path
+    path_parts = urlparse(url).path.strip('/').split('/')
+    if len(path_parts) >= 2:
+        filename = path_parts[-1]
+        if filename:
+            return filename
+
+    # Try to extract title from markdown content
+    if content:
+        lines = content.split('\n')
+        for line in lines[:10]:  # Check first 10 lines
+            line = line.strip()
+            if line.startswith('# '):
+                return line[2:].strip()
+            elif line.startswith('## '):
+                return line[3:].strip()
+
+    return "Documentation"
+
+
+def extract_document(extractor: str, url: str, raw: str, engine: str, max_length: int) -> Tuple[str, str]:
+    """(title, cleaned content) of a decoded body."""
+    if extractor == "html":
+        title, content = extract_html(raw, url, engine)
+    elif extractor == "text":
+        title, content = text_title(url, raw), raw
+    else:
+        raise ValueError(f"Unknown extractor: {extractor}")
+    return title, clean_content(content, max_length)
+
+
+def process_document(
+    extractor: str,
+    url: str,
+    body: bytes,
+    encoding: Optional[str],
+    engine: str,
+    max_length: int,
+    segment_max_chars: int,
+    segment_min_chars: int,
+) -> Tuple[str, str, str, List[Segment]]:
+    """Decode, extract, clean, hash and segment a fetched body."""
+    raw = body.decode(encoding or "utf-8", errors="replace")
+    title, content = extract_document(extractor, url, raw, engine, max_length)
+    return title, content, content_hash(content), split_segments(content, segment_max_chars, segment_min_chars)
+
+
+class ProcessingStage:
+    """Runs document processing in the calling thread."""
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Call ``func(*args)`` and return its result."""
+        return func(*args)
+
+    def close(self) -> None:
+        """Release the stage's workers."""
+
+
+class ProcessPoolStage(ProcessingStage):
+    """Runs document processing in a pool of worker processes."""
+
+    def __init__(self, workers: int):
+        """Start the pool."""
+        # Spawned workers do not inherit the event loop or open sockets
+        self._executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Call ``func(*args)`` in a worker process."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+_processing_stage: Optional[ProcessingStage] = None
+
+
+def get_processing_stage() -> ProcessingStage:
+    """Get the process-wide processing stage, sized by ``worker_processes``."""
+    global _processing_stage
+    if _processing_stage is None:
+        workers = get_settings().worker_processes
+        _processing_stage = ProcessPoolStage(workers) if workers > 0 else ProcessingStage()
+    return _processing_stage
+
+
+def set_processing_stage(stage: Optional[ProcessingStage]) -> None:
+    """Replace the process-wide processing stage (None restores the default)."""
+    global _processing_stage
+    if _processing_stage is not None and _processing_stage is not stage:
+        _processing_stage.close()
+    _processing_stage = stage
+
+
+def close_processing_stage() -> None:
+    """Stop the process-wide processing stage's workers."""
+    set_processing_stage(None)
@@ -1,8 +1,9 @@
 """Web scraper for general documentation websites."""
 
+import asyncio
 import logging
 import re
-from typing import List, Tuple
+from typing import List
 from urllib.parse import urljoin, urlparse
 
 from bs4 import BeautifulSoup
@@ -16,6 +17,8 @@ logger = logging.getLogger(__name__)
 class WebScraper(BaseScraper):
     """Scraper for general web documentation."""
     
+    extractor = "html"
+    
     def __init__(self):
         """Initialize web scraper."""
         super().__init__("Web", DocumentationType.WEBSITE)
@@ -25,30 +28,6 @@ class WebScraper(BaseScraper):
         # Can scrape any HTTP/HTTPS URL that's not GitHub
         return url.startswith(("http://", "https://")) and "github.com" not in url
         
-    async def scrape(self, url: str) -> Tuple[str, str]:
-        """Scrape documentation from web URL."""
-        try:
-            # Fetch HTML content
-            html_content = await self.fetch_content(url)
-            
-            # Parse with BeautifulSoup
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Extract title
-            title = self._extract_title(soup, url)
-            
-            # Extract main content
-            content = self._extract_content(soup)
-            
-            # Clean content
-            cleaned_content = self.clean_content(content)
-            
-            return title, cleaned_content
-            
-        except Exception as e:
-            logger.error(f"Error scraping web URL {url}: {e}")
-            raise
-            
     async def discover_docs(self, project_url: str) -> List[dict]:
         """Discover documentation links on a website."""
         docs = []
@@ -71,68 +50,6 @@ class WebScraper(BaseScraper):
             
         return docs
         
-    def _extract_title(self, soup: BeautifulSoup, url: str) -> str:
-        """Extract title from HTML."""
-        # Try different title sources
-        title_sources = [
-            soup.find('title'),
-            soup.find('h1'),
-            soup.find('h2'),
-            soup.find('meta', {'property': 'og:title'}),
-            soup.find('meta', {'name': 'title'})
-        ]
-        
-        for source in title_sources:
-            if source:
-                if source.name == 'meta':
-                    title = source.get('content', '')
-                else:
-                    title = source.get_text(strip=True)
-                
-                if title:
-                    return title[:100]  # Limit title length
-        
-        # Fallback to URL path
-        path = urlparse(url).path.strip('/')
-        if path:
-            return path.split('/')[-1] or "Documentation"
-        
-        return "Documentation"
-        
-    def _extract_content(self, soup: BeautifulSoup) -> str:
-        """Extract main content from HTML."""
-        # Remove unwanted elements
-        for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside', 'iframe']):
-            element.decompose()
-        
-        # Try to find main content area
-        content_selectors = [
-            'main',
-            '[role="main"]',
-            '.content',
-            '.documentation',
-            '.docs',
-            '.markdown-body',
-            '.post-content',
-            'article',
-            '.container .row .col',
-            'body'
-        ]
-        
-        content_element = None
-        for selector in content_selectors:
-            content_element = soup.select_one(selector)
-            if content_element:
-                break
-        
-        if not content_element:
-            content_element = soup.find('body') or soup
-        
-        # Extract text content
-        content = content_element.get_text(separator='\n', strip=True)
-        
-        return content
-        
     def _find_doc_links(self, soup: BeautifulSoup, base_url: str) -> List[dict]:
         """Find documentation links on the page."""
         docs = []
@@ -189,26 +106,33 @@ class WebScraper(BaseScraper):
             # Common documentation subdomains
             doc_subdomains = ['docs', 'documentation', 'dev', 'developers', 'api', 'guide']
             
-            for subdomain in doc_subdomains:
-                doc_url = f"https://{subdomain}.{domain}"
-                
-                try:
-                    # Check if subdomain exists
-                    response = await self.client.head(doc_url)
-                    if response.status_code == 200:
-                        docs.append({
-                            "url": doc_url,
-                            "title": f"{subdomain.title()} Documentation",
-                            "type": "website"
-                        })
-                except Exception:
-                    continue  # Subdomain doesn't exist
+            # Each subdomain is its own host, so the probes run concurrently
+            found = await asyncio.gather(*[
+                self._subdomain_exists(f"https://{subdomain}.{domain}")
+                for subdomain in doc_subdomains
+            ])
+            
+            for subdomain, exists in zip(doc_subdomains, found, strict=True):
+                if exists:
+                    docs.append({
+                        "url": f"https://{subdomain}.{domain}",
+                        "title": f"{subdomain.title()} Documentation",
+                        "type": "website"
+                    })
                     
         except Exception as e:
             logger.debug(f"Error checking subdomains for {project_url}: {e}")
             
         return docs
         
+    async def _subdomain_exists(self, doc_url: str) -> bool:
+        """Check whether a documentation subdomain answers."""
+        try:
+            response = await self.request("HEAD", doc_url)
+            return response.status_code == 200
+        except Exception:
+            return False  # Subdomain doesn't exist
+            
     def _is_gitbook_site(self, soup: BeautifulSoup) -> bool:
         """Check if the site is powered by GitBook."""
         # Look for GitBook-specific elements
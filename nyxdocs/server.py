@@ -9,7 +9,19 @@ from mcp.server.fastmcp import FastMCP
 
 from .config import get_settings
 from .database.session import DatabaseManager
+from .scrapers.processing import close_processing_stage
+from .services import (
+    CryptoService,
+    DocumentationUpdater,
+    JobQueue,
+    ProjectCatalog,
+    ProjectRanker,
+    ProjectResolver,
+    ResponseCache,
+    WorkerPool,
+)
 from .tools import register_tools
+from .utils.http import close_http_pool
 from .utils.logging import setup_logging
 
 
@@ -28,8 +40,39 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[dict]:
     db_manager = DatabaseManager(settings.get_database_url())
     await db_manager.initialize()
     
+    # In-memory project catalog serves hot metadata lookups
+    catalog = ProjectCatalog(db_manager)
+    await catalog.load()
+    
+    # Relevance index for project search, mapped from disk when fresh
+    ranker = ProjectRanker(db_manager, settings)
+    await ranker.load()
+    
+    # Response cache for repeated tool queries
+    cache = ResponseCache(db_manager, settings)
+    
+    # Persistent queue for scraping and update-check jobs
+    job_queue = JobQueue(db_manager, settings)
+    
+    # Shared services; the resolver keeps its lookup index across tool calls
+    crypto_service = CryptoService(
+        db_manager,
+        resolver=ProjectResolver(catalog=catalog),
+        catalog=catalog,
+        cache=cache,
+        ranker=ranker,
+    )
+    
     # Start background tasks if enabled
-    background_tasks = []
+    background_tasks = [
+        asyncio.create_task(catalog.run_refresh_loop(settings.catalog_refresh_interval)),
+        asyncio.create_task(ranker.run_rebuild_loop(settings.ranking_rebuild_interval)),
+    ]
+    
+    if settings.enable_content_caching:
+        background_tasks.append(
+            asyncio.create_task(cache.run_cleanup_loop(settings.cache_cleanup_interval))
+        )
     
     if settings.enable_auto_discovery:
         logger.info("Auto-discovery is enabled")
@@ -37,11 +80,28 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[dict]:
     
     if settings.enable_update_monitoring:
         logger.info("Update monitoring is enabled")
-        # TODO: Start update monitoring task
+        updater = DocumentationUpdater(db_manager, cache=cache, settings=settings)
+        workers = WorkerPool(
+            job_queue,
+            {"scrape": updater.handle_job, "update": updater.handle_job},
+        )
+        background_tasks.extend([
+            asyncio.create_task(workers.run()),
+            asyncio.create_task(
+                updater.run_schedule_loop(
+                    job_queue, settings.job_schedule_interval, on_enqueued=workers.notify
+                )
+            ),
+        ])
     
     try:
         yield {
             "db_manager": db_manager,
+            "crypto_service": crypto_service,
+            "catalog": catalog,
+            "ranker": ranker,
+            "cache": cache,
+            "job_queue": job_queue,
             "settings": settings,
             "background_tasks": background_tasks,
         }
@@ -58,6 +118,10 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[dict]:
                 except asyncio.CancelledError:
                     pass
         
+        # Close pooled HTTP connections and extraction workers
+        await close_http_pool()
+        close_processing_stage()
+        
         # Close database connections
         await db_manager.close()
         
@@ -1,5 +1,25 @@
 """Services module for NyxDocs."""
 
+from .cache import ResponseCache
+from .catalog import ProjectCatalog
 from .crypto_service import CryptoService
+from .enrichment import ProjectEnricher
+from .ingestion import IngestStats, ProjectIngestor
+from .job_queue import JobQueue, WorkerPool
+from .ranking import ProjectRanker
+from .resolver import ProjectResolver
+from .update_service import DocumentationUpdater
 
-__all__ = ["CryptoService"]
+__all__ = [
+    "CryptoService",
+    "DocumentationUpdater",
+    "IngestStats",
+    "JobQueue",
+    "ProjectCatalog",
+    "ProjectEnricher",
+    "ProjectIngestor",
+    "ProjectRanker",
+    "ProjectResolver",
+    "ResponseCache",
+    "WorkerPool",
+]
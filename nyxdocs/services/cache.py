@@ -0,0 +1,272 @@
+"""Two-tier response cache for service read methods.
+
+Tier one is an in-process LRU bounded by entry count and bytes; tier two is
+the persistent ``CacheTable``, shared across processes and restarts. Both
+tiers honor the per-kind TTLs from settings, and concurrent identical
+requests are collapsed into a single load.
+"""
+
+import asyncio
+import functools
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import delete
+
+from ..config import Settings, get_settings
+from ..database.models import CacheTable
+from ..database.session import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Cache kinds and the settings attribute holding their TTL
+CACHE_KINDS = {
+    "projects": "cache_ttl_projects",
+    "docs": "cache_ttl_docs",
+    "search": "cache_ttl_search",
+}
+
+# Handed to waiters when the leading load was cancelled, so they retry it
+_RETRY = object()
+
+
+class _Entry:
+    """In-memory cache entry."""
+
+    __slots__ = ("value", "expires_at", "size")
+
+    def __init__(self, value: Any, expires_at: float, size: int) -> None:
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+
+
+class ResponseCache:
+    """LRU memory cache in front of the persistent ``CacheTable``."""
+
+    def __init__(self, db_manager: DatabaseManager, settings: Optional[Settings] = None):
+        """Initialize the cache."""
+        self.db_manager = db_manager
+        self.settings = settings or get_settings()
+        self.max_entries = self.settings.cache_max_size
+        self.max_bytes = self.settings.cache_max_bytes
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+        self._adapters: Dict[Any, TypeAdapter] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether caching is switched on."""
+        return self.settings.enable_content_caching
+
+    def ttl(self, kind: str) -> int:
+        """TTL in seconds for a cache kind."""
+        return getattr(self.settings, CACHE_KINDS[kind])
+
+    @staticmethod
+    def make_key(kind: str, name: str, *parts: Any) -> str:
+        """Build a cache key from a method name and its arguments."""
+        payload = "|".join(
+            part.model_dump_json() if isinstance(part, BaseModel) else repr(part)
+            for part in parts
+        )
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+        return f"{kind}:{name}:{digest}"
+
+    async def get_or_load(
+        self,
+        kind: str,
+        key: str,
+        loader: Callable[[], Awaitable[T]],
+        value_type: Any,
+    ) -> T:
+        """Return a cached value, loading (once) and storing it on a miss."""
+        if not self.enabled:
+            return await loader()
+
+        while True:
+            entry = self._get_memory(key)
+            if entry is not None:
+                self.hits += 1
+                return entry.value
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            value = await asyncio.shield(inflight)
+            if value is not _RETRY:
+                return value
+            # The leader was cancelled; one of the waiters takes over the load
+
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._load(kind, key, loader, value_type)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            # Only the leader was cancelled; waiters retry rather than fail
+            future.set_result(_RETRY)
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an un-awaited future does not log a warning
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def invalidate(self, kind: Optional[str] = None) -> None:
+        """Drop cached values of one kind (or everything) from both tiers."""
+        prefix = f"{kind}:" if kind else ""
+        for key in [k for k in self._entries if k.startswith(prefix)]:
+            self._evict(key)
+
+        async with self.db_manager.get_session() as session:
+            query = delete(CacheTable)
+            if kind:
+                query = query.where(CacheTable.key.startswith(prefix))
+            await session.execute(query)
+            await session.commit()
+
+    async def purge_expired(self) -> int:
+        """Remove expired entries from both tiers. Returns rows deleted."""
+        now = time.monotonic()
+        for key in [k for k, e in self._entries.items() if e.expires_at <= now]:
+            self._evict(key)
+
+        async with self.db_manager.get_session() as session:
+            result = await session.execute(
+                delete(CacheTable).where(CacheTable.expires_at <= datetime.utcnow())
+            )
+            await session.commit()
+            return result.rowcount or 0
+
+    async def run_cleanup_loop(self, interval: float) -> None:
+        """Purge expired entries periodically until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                deleted = await self.purge_expired()
+                if deleted:
+                    logger.debug(f"Purged {deleted} expired cache rows")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error purging expired cache entries: {e}")
+
+    async def _load(self, kind: str, key: str, loader: Callable[[], Awaitable[T]], value_type: Any) -> T:
+        adapter = self._adapter(value_type)
+        ttl = self.ttl(kind)
+
+        stored = await self._get_persistent(key)
+        if stored is not None:
+            raw, expires_at = stored
+            try:
+                value = adapter.validate_json(raw)
+            except ValueError as e:
+                logger.warning(f"Discarding unreadable cache entry {key}: {e}")
+            else:
+                self.hits += 1
+                remaining = (expires_at - datetime.utcnow()).total_seconds()
+                self._put_memory(key, value, remaining, len(raw))
+                return value
+
+        self.misses += 1
+        value = await loader()
+        raw = adapter.dump_json(value).decode("utf-8")
+        self._put_memory(key, value, ttl, len(raw))
+        await self._put_persistent(key, raw, ttl)
+        return value
+
+    def _adapter(self, value_type: Any) -> TypeAdapter:
+        adapter = self._adapters.get(value_type)
+        if adapter is None:
+            adapter = self._adapters[value_type] = TypeAdapter(value_type)
+        return adapter
+
+    def _get_memory(self, key: str) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._evict(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _put_memory(self, key: str, value: Any, ttl: float, size: int) -> None:
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._evict(key)
+        self._entries[key] = _Entry(value, time.monotonic() + ttl, size)
+        self._bytes += size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            self._evict(next(iter(self._entries)))
+
+    def _evict(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    async def _get_persistent(self, key: str) -> Optional[Tuple[str, datetime]]:
+        try:
+            async with self.db_manager.get_session() as session:
+                row = await session.get(CacheTable, key)
+                if row is None or row.expires_at <= datetime.utcnow():
+                    return None
+                return row.value, row.expires_at
+        except Exception as e:
+            logger.warning(f"Cache read failed for {key}: {e}")
+            return None
+
+    async def _put_persistent(self, key: str, raw: str, ttl: int) -> None:
+        try:
+            async with self.db_manager.get_session() as session:
+                await session.merge(CacheTable(
+                    key=key,
+                    value=raw,
+                    expires_at=datetime.utcnow() + timedelta(seconds=ttl),
+                    created_at=datetime.utcnow(),
+                ))
+                await session.commit()
+        except Exception as e:
+            # Another process may have written the same key; the cache is best-effort
+            logger.warning(f"Cache write failed for {key}: {e}")
+
+
+def cached(kind: str, value_type: Any) -> Callable:
+    """Cache a service read method through ``self.cache`` when one is configured.
+
+    The decorated method's arguments (request models or plain values) form the
+    cache key; ``value_type`` is used to (de)serialize the persistent tier.
+    """
+    if kind not in CACHE_KINDS:
+        raise ValueError(f"Unknown cache kind: {kind}")
+
+    def decorator(method: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(method)
+        async def wrapper(self: Any, *args: Any, **kwargs: Any) -> T:
+            cache: Optional[ResponseCache] = getattr(self, "cache", None)
+            if cache is None:
+                return await method(self, *args, **kwargs)
+
+            key = cache.make_key(kind, method.__name__, *args, *sorted(kwargs.items()))
+            return await cache.get_or_load(
+                kind, key, lambda: method(self, *args, **kwargs), value_type
+            )
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,322 @@
+"""In-process catalog of project metadata for hot read paths."""
+
+import asyncio
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database.models import DocumentationTable, ProjectTable
+from ..database.session import DatabaseManager
+from ..models import BlockchainNetwork, ProjectCategory, ProjectStatus, ScrapeStatus
+from ..utils.trigram import TrigramIndex
+
+logger = logging.getLogger(__name__)
+
+# Watermark queries look back this far so rows written within the same clock
+# tick (SQLite's CURRENT_TIMESTAMP has one-second resolution) are re-applied
+# rather than missed. Re-applying a row is idempotent.
+_WATERMARK_SLACK = timedelta(seconds=1)
+
+_PROJECT_COLUMNS = (
+    ProjectTable.id,
+    ProjectTable.name,
+    ProjectTable.symbol,
+    ProjectTable.blockchain,
+    ProjectTable.category,
+    ProjectTable.description,
+    ProjectTable.website,
+    ProjectTable.github_repo,
+    ProjectTable.market_cap,
+    ProjectTable.status,
+    ProjectTable.created_at,
+    ProjectTable.updated_at,
+)
+
+
+class CatalogEntry:
+    """Compact, read-only view of one project row."""
+
+    __slots__ = (
+        "id",
+        "name",
+        "symbol",
+        "blockchain",
+        "category",
+        "description",
+        "website",
+        "github_repo",
+        "market_cap",
+        "status",
+        "created_at",
+        "updated_at",
+        "doc_count",
+        "docs_updated_at",
+        "haystack",
+    )
+
+    def __init__(self, row: Tuple) -> None:
+        """Build an entry from a row of ``_PROJECT_COLUMNS``."""
+        (
+            self.id,
+            self.name,
+            self.symbol,
+            self.blockchain,
+            self.category,
+            self.description,
+            self.website,
+            self.github_repo,
+            self.market_cap,
+            self.status,
+            self.created_at,
+            self.updated_at,
+        ) = row
+        self.doc_count = 0
+        self.docs_updated_at: Optional[datetime] = None
+        # Lower-cased text matched by substring search
+        self.haystack = "\x00".join(
+            part.lower() for part in (self.name, self.symbol, self.description) if part
+        )
+
+    def sort_key(self) -> Tuple[float, str]:
+        """Market cap descending (unknown last), then name."""
+        cap = self.market_cap
+        return (-cap if cap is not None else math.inf, self.name)
+
+
+class ProjectCatalog:
+    """Read-mostly in-memory copy of ``ProjectTable`` metadata.
+
+    The catalog is loaded once at startup and refreshed incrementally from
+    ``updated_at`` watermarks, so searches and per-blockchain/category counts
+    are answered without a database round trip. Per-project documentation
+    counts are kept alongside and refreshed the same way. Deletions leave no
+    watermark trail, so each refresh also compares the stored project ids and
+    per-project documentation row counts with the catalog's.
+    """
+
+    def __init__(self, db_manager: DatabaseManager):
+        """Initialize an empty catalog."""
+        self.db_manager = db_manager
+        self._entries: Dict[str, CatalogEntry] = {}
+        self._ordered: List[CatalogEntry] = []
+        self._project_watermark: Optional[datetime] = None
+        self._docs_watermark: Optional[datetime] = None
+        # Documentation rows per project, in any scrape status
+        self._doc_totals: Dict[str, int] = {}
+        self._lock = asyncio.Lock()
+        self.name_index = TrigramIndex()
+        self.is_loaded = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, project_id: str) -> Optional[CatalogEntry]:
+        """Look up a project by id."""
+        return self._entries.get(project_id)
+
+    async def load(self) -> None:
+        """Load every project and its documentation counts."""
+        async with self._lock:
+            async with self.db_manager.get_session() as session:
+                result = await session.execute(select(*_PROJECT_COLUMNS))
+                entries = {row[0]: CatalogEntry(tuple(row)) for row in result.all()}
+
+                self._entries = entries
+                self.name_index.clear()
+                self.name_index.update((entry.id, entry.name) for entry in entries.values())
+                self._project_watermark = max((e.updated_at for e in entries.values()), default=None)
+
+                self._docs_watermark = await self._load_doc_stats(session, project_ids=None)
+
+            self._reorder()
+            self.is_loaded = True
+
+        logger.info(f"Loaded project catalog with {len(self._entries)} projects")
+
+    async def refresh(self) -> int:
+        """Apply rows changed since the last load or refresh. Returns rows applied."""
+        if not self.is_loaded:
+            await self.load()
+            return len(self._entries)
+
+        async with self._lock:
+            async with self.db_manager.get_session() as session:
+                changed = await self._drop_deleted_projects(session)
+                changed += await self._apply_project_changes(session)
+                changed += await self._apply_doc_changes(session)
+
+        if changed:
+            logger.debug(f"Refreshed project catalog ({changed} changes)")
+        return changed
+
+    async def run_refresh_loop(self, interval: float) -> None:
+        """Refresh the catalog periodically until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error refreshing project catalog: {e}")
+
+    def search(
+        self,
+        query: Optional[str],
+        blockchain: Optional[str] = None,
+        category: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[CatalogEntry]:
+        """Active projects whose name, symbol or description contain the query."""
+        term = query.lower() if query else ""
+        results = []
+        for entry in self._ordered:
+            if not self._matches(entry, blockchain, category):
+                continue
+            if term and term not in entry.haystack:
+                continue
+            results.append(entry)
+            if len(results) >= limit:
+                break
+        return results
+
+    def select(
+        self,
+        project_ids: Iterable[str],
+        blockchain: Optional[str] = None,
+        category: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[CatalogEntry]:
+        """Active projects among ``project_ids``, in the order given."""
+        results = []
+        for project_id in project_ids:
+            entry = self._entries.get(project_id)
+            if entry is None or not self._matches(entry, blockchain, category):
+                continue
+            results.append(entry)
+            if len(results) >= limit:
+                break
+        return results
+
+    def blockchain_counts(self) -> Dict[BlockchainNetwork, int]:
+        """Active project counts per blockchain."""
+        counts: Dict[BlockchainNetwork, int] = {}
+        for entry in self._active():
+            counts[entry.blockchain] = counts.get(entry.blockchain, 0) + 1
+        return counts
+
+    def category_counts(self) -> Dict[ProjectCategory, int]:
+        """Active project counts per category."""
+        counts: Dict[ProjectCategory, int] = {}
+        for entry in self._active():
+            counts[entry.category] = counts.get(entry.category, 0) + 1
+        return counts
+
+    @staticmethod
+    def _matches(entry: CatalogEntry, blockchain: Optional[str], category: Optional[str]) -> bool:
+        if entry.status != ProjectStatus.ACTIVE:
+            return False
+        if blockchain and entry.blockchain != blockchain:
+            return False
+        return not category or entry.category == category
+
+    def _active(self) -> Iterable[CatalogEntry]:
+        return (entry for entry in self._entries.values() if entry.status == ProjectStatus.ACTIVE)
+
+    def _reorder(self) -> None:
+        self._ordered = sorted(self._entries.values(), key=CatalogEntry.sort_key)
+
+    async def _drop_deleted_projects(self, session: AsyncSession) -> int:
+        stored = set((await session.scalars(select(ProjectTable.id))).all())
+        deleted = [project_id for project_id in self._entries if project_id not in stored]
+        for project_id in deleted:
+            del self._entries[project_id]
+            self.name_index.discard(project_id)
+
+        if deleted:
+            self._reorder()
+        return len(deleted)
+
+    async def _apply_project_changes(self, session: AsyncSession) -> int:
+        query = select(*_PROJECT_COLUMNS)
+        if self._project_watermark is not None:
+            query = query.where(ProjectTable.updated_at >= self._project_watermark - _WATERMARK_SLACK)
+
+        rows = (await session.execute(query)).all()
+        if not rows:
+            return 0
+
+        for row in rows:
+            entry = CatalogEntry(tuple(row))
+            previous = self._entries.get(entry.id)
+            if previous is not None:
+                entry.doc_count = previous.doc_count
+                entry.docs_updated_at = previous.docs_updated_at
+            self._entries[entry.id] = entry
+            self.name_index.add(entry.id, entry.name)
+            if self._project_watermark is None or entry.updated_at > self._project_watermark:
+                self._project_watermark = entry.updated_at
+
+        self._reorder()
+        return len(rows)
+
+    async def _apply_doc_changes(self, session: AsyncSession) -> int:
+        query = select(DocumentationTable.project_id).distinct()
+        if self._docs_watermark is not None:
+            query = query.where(DocumentationTable.updated_at >= self._docs_watermark - _WATERMARK_SLACK)
+
+        project_ids = set((await session.scalars(query)).all())
+
+        # Projects whose documentation rows were deleted have a different row count
+        totals = dict((await session.execute(
+            select(DocumentationTable.project_id, func.count(DocumentationTable.id))
+            .group_by(DocumentationTable.project_id)
+        )).all())
+        project_ids.update(
+            project_id for project_id in totals.keys() | self._doc_totals.keys()
+            if totals.get(project_id) != self._doc_totals.get(project_id)
+        )
+        if not project_ids:
+            return 0
+
+        watermark = await self._load_doc_stats(session, list(project_ids))
+        if watermark is not None and (self._docs_watermark is None or watermark > self._docs_watermark):
+            self._docs_watermark = watermark
+        return len(project_ids)
+
+    async def _load_doc_stats(self, session: AsyncSession, project_ids: Optional[List[str]]) -> Optional[datetime]:
+        """Load documentation counts for some (or all) projects; returns the newest doc update."""
+        query = select(
+            DocumentationTable.project_id,
+            func.count(DocumentationTable.id).filter(
+                DocumentationTable.scrape_status == ScrapeStatus.SUCCESS
+            ),
+            func.max(DocumentationTable.updated_at),
+            func.count(DocumentationTable.id),
+        ).group_by(DocumentationTable.project_id)
+        if project_ids is None:
+            self._doc_totals = {}
+        else:
+            query = query.where(DocumentationTable.project_id.in_(project_ids))
+            # Projects left without documentation get no row below
+            for project_id in project_ids:
+                self._doc_totals.pop(project_id, None)
+                entry = self._entries.get(project_id)
+                if entry is not None:
+                    entry.doc_count = 0
+                    entry.docs_updated_at = None
+
+        newest = None
+        for project_id, doc_count, docs_updated_at, total in (await session.execute(query)).all():
+            self._doc_totals[project_id] = total
+            entry = self._entries.get(project_id)
+            if entry is not None:
+                entry.doc_count = doc_count
+                entry.docs_updated_at = docs_updated_at
+            if docs_updated_at is not None and (newest is None or docs_updated_at > newest):
+                newest = docs_updated_at
+        return newest
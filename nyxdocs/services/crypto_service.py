@@ -1,25 +1,41 @@
 """Cryptocurrency service for handling project and documentation operations."""
 
+import json
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy import and_, desc, func, or_
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Select, and_, desc, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.orm import undefer
 
-from ..database.models import DocumentationTable, ProjectTable, UpdateRecordTable
+from ..database.blobs import BlobStore
+from ..database.fulltext import FullTextIndex
+from ..database.models import (
+    DocumentationTable,
+    DocumentBlobTable,
+    ProjectTable,
+    UpdateRecordTable,
+)
 from ..database.session import DatabaseManager
 from ..models import (
     BlockchainInfo,
     BlockchainNetwork,
     Documentation,
+    DocumentationField,
+    DocumentationPage,
+    DocumentationPageRequest,
     DocumentationRequest,
     DocumentationResponse,
+    DocumentationSearchHit,
+    DocumentationSearchRequest,
+    DocumentationSearchResponse,
     Project,
     ProjectCategory,
     ProjectInfoRequest,
     ProjectInfoResponse,
+    ProjectStatus,
+    ScrapeStatus,
     SearchRequest,
     SearchResponse,
     SearchResult,
@@ -28,39 +44,85 @@ from ..models import (
     UpdateCheckResponse,
     UpdateRecord,
 )
+from .cache import ResponseCache, cached
+from .catalog import CatalogEntry, ProjectCatalog
+from .paging import (
+    MIN_PAGE_CHARS,
+    DocumentTextCache,
+    InvalidCursor,
+    cursor_matches,
+    decode_cursor,
+    encode_cursor,
+    page_end,
+)
+from .ranking import ProjectRanker
+from .resolver import ProjectResolver
 
 logger = logging.getLogger(__name__)
 
+# Loaded for every documentation row, whichever fields were asked for
+_DOCUMENTATION_KEY_FIELDS = ("id", "project_id", "title", "url", "doc_type")
+
+# Ranked project ids checked against the search filters per query
+_RANKED_BATCH = 500
+
 
 class CryptoService:
     """Service for cryptocurrency project and documentation operations."""
     
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        resolver: Optional[ProjectResolver] = None,
+        catalog: Optional[ProjectCatalog] = None,
+        cache: Optional[ResponseCache] = None,
+        text_cache: Optional[DocumentTextCache] = None,
+        ranker: Optional[ProjectRanker] = None,
+    ):
         """Initialize the crypto service."""
         self.db_manager = db_manager
+        self.catalog = catalog
+        self.ranker = ranker
+        self.cache = cache
+        self.resolver = resolver or ProjectResolver(catalog=catalog)
+        self.text_cache = text_cache or DocumentTextCache()
     
+    @cached("search", SearchResponse)
     async def search_projects(self, request: SearchRequest) -> SearchResponse:
-        """Search for cryptocurrency projects."""
+        """Search for cryptocurrency projects.
+        
+        With a loaded ranker, query matches come first in relevance order,
+        with market cap only as a small prior. Filters are applied while
+        walking the ranked list, so a common term scoped to one blockchain
+        still fills the page. Substring matches the ranker does not score
+        (partial words, projects added since its last rebuild) follow in
+        market cap order, as they do for every match without a ranker.
+        """
+        scores: Dict[str, float] = {}
+        if request.query and self.ranker is not None and self.ranker.is_loaded:
+            scores = dict(self.ranker.rank(request.query))
+        
+        if self.catalog is not None and self.catalog.is_loaded:
+            return self._search_catalog(request, scores)
+        
         async with self.db_manager.get_session() as session:
+            # Documentation counts per project, aggregated in the database
+            doc_stats = select(
+                DocumentationTable.project_id,
+                func.count(DocumentationTable.id).filter(
+                    DocumentationTable.scrape_status == ScrapeStatus.SUCCESS
+                ).label("doc_count"),
+                func.max(DocumentationTable.updated_at).label("last_updated"),
+            ).group_by(DocumentationTable.project_id).subquery()
+            
             # Build query
-            query = session.query(ProjectTable).options(
-                selectinload(ProjectTable.documentation)
-            )
+            query = select(ProjectTable, doc_stats.c.doc_count, doc_stats.c.last_updated).outerjoin(
+                doc_stats, doc_stats.c.project_id == ProjectTable.id
+            ).options(undefer(ProjectTable.description))
             
             # Apply filters
             filters = []
             
-            if request.query:
-                # Search in name, symbol, and description
-                search_term = f"%{request.query}%"
-                filters.append(
-                    or_(
-                        ProjectTable.name.ilike(search_term),
-                        ProjectTable.symbol.ilike(search_term),
-                        ProjectTable.description.ilike(search_term)
-                    )
-                )
-            
             if request.blockchain:
                 filters.append(ProjectTable.blockchain == request.blockchain)
             
@@ -68,43 +130,54 @@ class CryptoService:
                 filters.append(ProjectTable.category == request.category)
             
             # Only active projects
-            filters.append(ProjectTable.status == "active")
-            
-            if filters:
-                query = query.filter(and_(*filters))
-            
-            # Order by market cap (descending) and name
-            query = query.order_by(
-                desc(ProjectTable.market_cap),
-                ProjectTable.name
-            )
-            
-            # Apply limit
-            query = query.limit(request.limit)
-            
-            # Execute query
-            result = await session.execute(query)
-            projects = result.scalars().all()
-            
-            # Convert to response format
-            search_results = []
-            for project in projects:
-                # Count documentation
-                doc_count = len([doc for doc in project.documentation if doc.scrape_status == "success"])
-                
-                # Get last update time
-                last_updated = None
-                if project.documentation:
-                    last_updated = max(
-                        (doc.updated_at for doc in project.documentation if doc.updated_at),
-                        default=None
+            filters.append(ProjectTable.status == ProjectStatus.ACTIVE)
+            
+            query = query.filter(and_(*filters))
+            
+            # Ranked matches that pass the filters, a batch of the ranked list at a time
+            rows = []
+            ranked_ids = list(scores)
+            for start in range(0, len(ranked_ids), _RANKED_BATCH):
+                batch = (await session.execute(
+                    query.filter(ProjectTable.id.in_(ranked_ids[start:start + _RANKED_BATCH]))
+                )).all()
+                rows.extend(sorted(batch, key=lambda row: -scores[row[0].id]))
+                if len(rows) >= request.limit:
+                    break
+            rows = rows[:request.limit]
+            
+            if len(rows) < request.limit:
+                if request.query:
+                    # Search in name, symbol, and description
+                    search_term = f"%{request.query}%"
+                    query = query.filter(
+                        or_(
+                            ProjectTable.name.ilike(search_term),
+                            ProjectTable.symbol.ilike(search_term),
+                            ProjectTable.description.ilike(search_term)
+                        )
                     )
                 
-                search_results.append(SearchResult(
+                # Order by market cap (descending) and name; every scored match
+                # that passes the filters is already in rows, so this many suffice
+                query = query.order_by(
+                    ProjectTable.market_cap.desc().nulls_last(),
+                    ProjectTable.name
+                ).limit(request.limit + len(rows))
+                
+                unscored = [row for row in (await session.execute(query)).all() if row[0].id not in scores]
+                rows.extend(unscored[:request.limit - len(rows)])
+            
+            # Convert to response format
+            search_results = [
+                SearchResult(
                     project=self._convert_project(project),
-                    documentation_count=doc_count,
-                    last_updated=last_updated
-                ))
+                    documentation_count=doc_count or 0,
+                    last_updated=last_updated,
+                    score=scores.get(project.id)
+                )
+                for project, doc_count, last_updated in rows
+            ]
             
             return SearchResponse(
                 results=search_results,
@@ -112,24 +185,52 @@ class CryptoService:
                 query=request.query
             )
     
+    def _search_catalog(self, request: SearchRequest, scores: Dict[str, float]) -> SearchResponse:
+        """Answer a project search from the in-memory catalog, ranked matches first."""
+        entries = self.catalog.select(
+            scores,
+            blockchain=request.blockchain,
+            category=request.category,
+            limit=request.limit
+        )
+        if len(entries) < request.limit:
+            matches = self.catalog.search(
+                request.query,
+                blockchain=request.blockchain,
+                category=request.category,
+                limit=request.limit + len(entries)
+            )
+            unscored = [entry for entry in matches if entry.id not in scores]
+            entries.extend(unscored[:request.limit - len(entries)])
+        
+        search_results = [
+            SearchResult(
+                project=self._convert_catalog_entry(entry),
+                documentation_count=entry.doc_count,
+                last_updated=entry.docs_updated_at,
+                score=scores.get(entry.id)
+            )
+            for entry in entries
+        ]
+        
+        return SearchResponse(
+            results=search_results,
+            total=len(search_results),
+            query=request.query
+        )
+    
+    @cached("projects", Optional[ProjectInfoResponse])
     async def get_project_info(self, request: ProjectInfoRequest) -> Optional[ProjectInfoResponse]:
         """Get detailed project information."""
         async with self.db_manager.get_session() as session:
-            # Search for project by name or symbol
-            query = session.query(ProjectTable).options(
-                selectinload(ProjectTable.documentation)
-            ).filter(
-                or_(
-                    ProjectTable.name.ilike(f"%{request.project_name}%"),
-                    ProjectTable.symbol.ilike(f"%{request.project_name}%")
-                )
-            ).order_by(
-                desc(ProjectTable.market_cap)
-            )
-            
-            result = await session.execute(query)
-            project = result.scalars().first()
+            # Resolve project by name or symbol
+            project_id = await self.resolver.resolve(session, request.project_name)
+            if not project_id:
+                return None
             
+            project = await session.get(
+                ProjectTable, project_id, options=[undefer(ProjectTable.description)]
+            )
             if not project:
                 return None
             
@@ -139,11 +240,14 @@ class CryptoService:
             # Prepare response
             response = ProjectInfoResponse(project=project_model)
             
-            # Add documentation if requested
+            # Add documentation if requested, loading only the fields asked for
             if request.include_documentation:
-                response.documentation = [
-                    self._convert_documentation(doc) for doc in project.documentation
-                ]
+                doc_query = self._documentation_query(request.documentation_fields).filter(
+                    DocumentationTable.project_id == project.id
+                )
+                response.documentation = await self._load_documentation(
+                    session, doc_query, request.documentation_fields
+                )
             
             # Add blockchain info if requested
             if request.include_blockchain_info and project.blockchain:
@@ -151,29 +255,27 @@ class CryptoService:
             
             return response
     
+    @cached("docs", Optional[DocumentationResponse])
     async def get_documentation(self, request: DocumentationRequest) -> Optional[DocumentationResponse]:
         """Get documentation content for a project."""
         async with self.db_manager.get_session() as session:
             # Find project
-            project_query = session.query(ProjectTable).filter(
-                or_(
-                    ProjectTable.name.ilike(f"%{request.project_name}%"),
-                    ProjectTable.symbol.ilike(f"%{request.project_name}%")
-                )
-            ).order_by(desc(ProjectTable.market_cap))
-            
-            project_result = await session.execute(project_query)
-            project = project_result.scalars().first()
+            project_id = await self.resolver.resolve(session, request.project_name)
+            if not project_id:
+                return None
             
-            if not project:
+            project_name = await session.scalar(
+                select(ProjectTable.name).where(ProjectTable.id == project_id)
+            )
+            if not project_name:
                 return None
             
             # Get documentation
-            doc_query = session.query(DocumentationTable).filter(
+            doc_query = self._documentation_query(request.fields).filter(
                 and_(
-                    DocumentationTable.project_id == project.id,
-                    DocumentationTable.scrape_status == "success",
-                    DocumentationTable.content.isnot(None)
+                    DocumentationTable.project_id == project_id,
+                    DocumentationTable.scrape_status == ScrapeStatus.SUCCESS,
+                    DocumentationTable.content_hash.isnot(None)
                 )
             )
             
@@ -185,35 +287,187 @@ class CryptoService:
             
             doc_query = doc_query.order_by(desc(DocumentationTable.last_scraped))
             
-            doc_result = await session.execute(doc_query)
-            documents = doc_result.scalars().all()
+            documents = await self._load_documentation(session, doc_query, request.fields)
             
             if not documents:
                 return None
             
             return DocumentationResponse(
-                project_name=project.name,
-                documents=[self._convert_documentation(doc) for doc in documents]
+                project_name=project_name,
+                documents=documents
             )
     
+    async def read_documentation(self, request: DocumentationPageRequest) -> Optional[DocumentationPage]:
+        """Read one page of a document; follow ``next_cursor`` for the rest.
+        
+        Raises InvalidCursor for malformed cursors or ones issued before the
+        document last changed.
+        """
+        offset = 0
+        documentation_id = request.documentation_id
+        hash_prefix = None
+        if request.cursor:
+            documentation_id, hash_prefix, offset = decode_cursor(request.cursor)
+        
+        async with self.db_manager.get_session() as session:
+            query = self._page_query()
+            
+            if documentation_id:
+                query = query.filter(DocumentationTable.id == documentation_id)
+            elif request.project_name:
+                project_id = await self.resolver.resolve(session, request.project_name)
+                if not project_id:
+                    return None
+                query = query.filter(
+                    and_(
+                        DocumentationTable.project_id == project_id,
+                        DocumentationTable.scrape_status == ScrapeStatus.SUCCESS
+                    )
+                )
+                if request.doc_title:
+                    query = query.filter(DocumentationTable.title.ilike(f"%{request.doc_title}%"))
+                query = query.order_by(desc(DocumentationTable.last_scraped))
+            else:
+                raise ValueError("A cursor, documentation_id or project_name is required")
+            
+            row = (await session.execute(query.limit(1))).first()
+            if row is None:
+                return None
+            if hash_prefix is not None and not cursor_matches(hash_prefix, row.content_hash):
+                raise InvalidCursor("Documentation changed since the cursor was issued; start again without it")
+            if offset > row.size:
+                raise InvalidCursor("Cursor points past the end of the document")
+            
+            return await self._read_page(await session.connection(), row, offset, request.max_chars)
+    
+    async def read_first_pages(self, documentation_ids: List[str], max_chars: int) -> List[DocumentationPage]:
+        """First pages of several documents, read together and sharing ``max_chars``.
+        
+        Documents are filled in order. Once fewer than ``MIN_PAGE_CHARS``
+        remain, the rest come back empty, with a ``next_cursor`` that starts
+        them. Documents without stored content are left out.
+        """
+        if not documentation_ids:
+            return []
+        
+        async with self.db_manager.get_session() as session:
+            rows = (await session.execute(
+                self._page_query().where(DocumentationTable.id.in_(documentation_ids))
+            )).all()
+            by_id = {row.id: row for row in rows}
+            connection = await session.connection()
+            
+            pages = []
+            remaining = max_chars
+            for documentation_id in dict.fromkeys(documentation_ids):
+                row = by_id.get(documentation_id)
+                if row is None:
+                    continue
+                if remaining < MIN_PAGE_CHARS:
+                    pages.append(self._page(row, 0, "", None, 0 if row.size else None))
+                    continue
+                page = await self._read_page(connection, row, 0, remaining)
+                remaining -= len(page.content)
+                pages.append(page)
+        return pages
+    
+    @staticmethod
+    def _page_query() -> Select:
+        """Document, project name and text size, for documents with stored content."""
+        return select(
+            DocumentationTable.id,
+            DocumentationTable.title,
+            DocumentationTable.url,
+            DocumentationTable.doc_type,
+            DocumentationTable.content_hash,
+            ProjectTable.name,
+            DocumentBlobTable.size,
+        ).join(ProjectTable, ProjectTable.id == DocumentationTable.project_id).join(
+            DocumentBlobTable, DocumentBlobTable.content_hash == DocumentationTable.content_hash
+        )
+    
+    async def _read_page(self, connection: AsyncConnection, row: Any, offset: int, max_chars: int) -> DocumentationPage:
+        """The page of at most ``max_chars`` starting at ``offset`` of a ``_page_query`` row."""
+        # Only the segments under the page, plus one character to find its boundary, are read
+        segments = await connection.run_sync(BlobStore.segments, row.content_hash, offset, offset + max_chars + 1)
+        texts = {segment.ordinal: self.text_cache.get(segment.segment_hash) for segment in segments}
+        missing = [ordinal for ordinal, text in texts.items() if text is None]
+        if missing:
+            loaded = await connection.run_sync(BlobStore.segment_texts, row.content_hash, missing)
+            for segment in segments:
+                if segment.ordinal in loaded:
+                    texts[segment.ordinal] = loaded[segment.ordinal]
+                    self.text_cache.put(segment.segment_hash, loaded[segment.ordinal])
+        
+        window_start = segments[0].start if segments else offset
+        window = "".join(texts[segment.ordinal] for segment in segments)
+        end = window_start + page_end(window, offset - window_start, max_chars)
+        section = (segments[0].heading_path or None) if segments else None
+        return self._page(row, offset, window[offset - window_start:end - window_start], section, end)
+    
+    @staticmethod
+    def _page(row: Any, offset: int, content: str, section: Optional[str], end: Optional[int]) -> DocumentationPage:
+        """Page of a ``_page_query`` row; ``end`` is where the next page starts (None if this is the last)."""
+        return DocumentationPage(
+            documentation_id=row.id,
+            project_name=row.name,
+            title=row.title,
+            url=row.url,
+            doc_type=row.doc_type,
+            content=content,
+            section=section,
+            offset=offset,
+            total_chars=row.size,
+            next_cursor=encode_cursor(row.id, row.content_hash, end) if end is not None and end < row.size else None
+        )
+    
+    @cached("search", DocumentationSearchResponse)
+    async def search_documentation(self, request: DocumentationSearchRequest) -> DocumentationSearchResponse:
+        """Full-text search over scraped documentation content."""
+        async with self.db_manager.get_session() as session:
+            project_id = None
+            if request.project_name:
+                project_id = await self.resolver.resolve(session, request.project_name)
+                if project_id is None:
+                    return DocumentationSearchResponse(hits=[], total=0, query=request.query)
+            
+            connection = await session.connection()
+            hits = await connection.run_sync(
+                FullTextIndex.search, request.query, project_id, request.limit
+            )
+            
+            return DocumentationSearchResponse(
+                hits=[
+                    DocumentationSearchHit(
+                        documentation_id=hit.documentation_id,
+                        project_name=hit.project_name,
+                        title=hit.title,
+                        url=hit.url,
+                        snippet=hit.snippet,
+                        rank=hit.rank,
+                        section=hit.heading or None
+                    )
+                    for hit in hits
+                ],
+                total=len(hits),
+                query=request.query
+            )
+    
+    # Not cached: callers pass a ``since`` relative to now, so no two requests share a key
     async def check_updates(self, request: UpdateCheckRequest) -> UpdateCheckResponse:
         """Check for documentation updates."""
         async with self.db_manager.get_session() as session:
             # Build query for update records
-            query = session.query(UpdateRecordTable).join(
-                DocumentationTable
-            ).join(ProjectTable)
+            query = select(UpdateRecordTable).join(DocumentationTable)
             
             filters = []
             
             # Filter by project name if specified
             if request.project_name:
-                filters.append(
-                    or_(
-                        ProjectTable.name.ilike(f"%{request.project_name}%"),
-                        ProjectTable.symbol.ilike(f"%{request.project_name}%")
-                    )
-                )
+                project_id = await self.resolver.resolve(session, request.project_name)
+                if not project_id:
+                    return UpdateCheckResponse(updates=[], total=0)
+                filters.append(DocumentationTable.project_id == project_id)
             
             # Filter by date if specified
             if request.since:
@@ -240,63 +494,64 @@ class CryptoService:
                 total=len(updates)
             )
     
+    @cached("projects", List[BlockchainInfo])
     async def get_supported_blockchains(self) -> List[BlockchainInfo]:
         """Get list of supported blockchain networks with project counts."""
-        async with self.db_manager.get_session() as session:
-            # Get project counts by blockchain
-            query = session.query(
-                ProjectTable.blockchain,
-                func.count(ProjectTable.id).label("project_count")
-            ).filter(
-                ProjectTable.status == "active"
-            ).group_by(ProjectTable.blockchain)
-            
-            result = await session.execute(query)
-            blockchain_counts = dict(result.all())
-            
-            # Create blockchain info list
-            blockchains = []
-            for blockchain in BlockchainNetwork:
-                count = blockchain_counts.get(blockchain, 0)
-                
-                # Get blockchain metadata
-                blockchain_info = self._get_blockchain_metadata(blockchain)
-                blockchain_info.project_count = count
-                
-                blockchains.append(blockchain_info)
+        if self.catalog is not None and self.catalog.is_loaded:
+            blockchain_counts = self.catalog.blockchain_counts()
+        else:
+            blockchain_counts = await self._count_active_projects_by(ProjectTable.blockchain)
+        
+        # Create blockchain info list
+        blockchains = []
+        for blockchain in BlockchainNetwork:
+            count = blockchain_counts.get(blockchain, 0)
             
-            # Sort by project count (descending)
-            blockchains.sort(key=lambda x: x.project_count, reverse=True)
+            # Get blockchain metadata
+            blockchain_info = self._get_blockchain_metadata(blockchain)
+            blockchain_info.project_count = count
             
-            return blockchains
+            blockchains.append(blockchain_info)
+        
+        # Sort by project count (descending)
+        blockchains.sort(key=lambda x: x.project_count, reverse=True)
+        
+        return blockchains
     
-    async def get_project_categories(self) -> List[Dict[str, any]]:
+    @cached("projects", List[Dict[str, Any]])
+    async def get_project_categories(self) -> List[Dict[str, Any]]:
         """Get project categories with counts."""
+        if self.catalog is not None and self.catalog.is_loaded:
+            category_counts = self.catalog.category_counts()
+        else:
+            category_counts = await self._count_active_projects_by(ProjectTable.category)
+        
+        # Convert to list format
+        categories = []
+        for category, count in category_counts.items():
+            if category:  # Skip None categories
+                categories.append({
+                    "name": category.value,
+                    "count": count
+                })
+        
+        # Sort by count (descending)
+        categories.sort(key=lambda x: x["count"], reverse=True)
+        
+        return categories
+    
+    async def _count_active_projects_by(self, column) -> Dict[Any, int]:
+        """Count active projects grouped by a column."""
         async with self.db_manager.get_session() as session:
-            # Get project counts by category
-            query = session.query(
-                ProjectTable.category,
+            query = select(
+                column,
                 func.count(ProjectTable.id).label("project_count")
             ).filter(
-                ProjectTable.status == "active"
-            ).group_by(ProjectTable.category)
+                ProjectTable.status == ProjectStatus.ACTIVE
+            ).group_by(column)
             
             result = await session.execute(query)
-            category_data = result.all()
-            
-            # Convert to list format
-            categories = []
-            for category, count in category_data:
-                if category:  # Skip None categories
-                    categories.append({
-                        "name": category.value,
-                        "count": count
-                    })
-            
-            # Sort by count (descending)
-            categories.sort(key=lambda x: x["count"], reverse=True)
-            
-            return categories
+            return dict(result.all())
     
     async def get_system_stats(self) -> SystemStats:
         """Get system statistics."""
@@ -364,23 +619,51 @@ class CryptoService:
             updated_at=project.updated_at
         )
     
-    def _convert_documentation(self, doc: DocumentationTable) -> Documentation:
-        """Convert database documentation to model."""
-        return Documentation(
-            id=doc.id,
-            project_id=doc.project_id,
-            title=doc.title,
-            url=doc.url,
-            doc_type=doc.doc_type,
-            content=doc.content,
-            content_hash=doc.content_hash,
-            scrape_status=doc.scrape_status,
-            last_scraped=doc.last_scraped,
-            error_message=doc.error_message,
-            created_at=doc.created_at,
-            updated_at=doc.updated_at
+    def _convert_catalog_entry(self, entry: CatalogEntry) -> Project:
+        """Convert catalog entry to model."""
+        return Project(
+            id=entry.id,
+            name=entry.name,
+            symbol=entry.symbol,
+            blockchain=entry.blockchain,
+            category=entry.category,
+            description=entry.description,
+            website=entry.website,
+            github_repo=entry.github_repo,
+            market_cap=entry.market_cap,
+            status=entry.status,
+            created_at=entry.created_at,
+            updated_at=entry.updated_at
         )
     
+    def _documentation_query(self, fields: Optional[List[DocumentationField]] = None):
+        """Projection-only select of documentation fields (all of them if unset)."""
+        names = dict.fromkeys(_DOCUMENTATION_KEY_FIELDS + tuple(f.value for f in self._fields(fields)))
+        if DocumentationField.CONTENT.value in names:
+            # Content is not a column; it is read from the blob its hash names
+            del names[DocumentationField.CONTENT.value]
+            names[DocumentationField.CONTENT_HASH.value] = None
+        return select(*(getattr(DocumentationTable, name) for name in names))
+    
+    async def _load_documentation(
+        self, session: AsyncSession, query: Any, fields: Optional[List[DocumentationField]] = None
+    ) -> List[Documentation]:
+        """Run a :meth:`_documentation_query` and convert its rows to models."""
+        rows = [dict(row._mapping) for row in (await session.execute(query)).all()]
+        if rows and DocumentationField.CONTENT in self._fields(fields):
+            connection = await session.connection()
+            texts = await connection.run_sync(
+                BlobStore.get_many, [row["content_hash"] for row in rows if row["content_hash"]]
+            )
+            for row in rows:
+                row["content"] = texts.get(row["content_hash"])
+        return [Documentation(**row) for row in rows]
+    
+    @staticmethod
+    def _fields(fields: Optional[List[DocumentationField]]) -> List[DocumentationField]:
+        """Requested documentation fields, all of them if unset."""
+        return [DocumentationField(field) for field in (fields if fields is not None else DocumentationField)]
+    
     def _convert_update_record(self, record: UpdateRecordTable) -> UpdateRecord:
         """Convert database update record to model."""
         return UpdateRecord(
@@ -389,7 +672,14 @@ class CryptoService:
             old_hash=record.old_hash,
             new_hash=record.new_hash,
             changes_detected=record.changes_detected,
-            checked_at=record.checked_at
+            checked_at=record.checked_at,
+            segments_added=record.segments_added,
+            segments_removed=record.segments_removed,
+            segments_unchanged=record.segments_unchanged,
+            lines_added=record.lines_added,
+            lines_removed=record.lines_removed,
+            changed_headings=json.loads(record.changed_headings) if record.changed_headings else [],
+            diff_summary=record.diff_summary
         )
     
     def _get_blockchain_metadata(self, blockchain: BlockchainNetwork) -> BlockchainInfo:
@@ -0,0 +1,119 @@
+"""Detail enrichment for projects collected from list endpoints."""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import or_, select, update
+
+from ..collectors.base import BaseCollector
+from ..config import Settings, get_settings
+from ..database.models import ProjectTable
+from ..database.session import DatabaseManager
+from .ingestion import IngestStats, ProjectIngestor
+
+logger = logging.getLogger(__name__)
+
+
+class ProjectEnricher:
+    """Fill description, website and GitHub links from per-project detail calls.
+
+    Ids are consumed in chunks. Ids enriched within ``enrichment_freshness``
+    are skipped and the remaining details are requested together through
+    the collector's ``get_projects_details``, which batches where the source
+    allows it and otherwise fetches concurrently (bounded by
+    ``enrichment_concurrency`` and the collector's shared rate budget). Each
+    chunk is written in bulk through the ingestor.
+    """
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        collector: BaseCollector,
+        ingestor: Optional[ProjectIngestor] = None,
+        settings: Optional[Settings] = None,
+    ):
+        """Initialize the enricher."""
+        self.db_manager = db_manager
+        self.collector = collector
+        self.ingestor = ingestor or ProjectIngestor(db_manager)
+        self.settings = settings or get_settings()
+        self.freshness = timedelta(seconds=self.settings.enrichment_freshness)
+
+    async def enrich(self, project_ids: Iterable[str]) -> IngestStats:
+        """Enrich the given projects, skipping recently enriched ones."""
+        stats = IngestStats()
+        chunk: List[str] = []
+
+        for project_id in project_ids:
+            chunk.append(project_id)
+            if len(chunk) >= self.ingestor.chunk_size:
+                stats.merge(await self._enrich_chunk(chunk))
+                chunk = []
+        if chunk:
+            stats.merge(await self._enrich_chunk(chunk))
+
+        logger.info(
+            f"Enriched projects: {stats.updated} updated, {stats.unchanged} unchanged, "
+            f"{stats.skipped} skipped"
+        )
+        return stats
+
+    async def stale_project_ids(self, limit: Optional[int] = None) -> List[str]:
+        """Ids of projects never enriched or enriched outside the freshness window, largest first."""
+        query = select(ProjectTable.id).where(
+            or_(
+                ProjectTable.enriched_at.is_(None),
+                ProjectTable.enriched_at < datetime.utcnow() - self.freshness,
+            )
+        ).order_by(ProjectTable.market_cap.desc().nulls_last(), ProjectTable.id)
+        if limit is not None:
+            query = query.limit(limit)
+
+        async with self.db_manager.get_session() as session:
+            return list((await session.scalars(query)).all())
+
+    async def _enrich_chunk(self, chunk: List[str]) -> IngestStats:
+        fresh = await self._fresh_ids(chunk)
+        stale = [project_id for project_id in dict.fromkeys(chunk) if project_id not in fresh]
+        stats = IngestStats(skipped=len(chunk) - len(stale))
+        if not stale:
+            return stats
+
+        details = await self._fetch(stale)
+        projects = [project for project in details.values() if project is not None]
+        stats.skipped += len(stale) - len(projects)
+        if not projects:
+            return stats
+
+        stats.merge(await self.ingestor.upsert_projects(projects))
+        await self._mark_enriched([project["id"] for project in projects])
+        return stats
+
+    async def _fetch(self, project_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        try:
+            return await self.collector.get_projects_details(project_ids, self.settings.enrichment_concurrency)
+        except Exception as e:
+            logger.error(f"Error enriching {len(project_ids)} projects: {e}")
+            return {}
+
+    async def _fresh_ids(self, project_ids: List[str]) -> Set[str]:
+        """Ids among ``project_ids`` enriched within the freshness window."""
+        async with self.db_manager.get_session() as session:
+            result = await session.scalars(
+                select(ProjectTable.id).where(
+                    ProjectTable.id.in_(project_ids),
+                    ProjectTable.enriched_at >= datetime.utcnow() - self.freshness,
+                )
+            )
+            return set(result.all())
+
+    async def _mark_enriched(self, project_ids: List[str]) -> None:
+        async with self.db_manager.get_session() as session:
+            await session.execute(
+                update(ProjectTable)
+                .where(ProjectTable.id.in_(project_ids))
+                # enriched_at is bookkeeping, not a material change
+                .values(enriched_at=datetime.utcnow(), updated_at=ProjectTable.updated_at)
+            )
+            await session.commit()
@@ -0,0 +1,292 @@
+"""Bulk ingestion of collector output into ``ProjectTable``."""
+
+import logging
+import math
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, Dict, Iterable, List, Optional, Tuple, Union
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database.models import ProjectTable
+from ..database.session import DatabaseManager
+from ..models import BlockchainNetwork, ProjectCategory, ProjectStatus
+
+logger = logging.getLogger(__name__)
+
+# Fields whose change counts as a real update (and bumps updated_at)
+MATERIAL_FIELDS = (
+    "symbol",
+    "category",
+    "description",
+    "website",
+    "github_repo",
+    "market_cap",
+    "status",
+)
+
+# Fields some sources leave empty (the CoinGecko markets endpoint has no links,
+# GitHub has no symbol or market cap); a missing value keeps what is stored
+KEEP_IF_MISSING = ("symbol", "description", "website", "github_repo", "market_cap")
+
+# Relative market cap movement below which a row is considered unchanged
+MARKET_CAP_TOLERANCE = 0.01
+
+_COLUMNS = ("id", "name", "blockchain") + MATERIAL_FIELDS
+
+
+@dataclass
+class IngestStats:
+    """Outcome of an ingestion run."""
+
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+
+    @property
+    def changed(self) -> int:
+        """Rows that were written."""
+        return self.inserted + self.updated
+
+    def merge(self, other: "IngestStats") -> None:
+        """Add another run's counts to this one."""
+        self.inserted += other.inserted
+        self.updated += other.updated
+        self.unchanged += other.unchanged
+        self.skipped += other.skipped
+
+
+class ProjectIngestor:
+    """Upsert collector project dicts in chunks.
+
+    Each chunk is classified against the stored rows in one query. New and
+    changed rows are written with a single ``INSERT ... ON CONFLICT`` on
+    ``uq_project_name_blockchain``, and unchanged rows are not written at all,
+    so ``updated_at`` only moves when something material changed.
+    """
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        chunk_size: int = 500,
+        catalog: Optional[Any] = None,
+        cache: Optional[Any] = None,
+    ):
+        """Initialize the ingestor."""
+        self.db_manager = db_manager
+        self.chunk_size = chunk_size
+        self.catalog = catalog
+        self.cache = cache
+
+    async def upsert_projects(
+        self, projects: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]]
+    ) -> IngestStats:
+        """Upsert projects from a list, iterator or async stream of collector dicts."""
+        stats = IngestStats()
+        chunk: List[Dict[str, Any]] = []
+
+        if hasattr(projects, "__aiter__"):
+            async for project in projects:
+                chunk.append(project)
+                if len(chunk) >= self.chunk_size:
+                    stats.merge(await self._upsert_chunk(chunk))
+                    chunk = []
+        else:
+            for project in projects:
+                chunk.append(project)
+                if len(chunk) >= self.chunk_size:
+                    stats.merge(await self._upsert_chunk(chunk))
+                    chunk = []
+
+        if chunk:
+            stats.merge(await self._upsert_chunk(chunk))
+
+        logger.info(
+            f"Ingested projects: {stats.inserted} inserted, {stats.updated} updated, "
+            f"{stats.unchanged} unchanged, {stats.skipped} skipped"
+        )
+
+        if stats.changed:
+            await self._notify_changed()
+
+        return stats
+
+    async def _upsert_chunk(self, chunk: List[Dict[str, Any]]) -> IngestStats:
+        stats = IngestStats()
+
+        # Normalize and de-duplicate within the chunk (last occurrence wins)
+        rows: Dict[Tuple[str, Any], Dict[str, Any]] = {}
+        for project in chunk:
+            row = self._normalize(project)
+            if row is None:
+                stats.skipped += 1
+                continue
+            rows[(row["name"], row["blockchain"])] = row
+
+        if not rows:
+            return stats
+
+        async with self.db_manager.get_session() as session:
+            existing_by_id, existing_by_key = await self._load_existing(session, rows.values())
+
+            conflict_rows: List[Dict[str, Any]] = []
+            id_updates: List[Dict[str, Any]] = []
+            plain_inserts: List[Dict[str, Any]] = []
+
+            for key, row in rows.items():
+                current = existing_by_id.get(row["id"]) or existing_by_key.get(key)
+                if current is None:
+                    stats.inserted += 1
+                    # NULL blockchains never conflict on the unique constraint
+                    (conflict_rows if row["blockchain"] is not None else plain_inserts).append(row)
+                    continue
+
+                merged = self._merge(current, row)
+                if not self._is_changed(current, merged):
+                    stats.unchanged += 1
+                    continue
+
+                other = existing_by_key.get(key)
+                if other is not None and other["id"] != current["id"]:
+                    # Renamed onto a name/blockchain pair owned by another project
+                    logger.warning(f"Skipping project {row['id']}: {key} belongs to {other['id']}")
+                    stats.skipped += 1
+                    continue
+
+                stats.updated += 1
+                same_key = (current["name"], current["blockchain"]) == key
+                if current["id"] == row["id"] and same_key and key[1] is not None:
+                    conflict_rows.append(merged)
+                else:
+                    merged["id"] = current["id"]
+                    id_updates.append(merged)
+
+            if conflict_rows:
+                upsert = self._upsert_statement(session, conflict_rows)
+                if upsert is not None:
+                    await session.execute(upsert)
+                else:
+                    # No ON CONFLICT support: insert new rows, update existing ones by id
+                    for row in conflict_rows:
+                        (id_updates if row["id"] in existing_by_id else plain_inserts).append(row)
+            if plain_inserts:
+                await session.execute(ProjectTable.__table__.insert(), plain_inserts)
+            if id_updates:
+                for row in id_updates:
+                    row["updated_at"] = func.now()
+                    await session.execute(
+                        update(ProjectTable).where(ProjectTable.id == row["id"]).values(
+                            {k: v for k, v in row.items() if k != "id"}
+                        )
+                    )
+
+            await session.commit()
+
+        return stats
+
+    async def _load_existing(
+        self, session: AsyncSession, rows: Iterable[Dict[str, Any]]
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[Tuple[str, Any], Dict[str, Any]]]:
+        """Fetch stored rows matching the chunk by id or by name."""
+        rows = list(rows)
+        ids = [row["id"] for row in rows]
+        names = list({row["name"] for row in rows})
+
+        query = select(*(getattr(ProjectTable, column) for column in _COLUMNS)).where(
+            or_(ProjectTable.id.in_(ids), ProjectTable.name.in_(names))
+        )
+        result = await session.execute(query)
+
+        by_id: Dict[str, Dict[str, Any]] = {}
+        by_key: Dict[Tuple[str, Any], Dict[str, Any]] = {}
+        for values in result.all():
+            current = dict(zip(_COLUMNS, values, strict=True))
+            by_id[current["id"]] = current
+            by_key[(current["name"], current["blockchain"])] = current
+        return by_id, by_key
+
+    def _upsert_statement(self, session: AsyncSession, rows: List[Dict[str, Any]]) -> Optional[Any]:
+        """``INSERT ... ON CONFLICT (name, blockchain) DO UPDATE``, or None if the dialect has none."""
+        dialect = session.bind.dialect.name
+        if dialect == "postgresql":
+            insert = postgresql.insert
+        elif dialect == "sqlite":
+            insert = sqlite.insert
+        else:
+            return None
+
+        statement = insert(ProjectTable).values(rows)
+        excluded = statement.excluded
+        table = ProjectTable.__table__
+
+        assignments = {}
+        for field in MATERIAL_FIELDS:
+            if field in KEEP_IF_MISSING:
+                assignments[field] = func.coalesce(excluded[field], table.c[field])
+            else:
+                assignments[field] = excluded[field]
+        assignments["updated_at"] = func.now()
+
+        return statement.on_conflict_do_update(
+            index_elements=["name", "blockchain"],
+            set_=assignments,
+            # Guards against concurrent writers re-applying an identical row
+            where=or_(*(table.c[field].is_distinct_from(assignments[field]) for field in MATERIAL_FIELDS)),
+        )
+
+    @staticmethod
+    def _normalize(project: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Map a collector dict onto ``ProjectTable`` columns."""
+        try:
+            blockchain = project.get("blockchain")
+            category = project.get("category")
+            status = project.get("status") or ProjectStatus.ACTIVE
+            return {
+                "id": str(project["id"]),
+                "name": project["name"],
+                "symbol": project.get("symbol"),
+                "blockchain": BlockchainNetwork(blockchain) if blockchain else None,
+                "category": ProjectCategory(category) if category else None,
+                "description": project.get("description") or None,
+                "website": project.get("website") or None,
+                "github_repo": project.get("github_repo") or None,
+                "market_cap": project.get("market_cap"),
+                "status": ProjectStatus(status),
+            }
+        except (KeyError, ValueError) as e:
+            logger.warning(f"Skipping malformed project {project.get('id', 'unknown')}: {e}")
+            return None
+
+    @staticmethod
+    def _merge(current: Dict[str, Any], row: Dict[str, Any]) -> Dict[str, Any]:
+        """Incoming row with missing fields filled from the stored row."""
+        merged = dict(row)
+        for field in KEEP_IF_MISSING:
+            if merged[field] is None:
+                merged[field] = current[field]
+        return merged
+
+    @staticmethod
+    def _is_changed(current: Dict[str, Any], merged: Dict[str, Any]) -> bool:
+        """Whether any material field differs enough to be worth a write."""
+        if (current["name"], current["blockchain"]) != (merged["name"], merged["blockchain"]):
+            return True
+
+        for field in MATERIAL_FIELDS:
+            old, new = current[field], merged[field]
+            if field == "market_cap" and old is not None and new is not None:
+                if not math.isclose(old, new, rel_tol=MARKET_CAP_TOLERANCE):
+                    return True
+            elif old != new:
+                return True
+        return False
+
+    async def _notify_changed(self) -> None:
+        """Let the catalog and response cache pick up written rows."""
+        if self.catalog is not None:
+            await self.catalog.refresh()
+        if self.cache is not None:
+            await self.cache.invalidate("projects")
+            await self.cache.invalidate("search")
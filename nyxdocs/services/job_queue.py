@@ -0,0 +1,361 @@
+"""Persistent priority job queue on ``ScrapingJobTable``."""
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import and_, func, insert, select, update
+
+from ..config import Settings, get_settings
+from ..database.models import ScrapingJobTable
+from ..database.session import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+# Job statuses (ScrapingJobTable.status)
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+@dataclass
+class Job:
+    """A claimed job, detached from the session that claimed it."""
+
+    id: str
+    job_type: str
+    project_id: str
+    documentation_id: Optional[str]
+    priority: int
+    retry_count: int
+    max_retries: int
+    started_at: Optional[datetime] = None
+
+
+JobHandler = Callable[[Job], Awaitable[None]]
+
+
+class JobQueue:
+    """Database-backed job queue shared by every worker process.
+
+    Jobs run in ascending ``priority`` order (1 before 5), then by
+    ``scheduled_at``. Claiming is atomic: PostgreSQL locks candidate rows with
+    ``FOR UPDATE SKIP LOCKED`` so concurrent workers never wait on each other,
+    and SQLite, which serializes writers, claims with a single conditional
+    ``UPDATE ... RETURNING``. Failed jobs are rescheduled with exponential
+    backoff through ``scheduled_at`` until ``max_retries`` is reached.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, settings: Optional[Settings] = None):
+        """Initialize the queue."""
+        self.db_manager = db_manager
+        self.settings = settings or get_settings()
+
+    async def enqueue(
+        self,
+        job_type: str,
+        project_id: str,
+        documentation_id: Optional[str] = None,
+        priority: int = 5,
+        delay: float = 0,
+        max_retries: Optional[int] = None,
+    ) -> str:
+        """Add a job, or return the id of an identical one still waiting or running."""
+        async with self.db_manager.get_session() as session:
+            existing = await session.scalar(
+                select(ScrapingJobTable.id).where(
+                    ScrapingJobTable.job_type == job_type,
+                    ScrapingJobTable.project_id == project_id,
+                    ScrapingJobTable.documentation_id.is_(None) if documentation_id is None
+                    else ScrapingJobTable.documentation_id == documentation_id,
+                    ScrapingJobTable.status.in_([JOB_PENDING, JOB_RUNNING]),
+                ).limit(1)
+            )
+            if existing is not None:
+                return existing
+
+            job_id = str(uuid.uuid4())
+            session.add(ScrapingJobTable(
+                id=job_id,
+                project_id=project_id,
+                documentation_id=documentation_id,
+                job_type=job_type,
+                status=JOB_PENDING,
+                priority=priority,
+                scheduled_at=datetime.utcnow() + timedelta(seconds=delay),
+                retry_count=0,
+                max_retries=self.settings.max_retries if max_retries is None else max_retries,
+            ))
+            await session.commit()
+            return job_id
+
+    async def enqueue_many(self, jobs: Sequence[Tuple[str, str, Optional[str], int]]) -> int:
+        """Bulk-add (job_type, project_id, documentation_id, priority) jobs.
+
+        Jobs identical to one still waiting or running are skipped. Returns
+        the number of jobs added.
+        """
+        if not jobs:
+            return 0
+
+        async with self.db_manager.get_session() as session:
+            result = await session.execute(
+                select(ScrapingJobTable.job_type, ScrapingJobTable.project_id, ScrapingJobTable.documentation_id)
+                .where(ScrapingJobTable.status.in_([JOB_PENDING, JOB_RUNNING]))
+            )
+            active = set(result.all())
+
+            now = datetime.utcnow()
+            rows = []
+            for job_type, project_id, documentation_id, priority in jobs:
+                key = (job_type, project_id, documentation_id)
+                if key in active:
+                    continue
+                active.add(key)
+                rows.append({
+                    "id": str(uuid.uuid4()),
+                    "project_id": project_id,
+                    "documentation_id": documentation_id,
+                    "job_type": job_type,
+                    "status": JOB_PENDING,
+                    "priority": priority,
+                    "scheduled_at": now,
+                    "retry_count": 0,
+                    "max_retries": self.settings.max_retries,
+                })
+
+            if rows:
+                await session.execute(insert(ScrapingJobTable), rows)
+                await session.commit()
+            return len(rows)
+
+    async def claim(self, limit: int = 1, job_types: Optional[Sequence[str]] = None) -> List[Job]:
+        """Atomically move up to ``limit`` due jobs to running and return them."""
+        if limit <= 0:
+            return []
+
+        now = datetime.utcnow()
+        due = [ScrapingJobTable.status == JOB_PENDING, ScrapingJobTable.scheduled_at <= now]
+        if job_types is not None:
+            due.append(ScrapingJobTable.job_type.in_(list(job_types)))
+        order = (ScrapingJobTable.priority, ScrapingJobTable.scheduled_at, ScrapingJobTable.id)
+
+        async with self.db_manager.get_session() as session:
+            if session.bind.dialect.name == "postgresql":
+                candidates = (
+                    select(ScrapingJobTable.id).where(*due).order_by(*order).limit(limit)
+                    .with_for_update(skip_locked=True)
+                )
+                job_ids = list((await session.scalars(candidates)).all())
+                if not job_ids:
+                    await session.rollback()
+                    return []
+                claimed = update(ScrapingJobTable).where(ScrapingJobTable.id.in_(job_ids))
+            else:
+                candidates = select(ScrapingJobTable.id).where(*due).order_by(*order).limit(limit)
+                # Re-checking the status makes the claim safe if another writer got there first
+                claimed = update(ScrapingJobTable).where(
+                    ScrapingJobTable.id.in_(candidates), ScrapingJobTable.status == JOB_PENDING
+                )
+
+            result = await session.execute(
+                claimed.values(status=JOB_RUNNING, started_at=now, completed_at=None)
+                .returning(
+                    ScrapingJobTable.id,
+                    ScrapingJobTable.job_type,
+                    ScrapingJobTable.project_id,
+                    ScrapingJobTable.documentation_id,
+                    ScrapingJobTable.priority,
+                    ScrapingJobTable.retry_count,
+                    ScrapingJobTable.max_retries,
+                    ScrapingJobTable.started_at,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            jobs = [Job(*row) for row in result.all()]
+            await session.commit()
+
+        jobs.sort(key=lambda job: job.priority)
+        return jobs
+
+    async def complete(self, job: Job) -> bool:
+        """Mark a claimed job as completed. Returns False if this claim no longer holds it."""
+        return await self._set(job, status=JOB_COMPLETED, completed_at=datetime.utcnow(), error_message=None)
+
+    async def release(self, job: Job) -> bool:
+        """Return a claimed job to the queue without counting an attempt."""
+        return await self._set(job, status=JOB_PENDING, started_at=None)
+
+    async def fail(self, job: Job, error: str) -> bool:
+        """Record a failed attempt. Returns True if the job was rescheduled."""
+        attempts = job.retry_count + 1
+        if attempts > job.max_retries:
+            if await self._set(
+                job, status=JOB_FAILED, completed_at=datetime.utcnow(),
+                retry_count=attempts, error_message=error,
+            ):
+                logger.warning(f"Job {job.id} ({job.job_type}) failed permanently: {error}")
+            return False
+
+        return await self._set(
+            job, status=JOB_PENDING, started_at=None, retry_count=attempts, error_message=error,
+            scheduled_at=datetime.utcnow() + timedelta(seconds=self.backoff(attempts)),
+        )
+
+    def backoff(self, attempts: int) -> float:
+        """Delay before retry number ``attempts``."""
+        return min(self.settings.retry_delay * 2 ** (attempts - 1), self.settings.job_max_backoff)
+
+    async def reclaim_stale(self, timeout: Optional[float] = None) -> int:
+        """Return jobs stuck in running (e.g. after a worker crash) to the queue."""
+        timeout = self.settings.job_stale_timeout if timeout is None else timeout
+        cutoff = datetime.utcnow() - timedelta(seconds=timeout)
+        stale = and_(ScrapingJobTable.status == JOB_RUNNING, ScrapingJobTable.started_at < cutoff)
+
+        async with self.db_manager.get_session() as session:
+            exhausted = await session.execute(
+                update(ScrapingJobTable)
+                .where(stale, ScrapingJobTable.retry_count >= ScrapingJobTable.max_retries)
+                .values(status=JOB_FAILED, completed_at=datetime.utcnow(), error_message="Timed out while running")
+            )
+            requeued = await session.execute(
+                update(ScrapingJobTable)
+                .where(stale)
+                .values(
+                    status=JOB_PENDING,
+                    started_at=None,
+                    retry_count=ScrapingJobTable.retry_count + 1,
+                    scheduled_at=datetime.utcnow(),
+                    error_message="Reclaimed after timing out",
+                )
+            )
+            await session.commit()
+
+        count = (exhausted.rowcount or 0) + (requeued.rowcount or 0)
+        if count:
+            logger.warning(f"Reclaimed {count} stale jobs")
+        return count
+
+    async def counts(self) -> Dict[str, int]:
+        """Number of jobs per status."""
+        async with self.db_manager.get_session() as session:
+            result = await session.execute(
+                select(ScrapingJobTable.status, func.count(ScrapingJobTable.id)).group_by(ScrapingJobTable.status)
+            )
+            return dict(result.all())
+
+    async def _set(self, job: Job, **values) -> bool:
+        """Update a job only while it is still running under this claim."""
+        async with self.db_manager.get_session() as session:
+            result = await session.execute(
+                update(ScrapingJobTable)
+                .where(
+                    ScrapingJobTable.id == job.id,
+                    ScrapingJobTable.status == JOB_RUNNING,
+                    ScrapingJobTable.started_at == job.started_at,
+                )
+                .values(**values)
+            )
+            await session.commit()
+
+        if not result.rowcount:
+            # Reclaimed as stale (and maybe claimed again) while this worker ran it
+            logger.warning(f"Job {job.id} ({job.job_type}) is no longer held by this claim; result dropped")
+            return False
+        return True
+
+
+class WorkerPool:
+    """Run queued jobs with bounded concurrency.
+
+    Up to ``concurrency`` jobs (default ``max_concurrent_scrapes``) run at once
+    in this process; free slots are filled by claiming from the queue, which
+    is polled every ``job_poll_interval`` seconds when idle. Stale running jobs
+    are reclaimed periodically so a crashed worker's jobs are picked up again.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Dict[str, JobHandler],
+        concurrency: Optional[int] = None,
+    ):
+        """Initialize the pool."""
+        self.queue = queue
+        self.handlers = handlers
+        self.settings = queue.settings
+        self.concurrency = concurrency or self.settings.max_concurrent_scrapes
+        self._running: Set["asyncio.Task[None]"] = set()
+        self._wakeup = asyncio.Event()
+
+    def notify(self) -> None:
+        """Wake the pool early, e.g. after enqueueing work."""
+        self._wakeup.set()
+
+    async def run(self) -> None:
+        """Claim and run jobs until cancelled."""
+        poll_interval = self.settings.job_poll_interval
+        last_reclaim = 0.0
+        try:
+            while True:
+                # Cleared before claiming so a job finishing meanwhile still wakes us
+                self._wakeup.clear()
+
+                if time.monotonic() - last_reclaim >= self.settings.job_stale_timeout / 2:
+                    await self.queue.reclaim_stale()
+                    last_reclaim = time.monotonic()
+
+                free = self.concurrency - len(self._running)
+                jobs = await self.queue.claim(free, job_types=list(self.handlers)) if free else []
+                for job in jobs:
+                    task = asyncio.create_task(self._run_job(job))
+                    self._running.add(task)
+                    task.add_done_callback(self._job_done)
+
+                if len(jobs) < free or not free:
+                    # Nothing more is due, or every slot is busy: wait for a
+                    # finished job, a notify() or the next poll
+                    await self._wait(poll_interval)
+        finally:
+            await self._cancel_running()
+
+    async def run_until_empty(self) -> None:
+        """Run jobs until none are due, then return."""
+        while True:
+            jobs = await self.queue.claim(self.concurrency, job_types=list(self.handlers))
+            if not jobs:
+                return
+            await asyncio.gather(*(self._run_job(job) for job in jobs))
+
+    async def _run_job(self, job: Job) -> None:
+        try:
+            await self.handlers[job.job_type](job)
+        except asyncio.CancelledError:
+            # Shutting down; hand the job back without counting an attempt
+            await asyncio.shield(self.queue.release(job))
+            raise
+        except Exception as e:
+            logger.error(f"Job {job.id} ({job.job_type}) failed: {e}")
+            await self.queue.fail(job, str(e))
+        else:
+            await self.queue.complete(job)
+
+    def _job_done(self, task: "asyncio.Task[None]") -> None:
+        self._running.discard(task)
+        self._wakeup.set()
+
+    async def _wait(self, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except TimeoutError:
+            pass
+
+    async def _cancel_running(self) -> None:
+        for task in self._running:
+            task.cancel()
+        await asyncio.gather(*self._running, return_exceptions=True)
@@ -0,0 +1,89 @@
+"""Cursor pagination over large documentation text.
+
+A page is a window of at most ``max_chars`` characters that ends on a
+heading, paragraph, line or word boundary when one falls in the second
+half of the window. The continuation cursor is an opaque token naming the
+document, the content hash it was cut from and the next offset. A cursor
+therefore stops working once the document changes instead of silently
+pointing into different text. Pages are read from the stored segments
+under them, and decompressed segments are kept in a small LRU keyed by
+segment hash, so reading a document page by page loads each segment once.
+"""
+
+import base64
+import binascii
+import json
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from ..config import get_settings
+from ..utils.segments import page_end  # noqa: F401 - re-exported for callers paging text
+
+# Characters of the content hash carried in a cursor
+_CURSOR_HASH_CHARS = 16
+
+# Smallest page worth returning (DocumentationPageRequest.max_chars minimum)
+MIN_PAGE_CHARS = 500
+
+
+class InvalidCursor(ValueError):
+    """Raised for malformed cursors or cursors into changed documents."""
+
+
+def encode_cursor(documentation_id: str, content_hash: str, offset: int) -> str:
+    """Opaque continuation token for ``offset`` into a document version."""
+    payload = json.dumps([documentation_id, content_hash[:_CURSOR_HASH_CHARS], offset], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str, int]:
+    """(documentation id, content hash prefix, offset) of a token."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        documentation_id, hash_prefix, offset = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError, TypeError) as e:
+        raise InvalidCursor(f"Malformed cursor: {cursor!r}") from e
+    if not isinstance(documentation_id, str) or not isinstance(hash_prefix, str) or not isinstance(offset, int):
+        raise InvalidCursor(f"Malformed cursor: {cursor!r}")
+    # A shorter prefix would match other versions of the document
+    if offset < 0 or len(hash_prefix) != _CURSOR_HASH_CHARS:
+        raise InvalidCursor(f"Malformed cursor: {cursor!r}")
+    return documentation_id, hash_prefix, offset
+
+
+def cursor_matches(hash_prefix: str, content_hash: Optional[str]) -> bool:
+    """Whether a cursor was issued for this version of a document."""
+    return content_hash is not None and content_hash.startswith(hash_prefix)
+
+
+class DocumentTextCache:
+    """LRU of decompressed text keyed by its hash, bounded by characters."""
+
+    def __init__(self, max_chars: Optional[int] = None):
+        """Initialize an empty cache."""
+        self.max_chars = max_chars if max_chars is not None else get_settings().doc_page_cache_chars
+        self._texts: "OrderedDict[str, str]" = OrderedDict()
+        self._chars = 0
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def get(self, text_hash: str) -> Optional[str]:
+        """Cached text for a hash, marking it recently used."""
+        text = self._texts.get(text_hash)
+        if text is not None:
+            self._texts.move_to_end(text_hash)
+        return text
+
+    def put(self, text_hash: str, text: str) -> None:
+        """Cache text, evicting the least recently used entries to fit."""
+        if len(text) > self.max_chars:
+            return
+        previous = self._texts.pop(text_hash, None)
+        if previous is not None:
+            self._chars -= len(previous)
+        self._texts[text_hash] = text
+        self._chars += len(text)
+        while self._chars > self.max_chars:
+            _, evicted = self._texts.popitem(last=False)
+            self._chars -= len(evicted)
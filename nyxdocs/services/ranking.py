@@ -0,0 +1,147 @@
+"""Relevance ranking for project search."""
+
+import asyncio
+import logging
+import math
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from ..config import Settings, get_settings
+from ..database.models import DocumentationTable, DocumentSegmentTable, ProjectTable
+from ..database.session import DatabaseManager
+from ..models import ScrapeStatus
+from ..utils.bm25 import NUMPY_AVAILABLE, BM25Index, FieldSpec, tokenize
+from ..utils.compression import decompress_text
+
+logger = logging.getLogger(__name__)
+
+# Project fields and their BM25F weight and length normalization; names and
+# symbols are short, so their length says nothing about relevance
+FIELDS = {
+    "name": FieldSpec(weight=4.0, b=0.0),
+    "symbol": FieldSpec(weight=4.0, b=0.0),
+    "description": FieldSpec(weight=2.0, b=0.75),
+    "docs": FieldSpec(weight=1.0, b=0.75),
+}
+
+# Stored segments tokenized per batch while building
+_SEGMENT_BATCH = 500
+
+
+class ProjectRanker:
+    """BM25F relevance ranking of projects, kept on disk between runs.
+
+    Each project is one document whose fields are its name, symbol,
+    description and the text of its scraped documentation segments. Market
+    cap is used only as a prior: a log-scaled boost of up to
+    ``ranking_market_cap_weight`` times the relevance score of projects that
+    already match the query. The index is rebuilt on a schedule and saved
+    under ``ranking_index_dir``. Startup maps the saved copy instead of
+    re-reading every document.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, settings: Optional[Settings] = None):
+        """Initialize without an index."""
+        self.db_manager = db_manager
+        self.settings = settings or get_settings()
+        self.path = self.settings.get_ranking_index_dir(db_manager.database_url)
+        self.index: Optional[BM25Index] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether an index has been loaded or built."""
+        return self.index is not None
+
+    async def load(self) -> None:
+        """Map the saved index, rebuilding it if it is missing or older than the rebuild interval."""
+        index = await asyncio.to_thread(BM25Index.load, self.path)
+        built_at = index.metadata.get("built_at", 0) if index is not None else 0
+        if index is None or time.time() - built_at > self.settings.ranking_rebuild_interval:
+            await self.rebuild()
+            return
+
+        self.index = index
+        logger.info(f"Loaded project ranking index with {len(index)} projects")
+
+    async def rebuild(self) -> int:
+        """Rebuild the index from the database and save it. Returns projects indexed."""
+        documents = await self._collect()
+        self.index = await asyncio.to_thread(self._build, documents)
+        logger.info(
+            f"Built project ranking index with {len(self.index)} projects "
+            f"({'numpy' if NUMPY_AVAILABLE else 'pure Python'} scoring)"
+        )
+        return len(self.index)
+
+    async def run_rebuild_loop(self, interval: float) -> None:
+        """Rebuild the index periodically until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.rebuild()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error rebuilding project ranking index: {e}")
+
+    def rank(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Best (project id, score) matches for a query, or all of them; empty until the index is loaded."""
+        if self.index is None:
+            return []
+        return self.index.rank(query, limit, self.settings.ranking_market_cap_weight)
+
+    def _build(self, documents: List[Tuple[str, Dict[str, Counter], float]]) -> BM25Index:
+        """Build, save and map the index (runs in a worker thread)."""
+        index = BM25Index.build(documents, FIELDS, metadata={"built_at": time.time()})
+        index.save(self.path)
+        return BM25Index.load(self.path) or index
+
+    async def _collect(self) -> List[Tuple[str, Dict[str, Counter], float]]:
+        """(project id, term counts per field, market cap prior) of every project."""
+        async with self.db_manager.get_session() as session:
+            projects = (await session.execute(select(
+                ProjectTable.id,
+                ProjectTable.name,
+                ProjectTable.symbol,
+                ProjectTable.description,
+                ProjectTable.market_cap,
+            ))).all()
+
+            terms: Dict[str, Dict[str, Counter]] = {}
+            for project_id, name, symbol, description, _ in projects:
+                terms[project_id] = {
+                    "name": Counter(tokenize(name or "")),
+                    "symbol": Counter(tokenize(symbol or "")),
+                    "description": Counter(tokenize(description or "")),
+                    "docs": Counter(),
+                }
+
+            segments = DocumentSegmentTable.__table__
+            stream = await session.stream(
+                select(DocumentationTable.project_id, segments.c.codec, segments.c.data)
+                .join(segments, segments.c.content_hash == DocumentationTable.content_hash)
+                .where(DocumentationTable.scrape_status == ScrapeStatus.SUCCESS)
+            )
+            async for batch in stream.partitions(_SEGMENT_BATCH):
+                counts = await asyncio.to_thread(_count_segments, batch)
+                for project_id, counter in counts.items():
+                    if project_id in terms:
+                        terms[project_id]["docs"].update(counter)
+
+        # Log-scaled to 0-1 so a thousandfold cap difference is a modest boost
+        top = max((cap for *_, cap in projects if cap), default=0.0)
+        return [
+            (project_id, terms[project_id], math.log1p(cap) / math.log1p(top) if cap and top else 0.0)
+            for project_id, *_, cap in projects
+        ]
+
+
+def _count_segments(rows: List[Tuple[str, str, bytes]]) -> Dict[str, Counter]:
+    """Term counts per project of a batch of (project id, codec, data) segment rows."""
+    counts: Dict[str, Counter] = {}
+    for project_id, codec, data in rows:
+        counts.setdefault(project_id, Counter()).update(tokenize(decompress_text(codec, data)))
+    return counts
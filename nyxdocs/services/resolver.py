@@ -0,0 +1,142 @@
+"""Project name resolution for tool calls that take a project name or symbol."""
+
+import logging
+import time
+from typing import TYPE_CHECKING, List, Optional
+
+from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import get_settings
+from ..database.models import ProjectTable
+from ..utils.trigram import TrigramIndex
+
+if TYPE_CHECKING:
+    from .catalog import ProjectCatalog
+
+logger = logging.getLogger(__name__)
+
+
+class ProjectResolver:
+    """Resolve a user-supplied name or symbol to one project.
+
+    Lookups cascade from exact to prefix to trigram-similarity matches. Exact
+    and prefix lookups are range scans on the ``lower(name)``/``lower(symbol)``
+    expression indexes; fuzzy lookups use a pg_trgm GIN index on PostgreSQL
+    and an in-process trigram index elsewhere. Within a tier, ties go to the
+    larger market cap, then name, then id, so the same query always resolves
+    to the same project.
+
+    When a loaded ``ProjectCatalog`` is supplied its incrementally maintained
+    name index is used instead of building a private one.
+    """
+
+    def __init__(self, catalog: Optional["ProjectCatalog"] = None) -> None:
+        """Initialize the resolver."""
+        self.settings = get_settings()
+        self.catalog = catalog
+        self._index = TrigramIndex()
+        self._index_built_at: Optional[float] = None
+
+    async def resolve(self, session: AsyncSession, query: str) -> Optional[str]:
+        """Return the id of the best matching project, or None."""
+        term = query.strip().lower()
+        if not term:
+            return None
+
+        project_id = await self._resolve_exact(session, term)
+        if project_id is None:
+            project_id = await self._resolve_prefix(session, term)
+        if project_id is None:
+            project_id = await self._resolve_fuzzy(session, term)
+
+        logger.debug(f"Resolved project '{query}' to {project_id}")
+        return project_id
+
+    def invalidate(self) -> None:
+        """Force the in-process trigram index to be rebuilt on next use."""
+        self._index_built_at = None
+
+    async def _resolve_exact(self, session: AsyncSession, term: str) -> Optional[str]:
+        """Exact name or symbol match; an exact name beats an exact symbol."""
+        name = func.lower(ProjectTable.name)
+        symbol = func.lower(ProjectTable.symbol)
+
+        query = select(ProjectTable.id).where(
+            or_(name == term, symbol == term)
+        ).order_by(
+            case((name == term, 0), else_=1),
+            *self._tiebreak()
+        ).limit(1)
+
+        return await session.scalar(query)
+
+    async def _resolve_prefix(self, session: AsyncSession, term: str) -> Optional[str]:
+        """Name or symbol prefix match, as an index-friendly range scan."""
+        name = func.lower(ProjectTable.name)
+        symbol = func.lower(ProjectTable.symbol)
+        upper = term[:-1] + chr(ord(term[-1]) + 1)
+
+        query = select(ProjectTable.id).where(
+            or_(
+                and_(name >= term, name < upper),
+                and_(symbol >= term, symbol < upper),
+            )
+        ).order_by(*self._tiebreak()).limit(1)
+
+        return await session.scalar(query)
+
+    async def _resolve_fuzzy(self, session: AsyncSession, term: str) -> Optional[str]:
+        """Trigram-similarity match on the project name."""
+        threshold = self.settings.fuzzy_match_threshold
+
+        if session.bind.dialect.name == "postgresql":
+            name = func.lower(ProjectTable.name)
+            score = func.similarity(name, term)
+            query = select(ProjectTable.id).where(
+                name.op("%")(term),
+                score >= threshold,
+            ).order_by(score.desc(), *self._tiebreak()).limit(1)
+            return await session.scalar(query)
+
+        if self.catalog is not None and self.catalog.is_loaded:
+            index = self.catalog.name_index
+        else:
+            await self._ensure_index(session)
+            index = self._index
+
+        matches = index.search(term, threshold=threshold, limit=50)
+        if not matches:
+            return None
+
+        best_score = matches[0][1]
+        candidates = [key for key, score in matches if score == best_score]
+        if len(candidates) == 1:
+            return candidates[0]
+
+        query = select(ProjectTable.id).where(
+            ProjectTable.id.in_(candidates)
+        ).order_by(*self._tiebreak()).limit(1)
+        return await session.scalar(query)
+
+    async def _ensure_index(self, session: AsyncSession) -> None:
+        """Build the in-process trigram index, refreshing it once per update interval."""
+        now = time.monotonic()
+        if self._index_built_at is not None and now - self._index_built_at < self.settings.project_update_interval:
+            return
+
+        result = await session.execute(select(ProjectTable.id, ProjectTable.name))
+        self._index.clear()
+        self._index.update(result.all())
+        self._index_built_at = now
+        logger.info(f"Built project trigram index with {len(self._index)} entries")
+
+    @staticmethod
+    def _tiebreak() -> List:
+        """Deterministic ordering within a match tier."""
+        return [
+            ProjectTable.market_cap.desc().nulls_last(),
+            func.length(ProjectTable.name),
+            ProjectTable.name,
+            ProjectTable.id,
+        ]
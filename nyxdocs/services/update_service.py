@@ -0,0 +1,289 @@
+"""Documentation update monitoring with conditional re-scrapes."""
+
+import asyncio
+import json
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import or_, select, update
+
+from ..config import Settings, get_settings
+from ..database.blobs import BlobStore
+from ..database.models import DocumentationTable, UpdateRecordTable
+from ..database.session import DatabaseManager
+from ..models import ScrapeStatus, UpdateRecord
+from ..scrapers import BaseScraper, GitHubScraper, WebScraper
+from ..scrapers.processing import get_processing_stage
+from ..utils.diffs import DiffSummary, summarize_changes
+from ..utils.segments import SegmentDiff, diff_segments
+from .cache import ResponseCache
+from .job_queue import Job, JobQueue
+
+logger = logging.getLogger(__name__)
+
+# Documents checked per query when sweeping for due updates
+_BATCH_SIZE = 100
+
+
+class DocumentationUpdater:
+    """Re-scrape stored documentation and record whether it changed.
+
+    Each fetch sends the ``ETag``/``Last-Modified`` validators saved from the
+    previous one. A ``304 Not Modified`` skips extraction, cleaning and hashing
+    entirely and is recorded as an unchanged check; only a changed body
+    rewrites the document. A change is diffed segment by segment against the
+    stored version: the record counts segments added, removed and unchanged,
+    and the full-text index re-indexes only the changed ones. The changed
+    segments are also diffed line by line into a short summary kept on the
+    record, so reading what changed never loads the documents.
+
+    Due documents are handed to their scrapers' ``prefetch`` before they are
+    checked, so sources that can batch (GitHub, through GraphQL) fetch many
+    files per request instead of one each.
+    """
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        scrapers: Optional[List[BaseScraper]] = None,
+        cache: Optional[ResponseCache] = None,
+        settings: Optional[Settings] = None,
+    ):
+        """Initialize the updater."""
+        self.db_manager = db_manager
+        self.scrapers = scrapers if scrapers is not None else [GitHubScraper(), WebScraper()]
+        self.cache = cache
+        self.settings = settings or get_settings()
+        self._semaphore = asyncio.Semaphore(self.settings.max_concurrent_scrapes)
+
+    async def check(self, documentation_id: str) -> Optional[UpdateRecord]:
+        """Re-scrape one document. Returns the update record, or None if the fetch failed."""
+        async with self.db_manager.get_session() as session:
+            doc = await session.get(DocumentationTable, documentation_id)
+            if doc is None:
+                return None
+            url, etag, last_modified, old_hash = doc.url, doc.etag, doc.last_modified, doc.content_hash
+
+        scraper = await self._scraper_for(url)
+        if scraper is None:
+            logger.warning(f"No scraper can handle {url}")
+            return None
+
+        try:
+            async with self._semaphore:
+                result = await scraper.fetch(scraper.fetch_url(url), etag, last_modified)
+            title = content = new_hash = segments = None
+            if not result.not_modified:
+                title, content, new_hash, segments = await scraper.process(url, result)
+        except Exception as e:
+            logger.error(f"Error checking documentation {documentation_id}: {e}")
+            await self._mark_failed(documentation_id, str(e))
+            return None
+
+        checked_at = datetime.utcnow()
+        changed = new_hash is not None and new_hash != old_hash
+
+        async with self.db_manager.get_session() as session:
+            diff: Optional[SegmentDiff] = None
+            summary: Optional[DiffSummary] = None
+            if changed:
+                connection = await session.connection()
+                old_segments = await connection.run_sync(BlobStore.segments, old_hash) if old_hash else []
+                diff = diff_segments(old_segments, segments)
+                # Read before the flush releases the old blob
+                old_texts = await connection.run_sync(
+                    BlobStore.segment_texts, old_hash, [segment.ordinal for segment in diff.removed]
+                ) if diff.removed else {}
+                summary = await (scraper.stage or get_processing_stage()).run(
+                    summarize_changes,
+                    [(segment.heading_path, old_texts[segment.ordinal]) for segment in diff.removed],
+                    [(segment.heading_path, content[segment.start:segment.end]) for segment in diff.added],
+                    self.settings.diff_summary_max_chars,
+                )
+                
+                # ORM update so the blob and full-text index listeners see the new content
+                doc = await session.get(DocumentationTable, documentation_id)
+                doc.title = title
+                doc.set_content(content, segments)  # Also sets content_hash; the blob is stored on flush
+                doc.etag = result.etag
+                doc.last_modified = result.last_modified
+                doc.truncated = result.truncated
+                doc.scrape_status = ScrapeStatus.SUCCESS
+                doc.last_scraped = checked_at
+                doc.error_message = None
+            else:
+                await session.execute(
+                    update(DocumentationTable)
+                    .where(DocumentationTable.id == documentation_id)
+                    .values(self._unchanged_values(result.etag, result.last_modified, checked_at))
+                )
+
+            record = UpdateRecordTable(
+                id=str(uuid.uuid4()),
+                documentation_id=documentation_id,
+                old_hash=old_hash,
+                new_hash=new_hash or old_hash or "",
+                changes_detected=changed,
+                checked_at=checked_at,
+                segments_added=len(diff.added) if diff else None,
+                segments_removed=len(diff.removed) if diff else None,
+                segments_unchanged=diff.unchanged if diff else None,
+                lines_added=summary.lines_added if summary else None,
+                lines_removed=summary.lines_removed if summary else None,
+                changed_headings=json.dumps(summary.headings) if summary else None,
+                diff_summary=summary.summary if summary else None,
+            )
+            session.add(record)
+            await session.commit()
+
+        if changed and self.cache is not None:
+            # Done per check so changes found by queued jobs invalidate too
+            await self.cache.invalidate("docs")
+            await self.cache.invalidate("search")
+
+        logger.debug(
+            f"Checked documentation {documentation_id}: "
+            f"{'not modified' if result.not_modified else 'changed' if changed else 'unchanged'}"
+        )
+        return UpdateRecord(
+            id=record.id,
+            documentation_id=documentation_id,
+            old_hash=old_hash,
+            new_hash=record.new_hash,
+            changes_detected=changed,
+            checked_at=checked_at,
+            segments_added=record.segments_added,
+            segments_removed=record.segments_removed,
+            segments_unchanged=record.segments_unchanged,
+            lines_added=record.lines_added,
+            lines_removed=record.lines_removed,
+            changed_headings=summary.headings if summary else [],
+            diff_summary=record.diff_summary,
+        )
+
+    async def check_due(self, limit: Optional[int] = None) -> int:
+        """Check every document not scraped within ``doc_update_interval``. Returns changes found."""
+        checked = changes = 0
+        while limit is None or checked < limit:
+            batch = await self._due(_BATCH_SIZE if limit is None else min(_BATCH_SIZE, limit - checked))
+            if not batch:
+                break
+
+            await self._prefetch([url for _, url in batch])
+            records = await asyncio.gather(*(self.check(doc_id) for doc_id, _ in batch))
+            checked += len(batch)
+            changes += sum(1 for record in records if record is not None and record.changes_detected)
+            if len(batch) < _BATCH_SIZE:
+                break
+
+        if checked:
+            logger.info(f"Checked {checked} documents for updates, {changes} changed")
+        return changes
+
+    async def handle_job(self, job: Job) -> None:
+        """Job queue handler for ``scrape`` and ``update`` jobs."""
+        if job.documentation_id is None:
+            raise ValueError(f"Job {job.id} has no documentation to check")
+        if await self.check(job.documentation_id) is None:
+            raise RuntimeError(f"Checking documentation {job.documentation_id} failed")
+
+    async def enqueue_due(self, queue: JobQueue) -> int:
+        """Queue jobs for every document due a check. Returns jobs added."""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.settings.doc_update_interval)
+        query = select(
+            DocumentationTable.id,
+            DocumentationTable.project_id,
+            DocumentationTable.url,
+            DocumentationTable.scrape_status,
+        ).where(
+            DocumentationTable.scrape_status != ScrapeStatus.SKIPPED,
+            or_(DocumentationTable.last_scraped.is_(None), DocumentationTable.last_scraped < cutoff),
+        )
+
+        async with self.db_manager.get_session() as session:
+            due = (await session.execute(query)).all()
+
+        # Batched up front so the queued checks find their files already fetched
+        await self._prefetch([url for _, _, url, _ in due])
+
+        jobs = []
+        for doc_id, project_id, _, status in due:
+            # Never-scraped documents go ahead of routine re-checks
+            if status == ScrapeStatus.PENDING:
+                jobs.append(("scrape", project_id, doc_id, 3))
+            else:
+                jobs.append(("update", project_id, doc_id, 5))
+
+        added = await queue.enqueue_many(jobs)
+        if added:
+            logger.info(f"Queued {added} documents for update checks")
+        return added
+
+    async def run_schedule_loop(
+        self, queue: JobQueue, interval: float, on_enqueued: Optional[Callable[[], None]] = None
+    ) -> None:
+        """Queue due documents periodically until cancelled."""
+        while True:
+            try:
+                if await self.enqueue_due(queue) and on_enqueued is not None:
+                    on_enqueued()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error scheduling documentation updates: {e}")
+            await asyncio.sleep(interval)
+
+    async def _due(self, limit: int) -> List[Tuple[str, str]]:
+        cutoff = datetime.utcnow() - timedelta(seconds=self.settings.doc_update_interval)
+        query = select(DocumentationTable.id, DocumentationTable.url).where(
+            # Failed documents are retried on the same schedule
+            DocumentationTable.scrape_status.in_([ScrapeStatus.SUCCESS, ScrapeStatus.FAILED]),
+            or_(DocumentationTable.last_scraped.is_(None), DocumentationTable.last_scraped < cutoff),
+        ).order_by(DocumentationTable.last_scraped.asc().nulls_first()).limit(limit)
+
+        async with self.db_manager.get_session() as session:
+            return [tuple(row) for row in (await session.execute(query)).all()]
+
+    async def _prefetch(self, urls: List[str]) -> None:
+        """Hand each scraper the URLs it will be asked for, so it can fetch them in batches."""
+        groups: Dict[BaseScraper, List[str]] = {}
+        for url in urls:
+            scraper = await self._scraper_for(url)
+            if scraper is not None:
+                groups.setdefault(scraper, []).append(url)
+        await asyncio.gather(*(scraper.prefetch(group) for scraper, group in groups.items()))
+
+    async def _scraper_for(self, url: str) -> Optional[BaseScraper]:
+        for scraper in self.scrapers:
+            if await scraper.can_scrape(url):
+                if scraper.client is None:
+                    await scraper.start()
+                return scraper
+        return None
+
+    async def _mark_failed(self, documentation_id: str, error: str) -> None:
+        async with self.db_manager.get_session() as session:
+            await session.execute(
+                update(DocumentationTable)
+                .where(DocumentationTable.id == documentation_id)
+                .values(
+                    scrape_status=ScrapeStatus.FAILED,
+                    error_message=error,
+                    last_scraped=datetime.utcnow(),
+                )
+            )
+            await session.commit()
+
+    @staticmethod
+    def _unchanged_values(etag: Optional[str], last_modified: Optional[str], checked_at: datetime) -> Dict[str, Any]:
+        """Bookkeeping for an unchanged check; ``updated_at`` is left alone."""
+        return {
+            "etag": etag,
+            "last_modified": last_modified,
+            "last_scraped": checked_at,
+            "scrape_status": ScrapeStatus.SUCCESS,
+            "error_message": None,
+            "updated_at": DocumentationTable.updated_at,
+        }
@@ -1,6 +1,7 @@
 """Cryptocurrency-specific MCP tools."""
 
 import logging
+from datetime import datetime
 from typing import List, Optional
 
 from mcp.server.fastmcp import Context, FastMCP
@@ -8,7 +9,11 @@ from pydantic import BaseModel, Field
 
 from ..models import (
     BlockchainNetwork,
+    DocumentationField,
+    DocumentationPage,
+    DocumentationPageRequest,
     DocumentationRequest,
+    DocumentationSearchRequest,
     ProjectCategory,
     ProjectInfoRequest,
     SearchRequest,
@@ -18,6 +23,22 @@ from ..services.crypto_service import CryptoService
 
 logger = logging.getLogger(__name__)
 
+# Documentation fields each tool renders; the service loads nothing else
+PROJECT_INFO_DOC_FIELDS = [
+    DocumentationField.TITLE,
+    DocumentationField.URL,
+    DocumentationField.DOC_TYPE,
+    DocumentationField.SCRAPE_STATUS,
+    DocumentationField.LAST_SCRAPED,
+]
+# Content is read page by page rather than loaded with the listing
+DOCUMENTATION_DOC_FIELDS = [
+    DocumentationField.TITLE,
+    DocumentationField.URL,
+    DocumentationField.DOC_TYPE,
+    DocumentationField.LAST_SCRAPED,
+]
+
 
 class SearchProjectsParams(BaseModel):
     """Parameters for searching crypto projects."""
@@ -42,6 +63,18 @@ class GetDocumentationParams(BaseModel):
     project_name: str = Field(..., description="Name or symbol of the cryptocurrency project")
     doc_title: Optional[str] = Field(None, description="Specific document title to retrieve")
     format: str = Field("markdown", description="Output format (markdown, html, text)")
+    cursor: Optional[str] = Field(None, description="Cursor from a previous response to read the next page")
+    max_chars: int = Field(
+        10000, ge=500, le=100000, description="Maximum characters of content in the response, across all documents"
+    )
+
+
+class SearchDocumentationParams(BaseModel):
+    """Parameters for full-text documentation search."""
+    
+    query: str = Field(..., description="Words or phrases to look for in documentation content")
+    project_name: Optional[str] = Field(None, description="Restrict the search to one project (optional)")
+    limit: int = Field(10, ge=1, le=50, description="Maximum number of matches to return")
 
 
 class CheckUpdatesParams(BaseModel):
@@ -52,6 +85,31 @@ class CheckUpdatesParams(BaseModel):
     limit: int = Field(20, ge=1, le=100, description="Maximum number of updates to return")
 
 
+def _format_page(page: DocumentationPage, last_scraped: Optional[datetime] = None) -> str:
+    """Render one page of a document, with its continuation cursor."""
+    text = f"## {page.title}\n"
+    text += f"Source: {page.url}\n"
+    text += f"Type: {page.doc_type.value}\n"
+    if last_scraped:
+        text += f"Last Updated: {last_scraped.strftime('%Y-%m-%d %H:%M')}\n"
+    if page.section:
+        text += f"Section: {page.section}\n"
+    text += "\n"
+    
+    if page.offset:
+        text += f"### Content (from character {page.offset:,}):\n{page.content}\n"
+    else:
+        text += f"### Content:\n{page.content}\n"
+    
+    if page.next_cursor:
+        end = page.offset + len(page.content)
+        text += (
+            f"\n[Showing characters {page.offset:,}-{end:,} of {page.total_chars:,}. "
+            f"Call get_documentation with cursor=\"{page.next_cursor}\" for the next page]\n"
+        )
+    return text
+
+
 def register_crypto_tools(server: FastMCP) -> None:
     """Register cryptocurrency-specific MCP tools."""
     
@@ -68,7 +126,7 @@ def register_crypto_tools(server: FastMCP) -> None:
         try:
             # Get services from context
             lifespan_context = ctx.request_context.lifespan_context
-            crypto_service = CryptoService(lifespan_context["db_manager"])
+            crypto_service: CryptoService = lifespan_context["crypto_service"]
             
             # Convert string parameters to enums if provided
             blockchain = None
@@ -147,13 +205,14 @@ def register_crypto_tools(server: FastMCP) -> None:
         try:
             # Get services from context
             lifespan_context = ctx.request_context.lifespan_context
-            crypto_service = CryptoService(lifespan_context["db_manager"])
+            crypto_service: CryptoService = lifespan_context["crypto_service"]
             
             # Create request
             request = ProjectInfoRequest(
                 project_name=params.project_name,
                 include_documentation=params.include_documentation,
-                include_blockchain_info=params.include_blockchain_info
+                include_blockchain_info=params.include_blockchain_info,
+                documentation_fields=PROJECT_INFO_DOC_FIELDS
             )
             
             # Get project info
@@ -211,7 +270,8 @@ def register_crypto_tools(server: FastMCP) -> None:
     @server.tool(
         name="get_documentation",
         description="Retrieve actual documentation content for a cryptocurrency project. "
-                   "Returns the full text content of available documentation."
+                   "Long documents are returned a page at a time, and documents past the character budget are "
+                   "only listed; pass a returned cursor to continue."
     )
     async def get_documentation(
         params: GetDocumentationParams,
@@ -221,13 +281,23 @@ def register_crypto_tools(server: FastMCP) -> None:
         try:
             # Get services from context
             lifespan_context = ctx.request_context.lifespan_context
-            crypto_service = CryptoService(lifespan_context["db_manager"])
+            crypto_service: CryptoService = lifespan_context["crypto_service"]
+            
+            # Continue a document from a previous page
+            if params.cursor:
+                page = await crypto_service.read_documentation(
+                    DocumentationPageRequest(cursor=params.cursor, max_chars=params.max_chars)
+                )
+                if not page:
+                    return "The document for this cursor is no longer available"
+                return f"**Documentation for {page.project_name}**\n\n{_format_page(page)}".strip()
             
             # Create request
             request = DocumentationRequest(
                 project_name=params.project_name,
                 doc_title=params.doc_title,
-                format=params.format
+                format=params.format,
+                fields=DOCUMENTATION_DOC_FIELDS
             )
             
             # Get documentation
@@ -236,25 +306,26 @@ def register_crypto_tools(server: FastMCP) -> None:
             if not response or not response.documents:
                 return f"No documentation found for project '{params.project_name}'"
             
-            # Format response
+            # First pages share the character budget; documents past it are only listed
+            pages = await crypto_service.read_first_pages(
+                [doc.id for doc in response.documents], params.max_chars
+            )
+            pages_by_id = {page.documentation_id: page for page in pages}
+            
             doc_text = f"**Documentation for {response.project_name}**\n\n"
             
             for doc in response.documents:
-                doc_text += f"## {doc.title}\n"
-                doc_text += f"Source: {doc.url}\n"
-                doc_text += f"Type: {doc.doc_type.value}\n"
-                if doc.last_scraped:
-                    doc_text += f"Last Updated: {doc.last_scraped.strftime('%Y-%m-%d %H:%M')}\n"
-                doc_text += "\n"
-                
-                if doc.content:
-                    # Limit content length for display
-                    content = doc.content
-                    if len(content) > 10000:
-                        content = content[:10000] + "\n\n[Content truncated - full documentation available]"
-                    doc_text += f"### Content:\n{content}\n"
+                page = pages_by_id.get(doc.id)
+                if page is None:
+                    doc_text += f"## {doc.title}\nSource: {doc.url}\n\nContent not available or not yet scraped.\n"
+                elif not page.content and page.next_cursor:
+                    doc_text += (
+                        f"## {doc.title}\nSource: {doc.url}\n\n"
+                        f"[{page.total_chars:,} characters, not shown. "
+                        f"Call get_documentation with cursor=\"{page.next_cursor}\" to read it]\n"
+                    )
                 else:
-                    doc_text += "Content not available or not yet scraped.\n"
+                    doc_text += _format_page(page, doc.last_scraped)
                 
                 doc_text += "\n---\n\n"
             
@@ -264,6 +335,50 @@ def register_crypto_tools(server: FastMCP) -> None:
             logger.error(f"Error getting documentation: {e}")
             return f"Error retrieving documentation: {str(e)}"
     
+    @server.tool(
+        name="search_documentation",
+        description="Full-text search across scraped documentation content. "
+                   "Returns the best matching documents with highlighted snippets."
+    )
+    async def search_documentation(
+        params: SearchDocumentationParams,
+        ctx: Context
+    ) -> str:
+        """Search documentation content."""
+        try:
+            # Get services from context
+            lifespan_context = ctx.request_context.lifespan_context
+            crypto_service: CryptoService = lifespan_context["crypto_service"]
+            
+            request = DocumentationSearchRequest(
+                query=params.query,
+                project_name=params.project_name,
+                limit=params.limit
+            )
+            
+            response = await crypto_service.search_documentation(request)
+            
+            if not response.hits:
+                project_desc = f" for project '{params.project_name}'" if params.project_name else ""
+                return f"No documentation matching '{params.query}' found{project_desc}"
+            
+            # Format response
+            results_text = f"Found {response.total} documentation matches for '{params.query}':\n\n"
+            
+            for hit in response.hits:
+                results_text += f"**{hit.title}** ({hit.project_name})\n"
+                results_text += f"Source: {hit.url}\n"
+                if hit.section:
+                    results_text += f"Section: {hit.section}\n"
+                results_text += f"> {hit.snippet}\n"
+                results_text += "\n---\n\n"
+            
+            return results_text.strip()
+            
+        except Exception as e:
+            logger.error(f"Error searching documentation: {e}")
+            return f"Error searching documentation: {str(e)}"
+    
     @server.tool(
         name="check_updates",
         description="Check for recent documentation updates across projects or for a specific project. "
@@ -277,7 +392,7 @@ def register_crypto_tools(server: FastMCP) -> None:
         try:
             # Get services from context
             lifespan_context = ctx.request_context.lifespan_context
-            crypto_service = CryptoService(lifespan_context["db_manager"])
+            crypto_service: CryptoService = lifespan_context["crypto_service"]
             
             # Create request
             from datetime import datetime, timedelta
@@ -308,6 +423,17 @@ def register_crypto_tools(server: FastMCP) -> None:
                 updates_text += f"  Changes Detected: {'Yes' if update.changes_detected else 'No'}\n"
                 if update.old_hash and update.new_hash:
                     updates_text += f"  Hash: {update.old_hash[:8]}... → {update.new_hash[:8]}...\n"
+                if update.segments_added is not None:
+                    updates_text += (
+                        f"  Segments: +{update.segments_added} -{update.segments_removed}, "
+                        f"{update.segments_unchanged} unchanged\n"
+                    )
+                if update.lines_added is not None:
+                    updates_text += f"  Lines: +{update.lines_added} -{update.lines_removed}\n"
+                if update.changed_headings:
+                    updates_text += f"  Changed Sections: {', '.join(update.changed_headings)}\n"
+                if update.diff_summary:
+                    updates_text += f"  ```diff\n{update.diff_summary}\n  ```\n"
                 updates_text += "\n"
             
             return updates_text.strip()
@@ -24,7 +24,7 @@ def register_system_tools(server: FastMCP) -> None:
         try:
             # Get services from context
             lifespan_context = ctx.request_context.lifespan_context
-            crypto_service = CryptoService(lifespan_context["db_manager"])
+            crypto_service: CryptoService = lifespan_context["crypto_service"]
             
             # Get blockchain information
             blockchains = await crypto_service.get_supported_blockchains()
@@ -60,7 +60,7 @@ def register_system_tools(server: FastMCP) -> None:
         try:
             # Get services from context
             lifespan_context = ctx.request_context.lifespan_context
-            crypto_service = CryptoService(lifespan_context["db_manager"])
+            crypto_service: CryptoService = lifespan_context["crypto_service"]
             
             # Get category information
             categories = await crypto_service.get_project_categories()
@@ -107,7 +107,7 @@ def register_system_tools(server: FastMCP) -> None:
         try:
             # Get services from context
             lifespan_context = ctx.request_context.lifespan_context
-            crypto_service = CryptoService(lifespan_context["db_manager"])
+            crypto_service: CryptoService = lifespan_context["crypto_service"]
             
             # Get system statistics
             stats = await crypto_service.get_system_stats()
@@ -166,17 +166,21 @@ def register_system_tools(server: FastMCP) -> None:
    - Parameters: project_name (required), doc_title (optional), format (optional)
    - Example: get_documentation(project_name="Uniswap", format="markdown")
 
-4. **check_updates** - Check for recent documentation updates
+4. **search_documentation** - Full-text search inside documentation content
+   - Parameters: query (required), project_name (optional), limit (optional)
+   - Example: search_documentation(query="flash loan fee", project_name="Aave")
+
+5. **check_updates** - Check for recent documentation updates
    - Parameters: project_name (optional), since_days, limit
    - Example: check_updates(since_days=7, limit=10)
 
-5. **list_blockchains** - List supported blockchain networks
+6. **list_blockchains** - List supported blockchain networks
    - No parameters required
 
-6. **list_categories** - List supported project categories
+7. **list_categories** - List supported project categories
    - No parameters required
 
-7. **get_system_stats** - Get system statistics and health info
+8. **get_system_stats** - Get system statistics and health info
    - No parameters required
 
 **Supported Blockchains:**
@@ -191,6 +195,7 @@ def register_system_tools(server: FastMCP) -> None:
 - Use project names, symbols, or keywords in queries
 - Combine blockchain and category filters for precise results
 - Check documentation updates regularly for latest information
+- Use search_documentation to find a specific passage without pulling whole documents
 - Use get_documentation for full content access
 
 **Example Workflows:**
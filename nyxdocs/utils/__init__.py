@@ -1,5 +1,7 @@
 """Utility modules for NyxDocs."""
 
 from .logging import setup_logging
+from .rate_limit import TokenBucket
+from .trigram import TrigramIndex
 
-__all__ = ["setup_logging"]
+__all__ = ["setup_logging", "TokenBucket", "TrigramIndex"]
@@ -0,0 +1,239 @@
+"""BM25F ranking over fielded documents, persisted as memory-mapped arrays.
+
+Each document has a few text fields, each with its own weight and length
+normalization. Their term frequencies are combined BM25F-style, and every
+(term, document) score is computed once, at build time. The index is a
+sparse term-by-document matrix in compressed-row form. ``offsets`` bounds
+each term's row, and that row's ``postings`` (document numbers) and
+``weights`` (scores) sit side by side. Scoring a query therefore sums a few
+array slices. ``prior`` holds one query-independent value per document
+that scales the scores of documents that match.
+
+On disk, the arrays are raw native-endian files next to a JSON manifest,
+and loading maps them read-only. With NumPy installed the mapped buffers
+are viewed as arrays and summed vectorized. Without it, the same mapped
+buffers are summed in Python.
+"""
+
+import array
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - optional dependency
+    numpy = None
+
+NUMPY_AVAILABLE = numpy is not None
+
+FORMAT_VERSION = 1
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Array files and their typecodes
+_ARRAYS = {"offsets": "q", "postings": "i", "weights": "f", "prior": "f"}
+_MANIFEST = "manifest.json"
+
+
+class FieldSpec(NamedTuple):
+    """Weight and length normalization (0 = none, 1 = full) of one field."""
+
+    weight: float
+    b: float
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens of text."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class BM25Index:
+    """Read-only BM25F index over documents identified by string keys."""
+
+    def __init__(
+        self,
+        keys: List[str],
+        vocabulary: Dict[str, int],
+        arrays: Mapping[str, Any],
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        """Wrap built or mapped arrays; use :meth:`build` or :meth:`load` to get one."""
+        self.keys = keys
+        self.vocabulary = vocabulary
+        self.metadata = metadata or {}
+        self._arrays = {name: _vector(arrays[name], code) for name, code in _ARRAYS.items()}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @classmethod
+    def build(
+        cls,
+        documents: Iterable[Tuple[str, Mapping[str, Counter], float]],
+        fields: Mapping[str, FieldSpec],
+        k1: float = 1.2,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> "BM25Index":
+        """Build an index from (key, {field: term counts}, prior) documents."""
+        documents = list(documents)
+        lengths = {
+            field: [sum(terms.get(field, Counter()).values()) for _, terms, _ in documents] for field in fields
+        }
+        averages = {field: (sum(values) / len(values) if values else 0.0) for field, values in lengths.items()}
+
+        # BM25F pseudo-frequency of every term in every document
+        rows: Dict[str, List[Tuple[int, float]]] = {}
+        for number, (_, terms, _) in enumerate(documents):
+            frequencies: Dict[str, float] = {}
+            for field, spec in fields.items():
+                counts = terms.get(field)
+                if not counts or not averages[field]:
+                    continue
+                norm = 1.0 - spec.b + spec.b * lengths[field][number] / averages[field]
+                for term, count in counts.items():
+                    frequencies[term] = frequencies.get(term, 0.0) + spec.weight * count / norm
+            for term, frequency in frequencies.items():
+                rows.setdefault(term, []).append((number, frequency))
+
+        total = len(documents)
+        vocabulary: Dict[str, int] = {}
+        offsets = array.array("q", [0])
+        postings = array.array("i")
+        weights = array.array("f")
+        for term in sorted(rows):
+            row = rows[term]
+            idf = math.log(1.0 + (total - len(row) + 0.5) / (len(row) + 0.5))
+            vocabulary[term] = len(vocabulary)
+            for number, frequency in row:
+                postings.append(number)
+                weights.append(idf * frequency * (k1 + 1.0) / (k1 + frequency))
+            offsets.append(len(postings))
+
+        arrays = {
+            "offsets": offsets,
+            "postings": postings,
+            "weights": weights,
+            "prior": array.array("f", (prior for _, _, prior in documents)),
+        }
+        return cls([key for key, _, _ in documents], vocabulary, arrays, metadata)
+
+    def rank(self, query: str, limit: Optional[int] = 10, prior_weight: float = 0.0) -> List[Tuple[str, float]]:
+        """Best (key, score) matches for a query, highest first; every match if ``limit`` is None.
+
+        A document matches if it contains any query term. Its score is the
+        sum of the terms' weights, scaled by ``1 + prior_weight * prior``, so
+        the prior reorders matches of similar relevance but never makes one.
+        Ties keep build order.
+        """
+        term_ids = [self.vocabulary[term] for term in dict.fromkeys(tokenize(query)) if term in self.vocabulary]
+        if not term_ids or (limit is not None and limit <= 0):
+            return []
+
+        offsets, postings, weights, prior = (self._arrays[name] for name in _ARRAYS)
+        if NUMPY_AVAILABLE:
+            scores = numpy.zeros(len(self.keys), dtype=numpy.float32)
+            for term_id in term_ids:
+                start, end = offsets[term_id], offsets[term_id + 1]
+                # A term's postings hold each document at most once
+                scores[postings[start:end]] += weights[start:end]
+            matched = numpy.flatnonzero(scores)
+            totals = scores[matched] * (1 + numpy.float32(prior_weight) * prior[matched])
+            order = numpy.argsort(-totals, kind="stable")[:limit]
+            return [(self.keys[matched[i]], float(totals[i])) for i in order]
+
+        sums: Dict[int, float] = {}
+        for term_id in term_ids:
+            start, end = offsets[term_id], offsets[term_id + 1]
+            for number, weight in zip(postings[start:end], weights[start:end], strict=True):
+                sums[number] = sums.get(number, 0.0) + weight
+        totals = ((-score * (1 + prior_weight * prior[number]), number) for number, score in sums.items())
+        best = sorted(totals) if limit is None else heapq.nsmallest(limit, totals)
+        return [(self.keys[number], -negated) for negated, number in best]
+
+    def save(self, directory: Union[str, Path]) -> None:
+        """Write the index to a directory, replacing any index already there."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        counts = {}
+        for name, code in _ARRAYS.items():
+            values = self._arrays[name]
+            data = values.tobytes()
+            counts[name] = len(data) // array.array(code).itemsize
+            _replace(directory / f"{name}.bin", data)
+
+        # The manifest is written last; readers check the array sizes against it
+        manifest = {
+            "version": FORMAT_VERSION,
+            "byteorder": sys.byteorder,
+            "counts": counts,
+            "keys": self.keys,
+            "vocabulary": self.vocabulary,
+            "metadata": self.metadata,
+        }
+        _replace(directory / _MANIFEST, json.dumps(manifest, separators=(",", ":")).encode("utf-8"))
+
+    @classmethod
+    def load(cls, directory: Union[str, Path]) -> Optional["BM25Index"]:
+        """Map a saved index, or None if there is none or it does not match this format."""
+        directory = Path(directory)
+        try:
+            manifest = json.loads((directory / _MANIFEST).read_bytes())
+        except (OSError, ValueError):
+            return None
+        if manifest.get("version") != FORMAT_VERSION or manifest.get("byteorder") != sys.byteorder:
+            return None
+
+        arrays = {}
+        for name, code in _ARRAYS.items():
+            values = _map(directory / f"{name}.bin", code)
+            if values is None or len(values) != manifest["counts"][name]:
+                return None
+            arrays[name] = values
+        return cls(manifest["keys"], manifest["vocabulary"], arrays, manifest.get("metadata"))
+
+
+def _vector(values: Any, code: str) -> Any:
+    """View an array.array or mapped buffer as a NumPy array when NumPy is available."""
+    if NUMPY_AVAILABLE and not isinstance(values, numpy.ndarray):
+        return numpy.frombuffer(values, dtype=numpy.dtype(code))
+    return values
+
+
+def _map(path: Path, code: str) -> Optional[Union[memoryview, array.array]]:
+    """Read-only typed view of a file's bytes, memory-mapped."""
+    try:
+        with open(path, "rb") as f:
+            if not os.fstat(f.fileno()).st_size:
+                return array.array(code)
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except OSError:
+        return None
+    if len(mapped) % array.array(code).itemsize:
+        mapped.close()
+        return None
+    return memoryview(mapped).cast(code)
+
+
+def _replace(path: Path, data: bytes) -> None:
+    """Write a file through a temporary name so readers never see it half-written."""
+    temporary = path.with_name(path.name + ".tmp")
+    temporary.write_bytes(data)
+    os.replace(temporary, path)
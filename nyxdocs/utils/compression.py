@@ -0,0 +1,46 @@
+"""Text compression codecs for stored documentation."""
+
+import zlib
+from typing import Tuple
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+ZSTD_AVAILABLE = zstandard is not None
+
+CODECS = ("zstd", "zlib", "none")
+
+_ZSTD_LEVEL = 10
+_ZLIB_LEVEL = 6
+
+
+def compress_text(text: str, codec: str = "zstd") -> Tuple[str, bytes]:
+    """Compress UTF-8 text. Returns the codec actually used and the data.
+
+    ``zstd`` falls back to ``zlib`` when zstandard is not installed.
+    """
+    data = text.encode("utf-8")
+    if codec == "zstd" and not ZSTD_AVAILABLE:
+        codec = "zlib"
+    if codec == "zstd":
+        return codec, zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(data)
+    if codec == "zlib":
+        return codec, zlib.compress(data, _ZLIB_LEVEL)
+    if codec == "none":
+        return codec, data
+    raise ValueError(f"Unknown compression codec: {codec}")
+
+
+def decompress_text(codec: str, data: bytes) -> str:
+    """Inverse of :func:`compress_text`."""
+    if codec == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstd-compressed data needs the zstandard package")
+        data = zstandard.ZstdDecompressor().decompress(data)
+    elif codec == "zlib":
+        data = zlib.decompress(data)
+    elif codec != "none":
+        raise ValueError(f"Unknown compression codec: {codec}")
+    return data.decode("utf-8")
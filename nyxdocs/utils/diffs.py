@@ -0,0 +1,78 @@
+"""Compact summaries of what changed between two versions of a document.
+
+Summaries are computed at scrape time from the segment diff (see
+``utils.segments``), so only the segments that changed are compared. The
+removed and added text under each heading is diffed line by line with
+:mod:`difflib`, which catches edits that moved a segment boundary as well.
+Sections with more old and new lines than ``_MAX_MATCHED_LINES`` are not
+matched and count as wholly rewritten, which keeps the time bounded.
+Only the first ``max_chars`` of the diff are kept, but the line counts and
+headings always cover the whole change.
+"""
+
+import difflib
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+# Label for text above the first heading
+TOP_LEVEL = "(top)"
+
+# Old plus new lines of a section beyond which it is not matched line by line
+_MAX_MATCHED_LINES = 4000
+
+
+class DiffSummary(NamedTuple):
+    """Line counts, changed headings and a truncated unified diff of one change."""
+
+    lines_added: int
+    lines_removed: int
+    headings: List[str]
+    summary: str
+
+
+def summarize_changes(
+    removed: Sequence[Tuple[str, str]],
+    added: Sequence[Tuple[str, str]],
+    max_chars: int,
+) -> DiffSummary:
+    """Summarize replacing ``removed`` (heading path, text) segments with ``added`` ones."""
+    sections: Dict[str, Tuple[List[str], List[str]]] = {}
+    for heading, text in removed:
+        sections.setdefault(heading, ([], []))[0].append(text)
+    for heading, text in added:
+        sections.setdefault(heading, ([], []))[1].append(text)
+
+    lines_added = lines_removed = 0
+    headings = []
+    out: List[str] = []
+    length = 0
+    omitted = 0
+    for heading, (old, new) in sections.items():
+        changes = _changed_lines("".join(old).splitlines(), "".join(new).splitlines())
+        if not changes:
+            continue
+        headings.append(heading or TOP_LEVEL)
+        added_here = sum(1 for line in changes if line.startswith("+"))
+        lines_added += added_here
+        lines_removed += len(changes) - added_here
+
+        for line in [f"## {heading or TOP_LEVEL}", *changes]:
+            if omitted or length + len(line) + 1 > max_chars:
+                omitted += 1
+                continue
+            out.append(line)
+            length += len(line) + 1
+
+    if omitted:
+        out.append(f"[{omitted} more diff lines omitted]")
+    return DiffSummary(lines_added, lines_removed, headings, "\n".join(out))
+
+
+def _changed_lines(old: List[str], new: List[str]) -> List[str]:
+    """Removed lines prefixed ``-`` and added lines prefixed ``+``, in diff order."""
+    if len(old) + len(new) > _MAX_MATCHED_LINES:
+        return [f"-{line}" for line in old] + [f"+{line}" for line in new]
+    # File headers and hunk ranges are dropped; the heading names the hunk instead
+    return [
+        line for line in list(difflib.unified_diff(old, new, n=0, lineterm=""))[2:]
+        if not line.startswith("@@")
+    ]
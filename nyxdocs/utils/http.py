@@ -0,0 +1,309 @@
+"""Process-wide HTTP client pool shared by collectors and scrapers."""
+
+import asyncio
+import ipaddress
+import logging
+import socket
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import httpcore
+import httpx
+
+from ..config import Settings, get_settings
+
+try:
+    import h2  # noqa: F401
+except ImportError:  # pragma: no cover - optional dependency
+    HTTP2_AVAILABLE = False
+else:
+    HTTP2_AVAILABLE = True
+
+logger = logging.getLogger(__name__)
+
+
+class CachingDNSBackend(httpcore.AsyncNetworkBackend):
+    """Network backend that caches host name resolution for ``ttl`` seconds.
+
+    Connections are opened to the resolved address; TLS still verifies and
+    sends SNI for the original host name, which httpcore passes separately.
+    """
+
+    def __init__(self, ttl: float, backend: Optional[httpcore.AsyncNetworkBackend] = None) -> None:
+        """Initialize the backend."""
+        self.ttl = ttl
+        self._backend = backend or httpcore.AnyIOBackend()
+        self._cache: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[Iterable[Any]] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        """Connect to the first reachable cached address for host."""
+        addresses = await self.resolve(host, port)
+        error: Optional[Exception] = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    address, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        # Every cached address failed; resolve afresh next time
+        self._cache.pop((host, port), None)
+        raise error or httpcore.ConnectError(f"No addresses for {host}")
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: Optional[float] = None,
+        socket_options: Optional[Iterable[Any]] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        """Delegate unix socket connections unchanged."""
+        return await self._backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        """Delegate to the wrapped backend."""
+        await self._backend.sleep(seconds)
+
+    async def resolve(self, host: str, port: int) -> List[str]:
+        """Addresses for host, from cache while fresh."""
+        try:
+            ipaddress.ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+
+        now = time.monotonic()
+        cached = self._cache.get((host, port))
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise httpcore.ConnectError(f"Could not resolve {host}: {e}") from e
+
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        self._cache[(host, port)] = (now + self.ttl, addresses)
+        return addresses
+
+
+class HttpClientPool:
+    """Registry of ``httpx.AsyncClient`` instances keyed by origin.
+
+    Each scheme/host/port gets one long-lived client with its own connection
+    limits, so keep-alive connections (and HTTP/2 sessions when ``h2`` is
+    installed) are reused by every collector and scraper in the process.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None) -> None:
+        """Initialize an empty pool."""
+        self.settings = settings or get_settings()
+        self.http2 = self.settings.http2_enabled and HTTP2_AVAILABLE
+        self.dns = CachingDNSBackend(self.settings.http_dns_cache_ttl)
+        self._clients: Dict[Tuple[str, str, Optional[int]], httpx.AsyncClient] = {}
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def session(
+        self,
+        timeout: Optional[float] = None,
+        headers: Optional[Dict[str, str]] = None,
+        follow_redirects: bool = False,
+    ) -> "SharedClient":
+        """A request facade carrying one caller's defaults."""
+        return SharedClient(self, timeout, headers, follow_redirects)
+
+    def client_for(self, url: Any) -> httpx.AsyncClient:
+        """The pooled client for the URL's origin, created on first use."""
+        url = httpx.URL(url)
+        key = (url.scheme, url.host, url.port)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = self._clients[key] = httpx.AsyncClient(transport=self._transport())
+            logger.debug(f"Opened HTTP client for {url.scheme}://{url.host}")
+        return client
+
+    async def close(self) -> None:
+        """Close every pooled client."""
+        clients, self._clients = list(self._clients.values()), {}
+        await asyncio.gather(*(client.aclose() for client in clients), return_exceptions=True)
+
+    def _transport(self) -> "PooledTransport":
+        return PooledTransport(httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=self.settings.http_max_connections_per_host,
+            max_keepalive_connections=self.settings.http_max_keepalive_per_host,
+            keepalive_expiry=self.settings.http_keepalive_expiry,
+            http2=self.http2,
+            network_backend=self.dns,
+        ))
+
+
+# httpcore errors and the httpx errors they surface as, most specific first
+_EXCEPTIONS = (
+    (httpcore.ConnectTimeout, httpx.ConnectTimeout),
+    (httpcore.ReadTimeout, httpx.ReadTimeout),
+    (httpcore.WriteTimeout, httpx.WriteTimeout),
+    (httpcore.PoolTimeout, httpx.PoolTimeout),
+    (httpcore.TimeoutException, httpx.TimeoutException),
+    (httpcore.ConnectError, httpx.ConnectError),
+    (httpcore.ReadError, httpx.ReadError),
+    (httpcore.WriteError, httpx.WriteError),
+    (httpcore.NetworkError, httpx.NetworkError),
+    (httpcore.ProxyError, httpx.ProxyError),
+    (httpcore.UnsupportedProtocol, httpx.UnsupportedProtocol),
+    (httpcore.RemoteProtocolError, httpx.RemoteProtocolError),
+    (httpcore.LocalProtocolError, httpx.LocalProtocolError),
+    (httpcore.ProtocolError, httpx.ProtocolError),
+)
+
+
+@contextmanager
+def _httpx_errors(request: Optional[httpx.Request] = None) -> Iterator[None]:
+    """Re-raise httpcore errors as their httpx equivalents."""
+    try:
+        yield
+    except Exception as e:
+        for core_error, httpx_error in _EXCEPTIONS:
+            if isinstance(e, core_error):
+                raise httpx_error(str(e), request=request) from e
+        raise
+
+
+class PooledTransport(httpx.AsyncBaseTransport):
+    """httpx transport over an ``httpcore.AsyncConnectionPool`` we configure.
+
+    ``httpx.AsyncHTTPTransport`` does not let callers pick the pool's network
+    backend, which the shared DNS cache needs, so requests are handed to the
+    pool directly through public httpx and httpcore APIs.
+    """
+
+    def __init__(self, pool: httpcore.AsyncConnectionPool) -> None:
+        """Wrap a connection pool."""
+        self.pool = pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request through the pool."""
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        with _httpx_errors(request):
+            response = await self.pool.handle_async_request(core_request)
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=_ResponseStream(response.stream),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        """Close every pooled connection."""
+        await self.pool.aclose()
+
+
+class _ResponseStream(httpx.AsyncByteStream):
+    """Response body from httpcore, with its errors mapped to httpx ones."""
+
+    def __init__(self, stream: Any) -> None:
+        self._stream = stream
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        with _httpx_errors():
+            async for chunk in self._stream:
+                yield chunk
+
+    async def aclose(self) -> None:
+        if hasattr(self._stream, "aclose"):
+            await self._stream.aclose()
+
+
+class SharedClient:
+    """Borrowed view of the pool with per-caller timeout, headers and redirects.
+
+    It mirrors the parts of the ``httpx.AsyncClient`` API the collectors and
+    scrapers use, routing each request to the client for its origin. Closing
+    it is a no-op; the pool owns the connections.
+    """
+
+    def __init__(
+        self,
+        pool: HttpClientPool,
+        timeout: Optional[float] = None,
+        headers: Optional[Dict[str, str]] = None,
+        follow_redirects: bool = False,
+    ) -> None:
+        """Initialize the facade."""
+        self.pool = pool
+        self.timeout = httpx.Timeout(timeout)
+        self.headers = dict(headers or {})
+        self.follow_redirects = follow_redirects
+
+    async def request(self, method: str, url: Any, **kwargs: Any) -> httpx.Response:
+        """Send a request through the pooled client for ``url``."""
+        return await self.pool.client_for(url).request(method, url, **self._options(kwargs))
+
+    async def get(self, url: Any, **kwargs: Any) -> httpx.Response:
+        """Send a GET request."""
+        return await self.request("GET", url, **kwargs)
+
+    async def head(self, url: Any, **kwargs: Any) -> httpx.Response:
+        """Send a HEAD request."""
+        return await self.request("HEAD", url, **kwargs)
+
+    async def post(self, url: Any, **kwargs: Any) -> httpx.Response:
+        """Send a POST request."""
+        return await self.request("POST", url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: Any, **kwargs: Any) -> AsyncIterator[httpx.Response]:
+        """Stream a response body instead of reading it eagerly."""
+        async with self.pool.client_for(url).stream(method, url, **self._options(kwargs)) as response:
+            yield response
+
+    async def aclose(self) -> None:
+        """Release the facade; pooled connections stay open."""
+
+    def _options(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        headers = dict(self.headers)
+        if kwargs.get("headers"):
+            headers.update(kwargs["headers"])
+        kwargs["headers"] = headers
+        kwargs.setdefault("timeout", self.timeout)
+        kwargs.setdefault("follow_redirects", self.follow_redirects)
+        return kwargs
+
+
+_http_pool: Optional[HttpClientPool] = None
+
+
+def get_http_pool() -> HttpClientPool:
+    """Get the process-wide HTTP client pool."""
+    global _http_pool
+    if _http_pool is None:
+        _http_pool = HttpClientPool()
+    return _http_pool
+
+
+async def close_http_pool() -> None:
+    """Close and forget the process-wide HTTP client pool."""
+    global _http_pool
+    if _http_pool is not None:
+        await _http_pool.close()
+        _http_pool = None
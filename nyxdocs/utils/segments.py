@@ -0,0 +1,138 @@
+"""Heading-aware splitting of documentation text into bounded segments.
+
+Segments are contiguous and cover the text exactly, so joining them gives
+back the document. A new segment starts at every markdown heading, except
+that sections shorter than ``min_chars`` are merged into the next one.
+Sections longer than ``max_chars`` are cut on the best boundary found by
+:func:`page_end`. Each segment carries the path of headings it sits under.
+Because a segment's hash depends only on its own text, an edit changes only
+the segments it touches, and :func:`diff_segments` finds them.
+"""
+
+import hashlib
+import re
+from collections import Counter
+from typing import List, NamedTuple, Sequence, Tuple
+
+# Boundaries to end a window on, best first, with the offset of the cut within the match
+_BOUNDARIES = (("\n#", 1), ("\n\n", 2), ("\n", 1), (" ", 1))
+
+_HEADING_RE = re.compile(r"(#{1,6})[ \t]+(.+?)[ \t#]*$")
+
+HEADING_SEPARATOR = " > "
+
+
+class Segment(NamedTuple):
+    """One segment of a document: text ``[start, end)`` under ``heading_path``."""
+
+    ordinal: int
+    heading_path: str
+    start: int
+    end: int
+    segment_hash: str
+
+
+class SegmentDiff(NamedTuple):
+    """Segments only in the new version, segments only in the old one, and the count of shared ones."""
+
+    added: List[Segment]
+    removed: List[Segment]
+    unchanged: int
+
+
+def page_end(text: str, start: int, max_chars: int) -> int:
+    """End offset of a window of at most ``max_chars`` starting at ``start``.
+
+    The window ends before a heading, after a blank line, or at a line or
+    word break, whichever comes first in that order of preference within
+    the second half of the window; otherwise it is cut at ``max_chars``.
+    """
+    limit = start + max_chars
+    if limit >= len(text):
+        return len(text)
+
+    # Only cut early on a boundary in the second half of the window
+    floor = start + max_chars // 2
+    for separator, cut in _BOUNDARIES:
+        found = text.rfind(separator, floor, limit + len(separator) - cut)
+        if found != -1:
+            return found + cut
+    return limit
+
+
+def segment_hash(text: str) -> str:
+    """SHA-256 of one segment's text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def split_segments(text: str, max_chars: int, min_chars: int = 0) -> List[Segment]:
+    """Split ``text`` into heading-aware segments of at most ``max_chars``."""
+    if not text:
+        return []
+
+    spans: List[Tuple[int, int, str]] = []
+    for start, end, path in _merge_short(_sections(text), min_chars, max_chars):
+        while end - start > max_chars:
+            cut = page_end(text, start, max_chars)
+            spans.append((start, cut, path))
+            start = cut
+        spans.append((start, end, path))
+
+    return [
+        Segment(ordinal, path, start, end, segment_hash(text[start:end]))
+        for ordinal, (start, end, path) in enumerate(spans)
+    ]
+
+
+def diff_segments(old: Sequence[Segment], new: Sequence[Segment]) -> SegmentDiff:
+    """Match two versions of a document's segments by hash, ignoring where they moved."""
+    unmatched = Counter(segment.segment_hash for segment in old)
+    added = []
+    for segment in new:
+        if unmatched[segment.segment_hash] > 0:
+            unmatched[segment.segment_hash] -= 1
+        else:
+            added.append(segment)
+
+    removed = []
+    for segment in old:
+        if unmatched[segment.segment_hash] > 0:
+            unmatched[segment.segment_hash] -= 1
+            removed.append(segment)
+    return SegmentDiff(added, removed, len(new) - len(added))
+
+
+def _sections(text: str) -> List[Tuple[int, int, str]]:
+    """(start, end, heading path) of each run of text between headings."""
+    sections = []
+    headings: List[Tuple[int, str]] = []  # (level, title) of the enclosing headings
+    start = 0
+    path = ""
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        match = _HEADING_RE.match(line.rstrip("\r\n")) if line.startswith("#") else None
+        if match:
+            if offset > start:
+                sections.append((start, offset, path))
+            level = len(match.group(1))
+            while headings and headings[-1][0] >= level:
+                headings.pop()
+            headings.append((level, match.group(2)))
+            path = HEADING_SEPARATOR.join(title for _, title in headings)
+            start = offset
+        offset += len(line)
+    sections.append((start, len(text), path))
+    return sections
+
+
+def _merge_short(sections: List[Tuple[int, int, str]], min_chars: int, max_chars: int) -> List[Tuple[int, int, str]]:
+    """Fold sections shorter than ``min_chars`` into the section after them."""
+    merged: List[Tuple[int, int, str]] = []
+    for start, end, path in sections:
+        if merged:
+            previous_start, previous_end, previous_path = merged[-1]
+            if previous_end - previous_start < min_chars and end - previous_start <= max_chars:
+                merged[-1] = (previous_start, end, previous_path)
+                continue
+        merged.append((start, end, path))
+    return merged
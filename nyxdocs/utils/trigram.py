@@ -0,0 +1,88 @@
+"""In-process trigram index for fuzzy name matching."""
+
+import re
+from collections import Counter, defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """Split text into trigrams the same way PostgreSQL's pg_trgm does.
+
+    Each lower-cased word is padded with two leading and one trailing space,
+    so short words and word starts still produce useful grams.
+    """
+    grams: Set[str] = set()
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+class TrigramIndex:
+    """Inverted index from trigrams to keys, scored by trigram similarity."""
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._grams: Dict[str, FrozenSet[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._grams)
+
+    def add(self, key: str, text: str) -> None:
+        """Index text under key, replacing any previous entry for the key."""
+        self.discard(key)
+        grams = trigrams(text)
+        if not grams:
+            return
+        self._grams[key] = grams
+        for gram in grams:
+            self._postings[gram].add(key)
+
+    def update(self, entries: Iterable[Tuple[str, str]]) -> None:
+        """Index many (key, text) pairs."""
+        for key, text in entries:
+            self.add(key, text)
+
+    def discard(self, key: str) -> None:
+        """Remove a key from the index if present."""
+        grams = self._grams.pop(key, None)
+        if not grams:
+            return
+        for gram in grams:
+            keys = self._postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[gram]
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._postings.clear()
+        self._grams.clear()
+
+    def search(self, text: str, threshold: float = 0.3, limit: int = 10) -> List[Tuple[str, float]]:
+        """Return up to ``limit`` (key, similarity) pairs, best first.
+
+        Similarity is shared trigrams over the union of both trigram sets,
+        matching pg_trgm's ``similarity()``. Ties are broken by key so results
+        are deterministic.
+        """
+        query = trigrams(text)
+        if not query:
+            return []
+
+        shared: Counter[str] = Counter()
+        for gram in query:
+            shared.update(self._postings.get(gram, ()))
+
+        scored = []
+        for key, common in shared.items():
+            score = common / (len(query) + len(self._grams[key]) - common)
+            if score >= threshold:
+                scored.append((key, score))
+
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
@@ -0,0 +1,16 @@
+"""Shared fixtures for NyxnDocs tests."""
+
+import pytest
+
+from nyxdocs.database.session import DatabaseManager
+
+
+@pytest.fixture
+async def db_manager():
+    """An initialized in-memory SQLite database."""
+    manager = DatabaseManager("sqlite:///:memory:")
+    await manager.initialize()
+    try:
+        yield manager
+    finally:
+        await manager.close()
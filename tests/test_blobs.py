@@ -0,0 +1,131 @@
+"""Tests for content-addressed documentation storage."""
+
+import sqlite3
+
+from sqlalchemy import inspect, select
+
+from nyxdocs.database.blobs import BlobStore
+from nyxdocs.database.fulltext import FullTextIndex
+from nyxdocs.database.models import DocumentationTable, DocumentBlobTable, ProjectTable
+from nyxdocs.database.session import DatabaseManager
+from nyxdocs.models import (
+    DocumentationRequest,
+    DocumentationType,
+    ProjectInfoRequest,
+    ScrapeStatus,
+)
+from nyxdocs.services.crypto_service import CryptoService
+
+README = "# Protocol\n\n" + "Deposit assets to earn interest and borrow against them.\n" * 200
+
+
+def _doc(doc_id, project_id, url, content):
+    return DocumentationTable(
+        id=doc_id, project_id=project_id, title="README", url=url,
+        doc_type=DocumentationType.GITHUB, scrape_status=ScrapeStatus.SUCCESS, content=content,
+    )
+
+
+async def _stats(db_manager):
+    async with db_manager.get_session() as session:
+        connection = await session.connection()
+        return await connection.run_sync(BlobStore.stats)
+
+
+async def _all_blobs(db_manager):
+    async with db_manager.get_session() as session:
+        return (await session.scalars(select(DocumentBlobTable))).all()
+
+
+async def test_identical_documents_share_one_compressed_blob(db_manager):
+    """Mirrored text is stored once, compressed, and freed with its last reference."""
+    async with db_manager.get_session() as session:
+        session.add_all([ProjectTable(id="aave", name="Aave"), ProjectTable(id="fork", name="Fork")])
+        session.add_all([
+            _doc("aave-readme", "aave", "https://github.com/aave/protocol", README),
+            _doc("fork-readme", "fork", "https://github.com/fork/protocol", README),
+        ])
+        await session.commit()
+
+    stats = await _stats(db_manager)
+    assert (stats["blobs"], stats["references"], stats["text_chars"]) == (1, 2, len(README))
+    assert stats["stored_bytes"] * 10 < stats["text_chars"]
+
+    async with db_manager.get_session() as session:
+        fork = await session.get(DocumentationTable, "fork-readme")
+        fork.content = README + "\nForked with a lower fee."
+        await session.commit()
+
+    blobs = {blob.content_hash: blob.refcount for blob in await _all_blobs(db_manager)}
+    assert sorted(blobs.values()) == [1, 1]
+
+    service = CryptoService(db_manager)
+    docs = await service.get_documentation(DocumentationRequest(project_name="Fork"))
+    assert docs.documents[0].content.endswith("Forked with a lower fee.")
+    info = await service.get_project_info(ProjectInfoRequest(project_name="Aave"))
+    assert info.documentation[0].content is None
+
+    async with db_manager.get_session() as session:
+        for doc_id in ("aave-readme", "fork-readme"):
+            await session.delete(await session.get(DocumentationTable, doc_id))
+        await session.commit()
+
+    assert await _all_blobs(db_manager) == []
+
+
+async def test_legacy_inline_content_is_moved_into_blobs(tmp_path):
+    """A database from before blob storage is upgraded in place on startup."""
+    path = tmp_path / "legacy.db"
+    with sqlite3.connect(path) as legacy:
+        legacy.executescript("""
+            CREATE TABLE projects (
+                id VARCHAR PRIMARY KEY, name VARCHAR NOT NULL, symbol VARCHAR, blockchain VARCHAR,
+                category VARCHAR, description TEXT, website VARCHAR, github_repo VARCHAR,
+                market_cap FLOAT, status VARCHAR, created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL
+            );
+            CREATE TABLE documentation (
+                id VARCHAR PRIMARY KEY, project_id VARCHAR NOT NULL REFERENCES projects (id),
+                title VARCHAR NOT NULL, url VARCHAR NOT NULL, doc_type VARCHAR NOT NULL,
+                content TEXT, content_hash VARCHAR, scrape_status VARCHAR, last_scraped DATETIME,
+                error_message TEXT, created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL
+            );
+            INSERT INTO projects (id, name, status, created_at, updated_at)
+                VALUES ('aave', 'Aave', 'ACTIVE', '2024-01-01', '2024-01-01');
+        """)
+        legacy.executemany(
+            "INSERT INTO documentation (id, project_id, title, url, doc_type, content, content_hash, "
+            "scrape_status, created_at, updated_at) VALUES (?, 'aave', 'README', ?, 'GITHUB', ?, ?, "
+            "'SUCCESS', '2024-01-01', '2024-01-01')",
+            [
+                ("readme", "https://github.com/aave/protocol", README, "legacy-hash"),
+                ("mirror", "https://github.com/aave/mirror", README, "legacy-hash"),
+                ("pending", "https://github.com/aave/pending", None, "stale-hash"),
+            ],
+        )
+
+    db_manager = DatabaseManager(f"sqlite:///{path}")
+    await db_manager.initialize()
+    try:
+        async with db_manager.get_session() as session:
+            connection = await session.connection()
+            columns = await connection.run_sync(
+                lambda sync: {column["name"] for column in inspect(sync).get_columns("documentation")}
+            )
+            assert "content" not in columns and {"etag", "truncated"} <= columns
+            assert await connection.run_sync(lambda sync: FullTextIndex.search(sync, "borrow"))
+
+            hashes = dict((await session.execute(select(DocumentationTable.id, DocumentationTable.content_hash))).all())
+            assert hashes["pending"] is None and hashes["readme"] == hashes["mirror"] != "legacy-hash"
+
+        docs = await CryptoService(db_manager).get_documentation(DocumentationRequest(project_name="Aave"))
+        assert [doc.content for doc in docs.documents] == [README, README]
+
+        stats = await _stats(db_manager)
+        assert (stats["blobs"], stats["references"], stats["text_chars"]) == (1, 2, len(README))
+    finally:
+        await db_manager.close()
+
+    # Upgrading is a no-op once done
+    db_manager = DatabaseManager(f"sqlite:///{path}")
+    await db_manager.initialize()
+    await db_manager.close()
@@ -0,0 +1,71 @@
+"""Tests for the two-tier response cache."""
+
+import asyncio
+
+from nyxdocs.models import SearchRequest, SearchResponse
+from nyxdocs.services.cache import ResponseCache
+
+
+async def test_single_flight_and_persistent_tier(db_manager):
+    """Concurrent misses share one load, and a fresh process reads the table tier."""
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return SearchResponse(results=[], total=0, query="uniswap")
+
+    cache = ResponseCache(db_manager)
+    key = cache.make_key("search", "search_projects", SearchRequest(query="uniswap"))
+    results = await asyncio.gather(*[
+        cache.get_or_load("search", key, loader, SearchResponse) for _ in range(5)
+    ])
+    assert calls == 1
+    assert all(result.query == "uniswap" for result in results)
+
+    restarted = ResponseCache(db_manager)
+    assert (await restarted.get_or_load("search", key, loader, SearchResponse)).query == "uniswap"
+    assert calls == 1
+
+    await restarted.invalidate("search")
+    await restarted.get_or_load("search", key, loader, SearchResponse)
+    assert calls == 2
+
+
+async def test_lru_bounds(db_manager):
+    """The memory tier evicts least recently used entries beyond its limits."""
+    cache = ResponseCache(db_manager)
+    cache.max_entries = 2
+
+    async def load(value):
+        return value
+
+    for name in ("a", "b", "c"):
+        await cache.get_or_load("projects", f"projects:{name}", lambda n=name: load(n), str)
+
+    assert list(cache._entries) == ["projects:b", "projects:c"]
+
+
+async def test_cancelled_leader_hands_the_load_to_a_waiter(db_manager):
+    """Cancelling the request doing the load does not fail the requests waiting on it."""
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return SearchResponse(results=[], total=0, query="aave")
+
+    cache = ResponseCache(db_manager)
+    key = cache.make_key("search", "search_projects", SearchRequest(query="aave"))
+    leader = asyncio.create_task(cache.get_or_load("search", key, loader, SearchResponse))
+    await asyncio.sleep(0.01)
+    waiters = [asyncio.create_task(cache.get_or_load("search", key, loader, SearchResponse)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    results = await asyncio.gather(*waiters)
+    assert leader.cancelled()
+    assert [result.query for result in results] == ["aave"] * 3
+    assert calls == 2
@@ -0,0 +1,233 @@
+"""Tests for data collectors."""
+
+import asyncio
+import json
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+from sqlalchemy.orm import selectinload
+
+from nyxdocs.collectors import CoinGeckoCollector, GitHubCollector, GitHubGraphQLFetcher
+from nyxdocs.config import Settings, get_settings
+from nyxdocs.database.models import DocumentationTable, DocumentBlobTable, ProjectTable
+from nyxdocs.models import DocumentationType, ScrapeStatus
+from nyxdocs.scrapers import GitHubScraper
+from nyxdocs.services.update_service import DocumentationUpdater
+from nyxdocs.utils.rate_limit import TokenBucket, parse_retry_after
+
+
+def _markets_page(page, per_page):
+    start = (page - 1) * per_page
+    return [
+        {"id": f"coin-{i}", "name": f"Coin {i}", "symbol": f"c{i}", "market_cap": 1000 - i}
+        for i in range(start, start + per_page)
+    ]
+
+
+async def test_token_bucket_burst_and_pause():
+    """The burst is served immediately and a pause holds every caller."""
+    bucket = TokenBucket(rate_per_minute=60 * 100, burst=3)
+
+    started = time.monotonic()
+    await asyncio.gather(*[bucket.acquire() for _ in range(3)])
+    assert time.monotonic() - started < 0.05
+
+    bucket.pause(0.1)
+    started = time.monotonic()
+    await bucket.acquire()
+    assert time.monotonic() - started >= 0.09
+
+
+def test_parse_retry_after():
+    """Retry-After is accepted as seconds or an HTTP date."""
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+
+
+async def test_coingecko_pages_retry_only_failures(monkeypatch):
+    """Throttled and failing pages are retried alone; the rest stream through."""
+    attempts = {}
+
+    def handler(request):
+        page = int(request.url.params["page"])
+        per_page = int(request.url.params["per_page"])
+        attempts[page] = attempts.get(page, 0) + 1
+        if page == 2 and attempts[page] == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        if page == 3 and attempts[page] < 3:
+            return httpx.Response(500)
+        return httpx.Response(200, json=_markets_page(page, per_page))
+
+    collector = CoinGeckoCollector()
+    monkeypatch.setattr(collector.settings, "retry_delay", 0)
+    collector.rate_limiter = TokenBucket(rate_per_minute=60 * 1000, burst=10)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    collector.client = client
+    monkeypatch.setattr(CoinGeckoCollector, "MAX_PER_PAGE", 4)
+
+    try:
+        projects = [project async for project in collector.iter_projects(limit=14)]
+    finally:
+        await client.aclose()
+
+    assert sorted(p["id"] for p in projects) == sorted(f"coin-{i}" for i in range(14))
+    assert attempts == {1: 1, 2: 2, 3: 3, 4: 1}
+
+
+class _GraphQLStub(BaseHTTPRequestHandler):
+    """Answers repository batches, failing any batch larger than four."""
+
+    protocol_version = "HTTP/1.1"
+    remaining = 206
+    batches = []
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        variables = payload["variables"]
+        paths = re.findall(r'(p\d+): object\(expression: "HEAD:([^"]+)"\)', payload["query"])
+        count = len(variables) // 2
+        type(self).batches.append(count)
+        if count > 4:
+            return self._reply(502, {"message": "timeout"})
+
+        type(self).remaining -= count
+        data = {"rateLimit": {
+            "cost": count,
+            "remaining": self.remaining,
+            "resetAt": datetime.now(timezone.utc).isoformat(),
+        }}
+        if self.remaining <= 200:
+            # The window resets before the next query
+            type(self).remaining = 5000
+
+        for i in range(count):
+            owner, name = variables[f"o{i}"], variables[f"n{i}"]
+            if name == "missing":
+                data[f"r{i}"] = None
+                continue
+            data[f"r{i}"] = {
+                "databaseId": i, "name": name, "nameWithOwner": f"{owner}/{name}",
+                "description": "DeFi protocol", "url": f"https://github.com/{owner}/{name}",
+                "stargazerCount": 10, "isArchived": False, "primaryLanguage": {"name": "Solidity"},
+                "repositoryTopics": {"nodes": [{"topic": {"name": "defi"}}]},
+                "defaultBranchRef": {"name": "main", "target": {"oid": "abc"}},
+            }
+            for alias, path in paths:
+                data[f"r{i}"][alias] = self._object(name, path)
+        self._reply(200, {"data": data})
+
+    @staticmethod
+    def _object(name, path):
+        if path == "README.md":
+            return {"text": f"# {name}\n\nREADME of {name}.", "isBinary": False}
+        if path == "docs":
+            return {"entries": [
+                {"path": "docs/guide.md", "type": "blob", "object": {"text": f"Guide to {name}.", "isBinary": False}},
+                {"path": "docs/logo.png", "type": "blob", "object": {"text": None, "isBinary": True}},
+                {"path": "docs/api", "type": "tree", "object": {}},
+            ]}
+        return None
+
+    def _reply(self, status, body):
+        encoded = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def graphql_server():
+    _GraphQLStub.remaining = 206
+    _GraphQLStub.batches = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _GraphQLStub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/graphql"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+async def test_graphql_batches_adapt_to_failures_and_budget(graphql_server):
+    """Oversized batches are halved and the budget caps batch size until reset."""
+    settings = Settings(github_graphql_batch_size=8, github_graphql_max_batch=8, github_graphql_reserve=200)
+    fetcher = GitHubGraphQLFetcher(settings, endpoint=graphql_server)
+    fetcher.client = httpx.AsyncClient()
+    names = [f"org/repo-{i}" for i in range(9)] + ["org/missing"]
+
+    try:
+        bundles = await fetcher.fetch_all(names)
+    finally:
+        await fetcher.client.aclose()
+
+    assert _GraphQLStub.batches == [8, 4, 2, 1, 2, 1]
+    assert sorted(bundles) == sorted(name for name in names if name != "org/missing")
+    assert bundles["org/repo-0"].repo["language"] == "Solidity"
+
+
+async def test_github_details_are_batched_through_graphql(graphql_server, monkeypatch):
+    """With a token, repository details for a chunk of ids come from one query."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "github_token", "token")
+    monkeypatch.setattr(settings, "github_graphql_url", graphql_server)
+
+    async with GitHubCollector() as collector:
+        details = await collector.get_projects_details(["org/swap", "org/missing", "org/lend"])
+
+    assert _GraphQLStub.batches == [3]
+    assert details["org/missing"] is None
+    assert details["org/swap"]["external_id"] == "org/swap"
+    assert details["org/lend"]["github_repo"] == "https://github.com/org/lend"
+
+
+async def test_update_checks_read_github_files_through_graphql(db_manager, graphql_server, monkeypatch):
+    """Due GitHub files come from one batched query; only unreadable blobs are downloaded."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "github_token", "token")
+    monkeypatch.setattr(settings, "github_graphql_url", graphql_server)
+    files = [("swap", "README.md"), ("swap", "docs/guide.md"), ("lend", "main/README.md"), ("lend", "docs/logo.png")]
+    async with db_manager.get_session() as session:
+        session.add(ProjectTable(id="org", name="Org"))
+        session.add_all([
+            DocumentationTable(
+                id=f"{repo}-{path}", project_id="org", title=path, doc_type=DocumentationType.GITHUB,
+                url=f"https://raw.githubusercontent.com/org/{repo}/{'' if path.startswith('main/') else 'HEAD/'}{path}",
+                scrape_status=ScrapeStatus.SUCCESS,
+            )
+            for repo, path in files
+        ])
+        await session.commit()
+
+    downloads = []
+
+    def handler(request):
+        downloads.append(str(request.url))
+        return httpx.Response(200, text="Logo", headers={"Content-Type": "text/plain"})
+
+    scraper = GitHubScraper()
+    scraper.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        assert await DocumentationUpdater(db_manager, scrapers=[scraper]).check_due() == 4
+    finally:
+        await scraper.client.aclose()
+
+    assert _GraphQLStub.batches == [2]
+    assert downloads == ["https://raw.githubusercontent.com/org/lend/HEAD/docs/logo.png"]
+    async with db_manager.get_session() as session:
+        guide = await session.get(DocumentationTable, "swap-docs/guide.md", options=[
+            selectinload(DocumentationTable.blob).selectinload(DocumentBlobTable.segments)
+        ])
+        assert guide.content == "Guide to swap."
@@ -0,0 +1,75 @@
+"""Tests for the shared HTTP client pool."""
+
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from nyxdocs.utils.http import HttpClientPool
+
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps({
+            "port": self.client_address[1],
+            "agent": self.headers.get("User-Agent"),
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def echo_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _EchoHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://localhost:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+async def test_sessions_share_keepalive_connections(echo_server):
+    """Two borrowers of the pool reuse one connection and keep their own headers."""
+    pool = HttpClientPool()
+    collector = pool.session(timeout=5, headers={"User-Agent": "collector"})
+    scraper = pool.session(timeout=5, headers={"User-Agent": "scraper"}, follow_redirects=True)
+
+    try:
+        first = (await collector.get(f"{echo_server}/a")).json()
+        second = (await scraper.get(f"{echo_server}/b")).json()
+        async with collector.stream("GET", f"{echo_server}/c") as response:
+            await response.aread()
+            third = response.json()
+    finally:
+        await pool.close()
+
+    assert first["port"] == second["port"] == third["port"]
+    assert (first["agent"], second["agent"]) == ("collector", "scraper")
+    assert len(pool.dns._cache) == 1
+
+
+async def test_transport_errors_surface_as_httpx_errors():
+    """Connection failures raise the httpx exceptions callers already catch."""
+    with socket.socket() as unused:
+        unused.bind(("127.0.0.1", 0))
+        closed = f"http://127.0.0.1:{unused.getsockname()[1]}/"
+
+    pool = HttpClientPool()
+    try:
+        with pytest.raises(httpx.ConnectError):
+            await pool.session(timeout=5).get(closed)
+    finally:
+        await pool.close()
@@ -0,0 +1,143 @@
+"""Tests for bulk project ingestion."""
+
+from sqlalchemy import select
+from sqlalchemy.orm import undefer
+
+from nyxdocs.collectors.base import BaseCollector
+from nyxdocs.database.models import ProjectTable
+from nyxdocs.models import BlockchainNetwork, ProjectCategory
+from nyxdocs.services.enrichment import ProjectEnricher
+from nyxdocs.services.ingestion import ProjectIngestor
+
+
+def _coin(coin_id, name, market_cap, **extra):
+    project = {
+        "id": coin_id,
+        "name": name,
+        "symbol": coin_id[:3].upper(),
+        "blockchain": BlockchainNetwork.ETHEREUM,
+        "category": ProjectCategory.DEFI,
+        "description": None,
+        "website": None,
+        "github_repo": None,
+        "market_cap": market_cap,
+        "status": "active",
+        "source": "coingecko",
+    }
+    project.update(extra)
+    return project
+
+
+async def _rows(db_manager):
+    async with db_manager.get_session() as session:
+        result = await session.scalars(
+            select(ProjectTable).options(undefer(ProjectTable.description)).order_by(ProjectTable.id)
+        )
+        return {row.id: row for row in result.all()}
+
+
+async def test_upsert_counts_and_skips_unchanged(db_manager):
+    """Rows are inserted, updated or left alone depending on material changes."""
+    ingestor = ProjectIngestor(db_manager, chunk_size=2)
+
+    stats = await ingestor.upsert_projects([
+        _coin("uniswap", "Uniswap", 5e9, website="https://uniswap.org"),
+        _coin("aave", "Aave", 2e9),
+        _coin("curve", "Curve", 1e9),
+        _coin("bitcoin", "Bitcoin", 1e12, blockchain=None),
+    ])
+    assert (stats.inserted, stats.updated, stats.unchanged) == (4, 0, 0)
+    before = await _rows(db_manager)
+
+    async def stream():
+        # A missing website keeps the stored one; a tiny market cap move is noise
+        yield _coin("uniswap", "Uniswap", 5.001e9)
+        yield _coin("aave", "Aave", 3e9)
+        yield _coin("curve", "Curve", 1e9, description="Stablecoin AMM")
+        yield _coin("bitcoin", "Bitcoin", 2e12, blockchain=None)
+        yield {"name": "missing id"}
+
+    stats = await ingestor.upsert_projects(stream())
+    assert (stats.inserted, stats.updated, stats.unchanged, stats.skipped) == (0, 3, 1, 1)
+
+    after = await _rows(db_manager)
+    assert len(after) == 4
+    assert after["uniswap"].website == "https://uniswap.org"
+    assert after["uniswap"].market_cap == 5e9
+    assert after["uniswap"].updated_at == before["uniswap"].updated_at
+    assert after["aave"].market_cap == 3e9
+    assert after["curve"].description == "Stablecoin AMM"
+    assert after["bitcoin"].market_cap == 2e12
+
+
+async def test_upsert_without_on_conflict_updates_row_by_row(db_manager, monkeypatch):
+    """Dialects without ON CONFLICT insert new rows and update existing ones by id."""
+    ingestor = ProjectIngestor(db_manager)
+    await ingestor.upsert_projects([_coin("aave", "Aave", 2e9)])
+
+    monkeypatch.setattr(ProjectIngestor, "_upsert_statement", lambda self, session, rows: None)
+    stats = await ingestor.upsert_projects([
+        _coin("aave", "Aave", 3e9, website="https://aave.com"),
+        _coin("curve", "Curve", 1e9),
+    ])
+    assert (stats.inserted, stats.updated) == (1, 1)
+
+    rows = await _rows(db_manager)
+    assert list(rows) == ["aave", "curve"]
+    assert (rows["aave"].market_cap, rows["aave"].website) == (3e9, "https://aave.com")
+    assert rows["curve"].market_cap == 1e9
+
+
+async def test_upsert_matches_existing_name_and_blockchain(db_manager):
+    """A different source id for the same name/blockchain updates the stored row."""
+    ingestor = ProjectIngestor(db_manager)
+    await ingestor.upsert_projects([_coin("uniswap", "Uniswap", 5e9)])
+
+    stats = await ingestor.upsert_projects([
+        _coin("github-1", "Uniswap", None, github_repo="https://github.com/Uniswap/v3-core"),
+    ])
+    assert (stats.inserted, stats.updated) == (0, 1)
+
+    rows = await _rows(db_manager)
+    assert list(rows) == ["uniswap"]
+    assert rows["uniswap"].github_repo == "https://github.com/Uniswap/v3-core"
+    assert rows["uniswap"].market_cap == 5e9
+
+
+class _DetailCollector(BaseCollector):
+    """Stands in for CoinGeckoCollector.get_project_details."""
+
+    def __init__(self):
+        super().__init__("Detail")
+        self.requested = []
+
+    async def collect_projects(self, limit=100):
+        return []
+
+    async def get_project_details(self, project_id):
+        self.requested.append(project_id)
+        if project_id == "delisted":
+            return None
+        return _coin(project_id, project_id.title(), None, website=f"https://{project_id}.org")
+
+
+async def test_enrichment_fills_links_and_respects_freshness(db_manager):
+    """Details are written in bulk and fresh projects are not fetched again."""
+    ingestor = ProjectIngestor(db_manager)
+    await ingestor.upsert_projects([_coin("aave", "Aave", 2e9), _coin("curve", "Curve", 1e9)])
+
+    collector = _DetailCollector()
+    enricher = ProjectEnricher(db_manager, collector, ingestor)
+    stats = await enricher.enrich(await enricher.stale_project_ids())
+    assert (stats.updated, stats.skipped) == (2, 0)
+    assert collector.requested == ["aave", "curve"]
+
+    rows = await _rows(db_manager)
+    assert rows["aave"].website == "https://aave.org"
+    assert rows["aave"].market_cap == 2e9
+    assert rows["aave"].enriched_at is not None
+
+    stats = await enricher.enrich(["aave", "delisted"])
+    assert (stats.updated, stats.skipped) == (0, 2)
+    assert collector.requested == ["aave", "curve", "delisted"]
+    assert await enricher.stale_project_ids() == []
@@ -0,0 +1,77 @@
+"""Tests for the persistent job queue."""
+
+import asyncio
+
+from nyxdocs.database.models import ProjectTable
+from nyxdocs.services.job_queue import (
+    JOB_COMPLETED,
+    JOB_FAILED,
+    JOB_PENDING,
+    JobQueue,
+    WorkerPool,
+)
+
+
+async def _queue(db_manager, monkeypatch):
+    async with db_manager.get_session() as session:
+        session.add(ProjectTable(id="aave", name="Aave"))
+        await session.commit()
+    queue = JobQueue(db_manager)
+    monkeypatch.setattr(queue.settings, "retry_delay", 0)
+    return queue
+
+
+async def test_claim_order_retry_and_reclaim(db_manager, monkeypatch):
+    """Jobs are claimed once in priority order, retried, and reclaimed when stuck."""
+    queue = await _queue(db_manager, monkeypatch)
+
+    routine = await queue.enqueue("update", "aave", "doc-1", priority=5)
+    urgent = await queue.enqueue("scrape", "aave", "doc-2", priority=1)
+    assert await queue.enqueue("update", "aave", "doc-1") == routine
+    await queue.enqueue("update", "aave", "doc-3", delay=3600)
+
+    claimed = await queue.claim(limit=5)
+    assert [job.id for job in claimed] == [urgent, routine]
+    assert await queue.claim(limit=5) == []
+
+    job = claimed[0]
+    job.max_retries = 1
+    assert await queue.fail(job, "timeout") is True
+    [retried] = await queue.claim()
+    assert (retried.id, retried.retry_count) == (urgent, 1)
+    retried.max_retries = 1
+    assert await queue.fail(retried, "timeout again") is False
+
+    assert await queue.reclaim_stale(timeout=0) == 1
+    [reclaimed] = await queue.claim()
+    assert (reclaimed.id, reclaimed.retry_count) == (routine, 1)
+    # The worker that lost the job to the reclaim cannot overwrite the new claim
+    assert await queue.complete(claimed[1]) is False
+    assert await queue.fail(claimed[1], "late failure") is False
+    assert await queue.complete(reclaimed) is True
+
+    assert await queue.counts() == {JOB_COMPLETED: 1, JOB_FAILED: 1, JOB_PENDING: 1}
+
+
+async def test_worker_pool_bounds_concurrency(db_manager, monkeypatch):
+    """The pool runs every due job without exceeding its concurrency."""
+    queue = await _queue(db_manager, monkeypatch)
+    added = await queue.enqueue_many([("update", "aave", f"doc-{i}", 5) for i in range(7)])
+    assert added == 7
+    assert await queue.enqueue_many([("update", "aave", "doc-0", 5)]) == 0
+
+    running = peak = 0
+    seen = []
+
+    async def handler(job):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        seen.append(job.documentation_id)
+
+    await WorkerPool(queue, {"update": handler}, concurrency=3).run_until_empty()
+    assert sorted(seen) == sorted(f"doc-{i}" for i in range(7))
+    assert peak == 3
+    assert await queue.counts() == {JOB_COMPLETED: 7}
@@ -0,0 +1,101 @@
+"""Tests for paginated documentation reads."""
+
+import base64
+
+import pytest
+
+from nyxdocs.database.blobs import BlobStore
+from nyxdocs.database.models import DocumentationTable, ProjectTable
+from nyxdocs.models import DocumentationPageRequest, DocumentationType, ScrapeStatus
+from nyxdocs.services.crypto_service import CryptoService
+from nyxdocs.services.paging import InvalidCursor
+
+GUIDE = "\n\n".join(
+    f"## Section {section}\n" + "\n".join(f"Step {section}.{step}: supply collateral and borrow." for step in range(6))
+    for section in range(12)
+)
+
+
+async def _seed(db_manager, content=GUIDE):
+    async with db_manager.get_session() as session:
+        session.add(ProjectTable(id="aave", name="Aave"))
+        session.add(DocumentationTable(
+            id="aave-guide", project_id="aave", title="Guide", url="https://docs.aave.com/guide",
+            doc_type=DocumentationType.DOCS_SITE, scrape_status=ScrapeStatus.SUCCESS, content=content,
+        ))
+        await session.commit()
+
+
+async def test_pages_cover_the_document_on_boundaries(db_manager, monkeypatch):
+    """Following cursors yields the whole text in bounded, boundary-aligned pages, loading each segment once."""
+    await _seed(db_manager)
+    service = CryptoService(db_manager)
+
+    loads = []
+    original_segment_texts = BlobStore.segment_texts
+
+    def segment_texts(connection, content_hash, ordinals):
+        ordinals = list(ordinals)
+        loads.extend(ordinals)
+        return original_segment_texts(connection, content_hash, ordinals)
+
+    monkeypatch.setattr(BlobStore, "segment_texts", staticmethod(segment_texts))
+
+    pages = [await service.read_documentation(DocumentationPageRequest(project_name="Aave", max_chars=500))]
+    while pages[-1].next_cursor:
+        pages.append(await service.read_documentation(
+            DocumentationPageRequest(cursor=pages[-1].next_cursor, max_chars=500)
+        ))
+
+    assert "".join(page.content for page in pages) == GUIDE
+    assert len(pages) > 4 and all(len(page.content) <= 500 for page in pages)
+    assert all(page.content.startswith("## Section") for page in pages)
+    assert pages[-1].offset + len(pages[-1].content) == pages[-1].total_chars
+    assert pages[0].section == "Section 0"
+    assert sorted(loads) == sorted(set(loads))
+
+
+async def test_stale_and_malformed_cursors_are_rejected(db_manager):
+    """A cursor stops working once the document changes."""
+    await _seed(db_manager)
+    service = CryptoService(db_manager)
+    first = await service.read_documentation(DocumentationPageRequest(documentation_id="aave-guide", max_chars=500))
+
+    async with db_manager.get_session() as session:
+        doc = await session.get(DocumentationTable, "aave-guide")
+        doc.content = GUIDE.replace("borrow", "repay")
+        await session.commit()
+
+    with pytest.raises(InvalidCursor):
+        await service.read_documentation(DocumentationPageRequest(cursor=first.next_cursor))
+    with pytest.raises(InvalidCursor):
+        await service.read_documentation(DocumentationPageRequest(cursor="not-a-cursor"))
+
+    short = base64.urlsafe_b64encode(b'["aave-guide","",0]').decode("ascii")
+    with pytest.raises(InvalidCursor):
+        await service.read_documentation(DocumentationPageRequest(cursor=short))
+
+
+async def test_first_pages_share_one_budget(db_manager):
+    """Several documents' first pages fit one budget; the rest are left to their cursors."""
+    await _seed(db_manager)
+    async with db_manager.get_session() as session:
+        session.add_all([
+            DocumentationTable(
+                id=f"aave-{name}", project_id="aave", title=name.title(), url=f"https://docs.aave.com/{name}",
+                doc_type=DocumentationType.DOCS_SITE, scrape_status=ScrapeStatus.SUCCESS, content=content,
+            )
+            for name, content in (("faq", "## FAQ\nShort answers."), ("unscraped", None))
+        ])
+        await session.commit()
+
+    service = CryptoService(db_manager)
+    pages = await service.read_first_pages(["aave-faq", "aave-guide", "aave-unscraped", "aave-guide"], 1000)
+    faq, guide = pages
+    assert faq.content == "## FAQ\nShort answers." and faq.next_cursor is None
+    assert 500 <= len(guide.content) <= 1000 - len(faq.content) and guide.next_cursor
+
+    faq, guide = await service.read_first_pages(["aave-faq", "aave-guide"], 520)
+    assert guide.content == "" and guide.offset == 0
+    rest = await service.read_documentation(DocumentationPageRequest(cursor=guide.next_cursor, max_chars=500))
+    assert GUIDE.startswith(rest.content) and rest.content
@@ -0,0 +1,88 @@
+"""Tests for per-host scraping politeness."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from nyxdocs.config import Settings
+from nyxdocs.scrapers.politeness import DisallowedByRobots, HostScheduler
+
+
+def _scheduler(**overrides):
+    values = {"politeness_initial_per_host": 2, "politeness_max_per_host": 4, "politeness_target_latency": 1.0}
+    values.update(overrides)
+    return HostScheduler(Settings(**values))
+
+
+async def test_concurrency_is_bounded_and_halved_on_throttling():
+    """In-flight requests never exceed the host limit, and a 429 halves it."""
+    running = peak = 0
+    throttle = False
+
+    async def handler(request):
+        nonlocal running, peak
+        if request.url.path == "/robots.txt":
+            return httpx.Response(404)
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return httpx.Response(429 if throttle else 200)
+
+    scheduler = _scheduler()
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        await asyncio.gather(*(scheduler.request(client, "GET", f"https://docs.example.com/{i}") for i in range(12)))
+        assert peak <= 4
+        assert scheduler.limit("docs.example.com") == 4
+        assert scheduler.in_flight() == {}
+
+        throttle = True
+        await scheduler.request(client, "GET", "https://docs.example.com/slow-down")
+        assert scheduler.limit("docs.example.com") == 2
+
+
+async def test_robots_disallow_and_crawl_delay():
+    """Disallowed paths raise before any request; Crawl-delay spaces requests out."""
+    requested = []
+
+    def handler(request):
+        requested.append(request.url.path)
+        if request.url.path == "/robots.txt":
+            return httpx.Response(200, text="User-agent: *\nDisallow: /private\nCrawl-delay: 1\n")
+        return httpx.Response(200)
+
+    scheduler = _scheduler()
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        with pytest.raises(DisallowedByRobots):
+            await scheduler.request(client, "GET", "https://example.org/private/page")
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await asyncio.gather(*(scheduler.request(client, "GET", f"https://example.org/page{i}") for i in range(2)))
+        assert loop.time() - started >= 1
+
+        await scheduler.request(client, "GET", "https://example.org/private/page", respect_robots=False)
+
+    assert requested.count("/robots.txt") == 1
+    assert "/private/page" in requested and requested.index("/private/page") > 1
+
+
+async def test_robots_status_codes():
+    """404 allows everything, 403 nothing, and a 5xx blocks the host only until a retry."""
+    statuses = {"missing.example": 404, "private.example": 403, "flaky.example": 503}
+
+    def handler(request):
+        if request.url.path == "/robots.txt":
+            return httpx.Response(statuses[request.url.host])
+        return httpx.Response(200)
+
+    scheduler = _scheduler(robots_retry_ttl=0)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        assert (await scheduler.request(client, "GET", "https://missing.example/page")).status_code == 200
+        for host in ("private.example", "flaky.example"):
+            with pytest.raises(DisallowedByRobots):
+                await scheduler.request(client, "GET", f"https://{host}/page")
+
+        statuses["flaky.example"] = 404
+        assert (await scheduler.request(client, "GET", "https://flaky.example/page")).status_code == 200
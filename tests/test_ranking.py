@@ -0,0 +1,143 @@
+"""Tests for relevance-ranked project search."""
+
+from collections import Counter
+from pathlib import Path
+
+from nyxdocs.config import Settings
+from nyxdocs.database.models import DocumentationTable, ProjectTable
+from nyxdocs.models import (
+    BlockchainNetwork,
+    DocumentationType,
+    ScrapeStatus,
+    SearchRequest,
+)
+from nyxdocs.services import crypto_service
+from nyxdocs.services.catalog import ProjectCatalog
+from nyxdocs.services.crypto_service import CryptoService
+from nyxdocs.services.ranking import ProjectRanker
+from nyxdocs.utils.bm25 import BM25Index, FieldSpec, tokenize
+
+FIELDS = {"name": FieldSpec(4.0, 0.0), "body": FieldSpec(1.0, 0.75)}
+
+
+def _doc(key, name, body, prior=0.0):
+    return key, {"name": Counter(tokenize(name)), "body": Counter(tokenize(body))}, prior
+
+
+def test_index_ranks_by_relevance_and_survives_a_save(tmp_path):
+    """Rare, focused matches beat incidental ones; the mapped copy ranks the same."""
+    index = BM25Index.build([
+        _doc("aave", "Aave", "Lending protocol. Lending pools let you supply and borrow."),
+        _doc("big", "Bigcoin", "A payments chain. " * 30 + "Some wallets also offer lending.", prior=1.0),
+        _doc("uni", "Uniswap", "Swap tokens against liquidity pools."),
+    ], FIELDS, metadata={"built_at": 1.0})
+
+    assert [key for key, _ in index.rank("lending", prior_weight=0.5)] == ["aave", "big"]
+    assert [key for key, _ in index.rank("uniswap pools")][0] == "uni"
+    assert index.rank("nothing matches") == [] and index.rank("lending", limit=0) == []
+
+    index.save(tmp_path)
+    mapped = BM25Index.load(tmp_path)
+    assert mapped.metadata == {"built_at": 1.0} and len(mapped) == 3
+    assert [key for key, _ in mapped.rank("lending pools", prior_weight=0.5)] == [
+        key for key, _ in index.rank("lending pools", prior_weight=0.5)
+    ]
+
+    (tmp_path / "weights.bin").write_bytes(b"\0" * 3)
+    assert BM25Index.load(tmp_path) is None
+    assert BM25Index.load(tmp_path / "missing") is None
+
+
+def test_index_directory_follows_the_database(tmp_path, monkeypatch):
+    """The index defaults next to a SQLite file and never to the working directory."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    root = tmp_path.resolve()
+    settings = Settings(ranking_index_dir=None)
+
+    assert settings.get_ranking_index_dir("sqlite:////srv/nyx/nyx.db") == Path("/srv/nyx/ranking_index")
+    assert settings.get_ranking_index_dir("sqlite:///data/nyx.db") == root / "data" / "ranking_index"
+    assert settings.get_ranking_index_dir("postgresql://localhost/nyx") == root / "cache" / "nyxdocs" / "ranking_index"
+    assert Settings(ranking_index_dir="index").get_ranking_index_dir() == root / "index"
+
+
+async def test_search_projects_ranks_relevance_over_market_cap(db_manager, tmp_path):
+    """Documentation text counts, market cap is only a prior, and filters still apply."""
+    async with db_manager.get_session() as session:
+        session.add_all([
+            ProjectTable(id="aave", name="Aave", symbol="AAVE", blockchain=BlockchainNetwork.ETHEREUM,
+                         description="Decentralized lending and borrowing", market_cap=2e9),
+            ProjectTable(id="bigcoin", name="Bigcoin", symbol="BIG", blockchain=BlockchainNetwork.ETHEREUM,
+                         description="Payments network. " * 20 + "Wallet partners offer lending.", market_cap=9e11),
+            ProjectTable(id="solend", name="Solend", symbol="SLND", blockchain=BlockchainNetwork.SOLANA,
+                         description="Lending on Solana", market_cap=1e7),
+        ])
+        session.add(DocumentationTable(
+            id="aave-flash", project_id="aave", title="Flash Loans", url="https://docs.aave.com/flash",
+            doc_type=DocumentationType.DOCS_SITE, scrape_status=ScrapeStatus.SUCCESS,
+            content="Flash loans are uncollateralized loans repaid within one transaction.",
+        ))
+        await session.commit()
+
+    ranker = ProjectRanker(db_manager, Settings(ranking_index_dir=str(tmp_path), ranking_market_cap_weight=0.25))
+    await ranker.load()
+    assert (tmp_path / "manifest.json").exists()
+
+    catalog = ProjectCatalog(db_manager)
+    await catalog.load()
+    services = (CryptoService(db_manager, ranker=ranker), CryptoService(db_manager, catalog=catalog, ranker=ranker))
+    for service in services:
+        lending = await service.search_projects(SearchRequest(query="lending"))
+        assert [result.project.id for result in lending.results][-1] == "bigcoin"
+        assert all(result.score for result in lending.results)
+
+        flash = await service.search_projects(SearchRequest(query="uncollateralized flash loans"))
+        assert [result.project.id for result in flash.results] == ["aave"]
+
+        scoped = await service.search_projects(SearchRequest(query="lending", blockchain=BlockchainNetwork.SOLANA))
+        assert [result.project.id for result in scoped.results] == ["solend"]
+
+    # A saved index that is still fresh is mapped rather than rebuilt
+    reloaded = ProjectRanker(db_manager, Settings(ranking_index_dir=str(tmp_path)))
+    await reloaded.load()
+    assert reloaded.index.metadata["built_at"] == ranker.index.metadata["built_at"]
+
+
+async def test_search_merges_substring_matches_and_filters_before_the_cap(db_manager, tmp_path, monkeypatch):
+    """Partial words and unindexed projects still match, and filters never leave a page short."""
+    monkeypatch.setattr(crypto_service, "_RANKED_BATCH", 2)
+    async with db_manager.get_session() as session:
+        session.add_all([
+            ProjectTable(id=f"eth-{i}", name=f"Lender {i}", blockchain=BlockchainNetwork.ETHEREUM,
+                         description="Lending. " * 3 + ("Swap collateral." if i == 0 else ""), market_cap=1e9)
+            for i in range(5)
+        ] + [
+            ProjectTable(id=f"sol-{i}", name=f"Solend {i}", blockchain=BlockchainNetwork.SOLANA,
+                         description="Lending on Solana, plus payments and staking.", market_cap=1e6 * (i + 1))
+            for i in range(3)
+        ] + [
+            ProjectTable(id="uniswap", name="Uniswap", symbol="UNI", blockchain=BlockchainNetwork.ETHEREUM,
+                         description="Automated market maker", market_cap=5e9),
+        ])
+        await session.commit()
+
+    ranker = ProjectRanker(db_manager, Settings(ranking_index_dir=str(tmp_path)))
+    await ranker.load()
+    async with db_manager.get_session() as session:
+        session.add(ProjectTable(id="new-sol", name="Newcomer", blockchain=BlockchainNetwork.SOLANA,
+                                 description="Lending launched today", market_cap=1.0))
+        await session.commit()
+
+    catalog = ProjectCatalog(db_manager)
+    await catalog.load()
+    for service in (CryptoService(db_manager, ranker=ranker), CryptoService(db_manager, catalog=catalog, ranker=ranker)):
+        swap = await service.search_projects(SearchRequest(query="swap"))
+        assert [result.project.id for result in swap.results] == ["eth-0", "uniswap"]
+        assert swap.results[0].score and swap.results[1].score is None
+
+        scoped = await service.search_projects(
+            SearchRequest(query="lending", blockchain=BlockchainNetwork.SOLANA, limit=4)
+        )
+        ids = [result.project.id for result in scoped.results]
+        assert sorted(ids[:3]) == ["sol-0", "sol-1", "sol-2"] and ids[3] == "new-sol"
+        assert all(result.score for result in scoped.results[:3]) and scoped.results[3].score is None
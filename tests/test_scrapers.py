@@ -0,0 +1,202 @@
+"""Tests for documentation scrapers."""
+
+import asyncio
+import re
+from pathlib import Path
+
+import httpx
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from nyxdocs.scrapers import (
+    FetchResult,
+    GitHubScraper,
+    UnsupportedContentType,
+    WebScraper,
+)
+from nyxdocs.scrapers.extraction import extract_html
+from nyxdocs.scrapers.processing import ProcessingStage, ProcessPoolStage, clean_content
+
+FIXTURES = Path(__file__).parent / "fixtures" / "html"
+
+
+class _GitHubApi:
+    """Minimal GitHub API for one repository."""
+
+    def __init__(self, truncated=False):
+        self.truncated = truncated
+        self.calls = []
+
+    def handler(self, request):
+        path = request.url.path
+        self.calls.append(path)
+        if path == "/repos/aave/protocol/commits/HEAD":
+            if request.headers.get("If-None-Match") == '"head-1"':
+                return httpx.Response(304)
+            return httpx.Response(200, text="abc123", headers={"ETag": '"head-1"'})
+        if path == "/repos/aave/protocol/git/trees/abc123":
+            return httpx.Response(200, json={"truncated": self.truncated, "tree": [
+                {"path": "README.md", "type": "blob"},
+                {"path": "README", "type": "blob"},
+                {"path": "src", "type": "tree"},
+                {"path": "docs", "type": "tree"},
+                {"path": "docs/guide.md", "type": "blob"},
+                {"path": "docs/logo.png", "type": "blob"},
+                {"path": "docs/api", "type": "tree"},
+                {"path": "docs/api/index.md", "type": "blob"},
+            ]})
+        if path == "/repos/aave/protocol/contents/README.md":
+            return httpx.Response(200, json={"download_url": "https://raw.example/README.md"})
+        if path == "/repos/aave/protocol/contents/docs":
+            return httpx.Response(200, json=[
+                {"type": "file", "name": "guide.md", "download_url": "https://raw.example/docs/guide.md"},
+            ])
+        return httpx.Response(404)
+
+
+async def _discover(api, times=1):
+    scraper = GitHubScraper()
+    scraper.client = httpx.AsyncClient(transport=httpx.MockTransport(api.handler))
+    try:
+        return [await scraper.discover_docs("https://github.com/aave/protocol") for _ in range(times)]
+    finally:
+        await scraper.client.aclose()
+
+
+async def test_github_discovery_uses_one_tree_call_and_caches_by_sha():
+    """The git tree replaces per-path probes, and an unchanged HEAD reuses the result."""
+    api = _GitHubApi()
+    first, second = await _discover(api, times=2)
+
+    assert [(doc["title"], doc["type"]) for doc in first] == [
+        ("README.md", "readme"), ("docs/guide.md", "docs"),
+    ]
+    assert first[0]["url"] == "https://raw.githubusercontent.com/aave/protocol/HEAD/README.md"
+    assert second == first
+    assert api.calls.count("/repos/aave/protocol/git/trees/abc123") == 1
+    assert not any("/contents/" in path for path in api.calls)
+
+
+async def test_github_discovery_falls_back_to_contents_probes():
+    """A truncated tree falls back to contents probes with the same preferences."""
+    api = _GitHubApi(truncated=True)
+    [docs] = await _discover(api)
+
+    assert [doc["url"] for doc in docs] == ["https://raw.example/README.md", "https://raw.example/docs/guide.md"]
+
+
+def test_extraction_engines_agree_on_fixtures():
+    """The lxml engine extracts exactly what the BeautifulSoup engine does."""
+    pages = sorted(FIXTURES.glob("*.html"))
+    assert pages
+    for page in pages:
+        html = page.read_text(encoding="utf-8")
+        url = f"https://docs.example.com/{page.stem}"
+        assert extract_html(html, url, "lxml") == extract_html(html, url, "html.parser"), page.name
+
+
+def test_extraction_skips_boilerplate():
+    """Navigation, scripts and footers are dropped; the main element wins."""
+    html = (FIXTURES / "docusaurus.html").read_text(encoding="utf-8")
+    title, content = extract_html(html, "https://docs.aave.com/start")
+    assert title == "Getting Started | Aave Docs"
+    assert content.startswith("Getting Started\nAave is a decentralised")
+    assert "Copyright" not in content and "dataLayer" not in content and "Overview" not in content
+    assert extract_html("", "https://docs.aave.com/guides/start", "lxml") == ("start", "")
+
+
+async def test_process_pool_stage_keeps_the_loop_free():
+    """Pooled processing matches in-thread processing while the loop keeps running."""
+    html = (FIXTURES / "docusaurus.html").read_text(encoding="utf-8")
+    body = html.replace("<main>", "<main>" + "<p>Filler paragraph.</p>" * 20000).encode("utf-8")
+    result = FetchResult(url="https://docs.aave.com/start", status_code=200, content=body, encoding="utf-8")
+
+    scraper = WebScraper()
+    scraper.stage = ProcessingStage()
+    inline = await scraper.process(result.url, result)
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    scraper.stage = ProcessPoolStage(1)
+    ticking = asyncio.create_task(ticker())
+    try:
+        pooled = await scraper.process(result.url, result)
+    finally:
+        ticking.cancel()
+        scraper.stage.close()
+
+    assert pooled == inline
+    assert pooled.title == "Getting Started | Aave Docs"
+    assert pooled.content_hash == scraper.calculate_content_hash(pooled.content)
+    assert ticks > 10
+
+
+class _Body(httpx.AsyncByteStream):
+    """Streams fixed chunks and records how many were read."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.read = 0
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+
+async def test_fetch_streams_with_byte_budget_and_content_type_filter(monkeypatch):
+    """Large bodies stop at the budget on a character boundary; binaries are never read."""
+    # "é" is two bytes in UTF-8; the budget falls between them
+    page = _Body([b"<html><head><meta charset='utf-8'></head><body>", "caf\u00e9 ".encode("utf-8") * 1000])
+    pdf = _Body([b"%PDF-1.7"] * 10)
+
+    def handler(request):
+        if request.url.path == "/robots.txt":
+            return httpx.Response(404)
+        if request.url.path == "/manual.pdf":
+            return httpx.Response(200, headers={"Content-Type": "application/pdf"}, stream=pdf)
+        return httpx.Response(200, headers={"Content-Type": "text/html"}, stream=page)
+
+    scraper = WebScraper()
+    monkeypatch.setattr(scraper.settings, "max_download_bytes", 51)
+    scraper.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        result = await scraper.fetch("https://docs.example.com/guide")
+        with pytest.raises(UnsupportedContentType):
+            await scraper.fetch("https://docs.example.com/manual.pdf")
+    finally:
+        await scraper.client.aclose()
+
+    assert result.truncated
+    assert len(result.content) == 50
+    assert result.encoding == "utf-8"
+    assert result.text.endswith("caf")
+    assert pdf.read == 0
+
+
+def _reference_clean_content(content, max_length):
+    """The split/join/regex normalizer clean_content must match exactly."""
+    if not content:
+        return ""
+    cleaned = "\n".join(line.strip() for line in content.split("\n"))
+    cleaned = re.sub(r"\n{3,}", "\n\n", cleaned)
+    if len(cleaned) > max_length:
+        cleaned = cleaned[:max_length] + "\n\n[Content truncated]"
+    return cleaned.strip()
+
+
+_LINE_TEXT = st.text(alphabet=st.sampled_from(["a", "é", " ", "\t", "\r", "\x0b", "\x85", "\u2028", "\n"]))
+
+
+@settings(max_examples=500, deadline=None)
+@given(content=st.one_of(_LINE_TEXT, st.text()), max_length=st.integers(min_value=0, max_value=40))
+def test_clean_content_matches_reference(content, max_length):
+    """The single-pass normalizer is output-identical to the original one."""
+    assert clean_content(content, max_length) == _reference_clean_content(content, max_length)
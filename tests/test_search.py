@@ -0,0 +1,206 @@
+"""Tests for documentation and project search."""
+
+from nyxdocs.database.fulltext import FullTextIndex
+from nyxdocs.database.models import DocumentationTable, ProjectTable
+from nyxdocs.models import (
+    BlockchainNetwork,
+    DocumentationField,
+    DocumentationRequest,
+    DocumentationSearchRequest,
+    DocumentationType,
+    ProjectInfoRequest,
+    ScrapeStatus,
+)
+from nyxdocs.services.crypto_service import CryptoService
+
+
+async def _seed(db_manager):
+    async with db_manager.get_session() as session:
+        session.add_all([
+            ProjectTable(id="aave", name="Aave", symbol="AAVE", blockchain=BlockchainNetwork.ETHEREUM),
+            ProjectTable(id="uniswap", name="Uniswap", symbol="UNI", blockchain=BlockchainNetwork.ETHEREUM),
+        ])
+        session.add_all([
+            DocumentationTable(
+                id="aave-flash", project_id="aave", title="Flash Loans", url="https://docs.aave.com/flash",
+                doc_type=DocumentationType.DOCS_SITE, scrape_status=ScrapeStatus.SUCCESS,
+                content="Flash loans let you borrow any available amount without collateral. "
+                        "The flash loan fee is 0.05% of the borrowed amount.",
+            ),
+            DocumentationTable(
+                id="uni-v3", project_id="uniswap", title="Concentrated Liquidity", url="https://docs.uniswap.org/v3",
+                doc_type=DocumentationType.DOCS_SITE, scrape_status=ScrapeStatus.SUCCESS,
+                content="Liquidity providers can concentrate capital within custom price ranges.",
+            ),
+        ])
+        await session.commit()
+
+
+async def test_search_documentation_ranks_and_highlights(db_manager):
+    """Matches come back with highlighted snippets, scoped by project when asked."""
+    await _seed(db_manager)
+    service = CryptoService(db_manager)
+
+    response = await service.search_documentation(DocumentationSearchRequest(query="flash loan fee"))
+    assert [hit.documentation_id for hit in response.hits] == ["aave-flash"]
+    assert "**fee**" in response.hits[0].snippet
+
+    scoped = await service.search_documentation(
+        DocumentationSearchRequest(query="liquidity", project_name="Aave")
+    )
+    assert scoped.total == 0
+
+
+async def test_search_index_follows_updates_and_deletes(db_manager):
+    """The full-text index is kept in sync by ORM flushes."""
+    await _seed(db_manager)
+    service = CryptoService(db_manager)
+
+    async with db_manager.get_session() as session:
+        doc = await session.get(DocumentationTable, "uni-v3")
+        doc.content = "Hooks allow custom logic around swaps."
+        await session.commit()
+
+    assert (await service.search_documentation(DocumentationSearchRequest(query="price ranges"))).total == 0
+    assert (await service.search_documentation(DocumentationSearchRequest(query="hooks"))).total == 1
+
+    async with db_manager.get_session() as session:
+        await session.delete(await session.get(DocumentationTable, "uni-v3"))
+        await session.commit()
+
+    assert (await service.search_documentation(DocumentationSearchRequest(query="hooks"))).total == 0
+
+
+async def test_search_hits_name_the_matching_section(db_manager):
+    """Long documents are searched per segment and hits carry their heading path."""
+    await _seed(db_manager)
+    filler = "Liquidity is supplied to pools and withdrawn at any time.\n" * 40
+    async with db_manager.get_session() as session:
+        session.add(DocumentationTable(
+            id="aave-guide", project_id="aave", title="Guide", url="https://docs.aave.com/guide",
+            doc_type=DocumentationType.DOCS_SITE, scrape_status=ScrapeStatus.SUCCESS,
+            content=f"# Guide\n\n## Supplying\n\n{filler}\n## Governance\n\n{filler}"
+                    "### Voting\n\nStaked AAVE holders vote on proposals.\n",
+        ))
+        await session.commit()
+
+    service = CryptoService(db_manager)
+    response = await service.search_documentation(DocumentationSearchRequest(query="vote proposals"))
+    assert [(hit.documentation_id, hit.section) for hit in response.hits] == [
+        ("aave-guide", "Guide > Governance > Voting")
+    ]
+
+
+async def test_content_edits_reindex_only_changed_segments(db_manager, monkeypatch):
+    """Editing one section re-indexes that section; moved sections keep their rows."""
+    await _seed(db_manager)
+    sections = [f"## Part {part}\n\n" + f"Part {part} covers collateral factor {part}.\n" * 20 for part in range(8)]
+    async with db_manager.get_session() as session:
+        doc = await session.get(DocumentationTable, "aave-flash")
+        doc.content = "\n".join(sections)
+        await session.commit()
+
+    indexed = []
+    original_index_segments = FullTextIndex.index_segments.__func__
+
+    def index_segments(cls, connection, documentation_id, title, segments):
+        segments = list(segments)
+        indexed.extend(segment.heading_path for segment, _ in segments)
+        return original_index_segments(cls, connection, documentation_id, title, segments)
+
+    monkeypatch.setattr(FullTextIndex, "index_segments", classmethod(index_segments))
+
+    sections[5] = sections[5].replace("collateral factor 5", "liquidation threshold 5")
+    async with db_manager.get_session() as session:
+        doc = await session.get(DocumentationTable, "aave-flash")
+        doc.content = "## Intro\n\n" + "Start here before reading the parts below.\n" * 15 + "\n".join(sections)
+        await session.commit()
+
+    assert sorted(indexed) == ["Intro", "Part 5"]
+    service = CryptoService(db_manager)
+    response = await service.search_documentation(DocumentationSearchRequest(query="liquidation threshold"))
+    assert [hit.section for hit in response.hits] == ["Part 5"]
+    assert (await service.search_documentation(DocumentationSearchRequest(query="collateral factor 5"))).total == 0
+    assert (await service.search_documentation(DocumentationSearchRequest(query="collateral factor 7"))).total == 1
+
+
+async def test_documentation_reads_load_only_requested_fields(db_manager):
+    """Listings skip content; content is loaded only when a reader asks for it."""
+    await _seed(db_manager)
+    service = CryptoService(db_manager)
+
+    info = await service.get_project_info(ProjectInfoRequest(project_name="Aave"))
+    [listed] = info.documentation
+    assert (listed.title, listed.scrape_status, listed.content) == ("Flash Loans", ScrapeStatus.SUCCESS, None)
+
+    dated = await service.get_documentation(
+        DocumentationRequest(project_name="Aave", fields=[DocumentationField.LAST_SCRAPED])
+    )
+    assert dated.documents[0].url == "https://docs.aave.com/flash"
+    assert dated.documents[0].content is None and dated.documents[0].content_hash is None
+
+    full = await service.get_documentation(DocumentationRequest(project_name="Aave"))
+    assert full.documents[0].content.startswith("Flash loans let you borrow")
+    assert full.documents[0].content_hash is not None
+
+
+async def test_project_resolver_cascade(db_manager):
+    """Exact beats prefix beats fuzzy, with deterministic tie-breaking."""
+    from nyxdocs.services.resolver import ProjectResolver
+
+    async with db_manager.get_session() as session:
+        session.add_all([
+            ProjectTable(id="ethereum", name="Ethereum", symbol="ETH", market_cap=4e11),
+            ProjectTable(id="tether", name="Tether", symbol="USDT", market_cap=1e11),
+            ProjectTable(id="ethena", name="Ethena", symbol="ENA", market_cap=5e9),
+            ProjectTable(id="uniswap", name="Uniswap", symbol="UNI", market_cap=6e9),
+        ])
+        await session.commit()
+
+    resolver = ProjectResolver()
+    async with db_manager.get_session() as session:
+        assert await resolver.resolve(session, "ETH") == "ethereum"
+        assert await resolver.resolve(session, "tether") == "tether"
+        assert await resolver.resolve(session, "ethen") == "ethena"
+        assert await resolver.resolve(session, "Uniswapp") == "uniswap"
+        assert await resolver.resolve(session, "zzzz") is None
+
+
+async def test_catalog_matches_database_and_refreshes(db_manager):
+    """Catalog-backed search agrees with the database path and tracks changes."""
+    from nyxdocs.models import SearchRequest
+    from nyxdocs.services.catalog import ProjectCatalog
+
+    await _seed(db_manager)
+    catalog = ProjectCatalog(db_manager)
+    await catalog.load()
+
+    from_db = await CryptoService(db_manager).search_projects(SearchRequest(query="a"))
+    from_catalog = await CryptoService(db_manager, catalog=catalog).search_projects(SearchRequest(query="a"))
+    assert [r.project.id for r in from_catalog.results] == [r.project.id for r in from_db.results]
+    assert [r.documentation_count for r in from_catalog.results] == [r.documentation_count for r in from_db.results]
+    assert [r.documentation_count for r in from_db.results] == [1, 1]
+    assert all(r.last_updated is not None for r in from_db.results)
+
+    async with db_manager.get_session() as session:
+        session.add(ProjectTable(id="curve", name="Curve", symbol="CRV", blockchain=BlockchainNetwork.ETHEREUM))
+        await session.commit()
+
+    assert await catalog.refresh() >= 1
+    assert catalog.get("curve").name == "Curve"
+    curve = await CryptoService(db_manager).search_projects(SearchRequest(query="curve"))
+    assert (curve.results[0].documentation_count, curve.results[0].last_updated) == (0, None)
+    assert catalog.blockchain_counts()[BlockchainNetwork.ETHEREUM] == 3
+
+    # A deletion offset by an insert leaves the row count unchanged
+    async with db_manager.get_session() as session:
+        await session.delete(await session.get(DocumentationTable, "aave-flash"))
+        await session.delete(await session.get(ProjectTable, "curve"))
+        session.add(ProjectTable(id="sushi", name="Sushi", symbol="SUSHI", blockchain=BlockchainNetwork.ETHEREUM))
+        await session.commit()
+
+    await catalog.refresh()
+    assert catalog.get("curve") is None and catalog.get("sushi").name == "Sushi"
+    assert [entry.id for entry in catalog.search("curve")] == []
+    assert catalog.get("aave").doc_count == 0 and catalog.get("aave").docs_updated_at is None
+    assert catalog.blockchain_counts()[BlockchainNetwork.ETHEREUM] == 3
@@ -0,0 +1,80 @@
+"""Tests for heading-aware document segmentation."""
+
+from nyxdocs.utils.diffs import summarize_changes
+from nyxdocs.utils.segments import diff_segments, page_end, split_segments
+
+DOC = (
+    "Intro paragraph.\n\n"
+    "# Guide\n\nOverview of the protocol.\n\n"
+    "## Install\n\n" + "Run the installer and wait.\n" * 30 + "\n"
+    "## Usage\n\nCall deposit().\n\n"
+    "### Errors\n\nReverts on zero amounts.\n"
+)
+
+
+def test_segments_cover_text_under_heading_paths():
+    """Segments are contiguous, bounded, and named by their enclosing headings."""
+    segments = split_segments(DOC, max_chars=300)
+
+    assert "".join(DOC[s.start:s.end] for s in segments) == DOC
+    assert [s.ordinal for s in segments] == list(range(len(segments)))
+    assert all(s.end - s.start <= 300 for s in segments)
+    assert segments[0].heading_path == ""
+    paths = [s.heading_path for s in segments]
+    assert "Guide > Install" in paths and paths[-1] == "Guide > Usage > Errors"
+    install = segments[paths.index("Guide > Install")]
+    assert DOC[install.start:install.end].startswith("## Install")
+
+
+def test_short_sections_merge_and_hashes_are_stable():
+    """Sections under ``min_chars`` fold into the next; unchanged text keeps its hashes."""
+    merged = split_segments(DOC, max_chars=2000, min_chars=100)
+    assert merged[0].heading_path == "" and DOC[merged[0].start:merged[0].end].count("#") > 1
+
+    edited = DOC.replace("Reverts on zero amounts.", "Reverts on zero or dust amounts.")
+    before = [s.segment_hash for s in split_segments(DOC, max_chars=300)]
+    after = [s.segment_hash for s in split_segments(edited, max_chars=300)]
+    assert before[:-1] == after[:-1] and before[-1] != after[-1]
+    assert split_segments("", max_chars=300) == []
+
+
+def test_diff_matches_segments_by_hash_wherever_they_moved():
+    """Moved segments are unchanged; only new and dropped text shows up in the diff."""
+    old = split_segments(DOC, max_chars=300)
+    new = split_segments("# Preface\n\nRead this first.\n\n" + DOC.replace("Call deposit().", "Call supply()."), 300)
+
+    diff = diff_segments(old, new)
+    assert [s.heading_path for s in diff.added] == ["Preface", "Guide > Usage"]
+    assert [s.heading_path for s in diff.removed] == ["", "Guide > Usage"]
+    assert diff.unchanged == len(old) - 2
+
+
+def test_page_end_prefers_headings_then_paragraphs():
+    """Windows end before a heading, else after a blank line, else at a line or word."""
+    text = "intro line\n# Heading\nbody text\n\nnext paragraph words"
+    assert page_end(text, 0, 16) == 11
+    assert page_end(text, 11, 16) == 21
+    assert page_end(text, 21, 16) == 32
+    assert page_end(text, 32, 30) == len(text)
+    assert page_end("word " * 10, 0, 12) == 10
+
+
+def test_change_summary_counts_lines_and_names_sections():
+    """Changed lines are diffed per heading; the summary is cut but the counts are not."""
+    old = split_segments(DOC, max_chars=300)
+    edited = DOC.replace("Call deposit().", "Call supply().\n\nThen stake.")
+    new = split_segments(edited, max_chars=300)
+    diff = diff_segments(old, new)
+
+    summary = summarize_changes(
+        [(s.heading_path, DOC[s.start:s.end]) for s in diff.removed],
+        [(s.heading_path, edited[s.start:s.end]) for s in diff.added],
+        max_chars=2000,
+    )
+    assert (summary.lines_added, summary.lines_removed) == (3, 1)
+    assert summary.headings == ["Guide > Usage"]
+    assert "-Call deposit()." in summary.summary and "+Then stake." in summary.summary
+
+    rewritten = summarize_changes([("", "old line\n" * 50)], [("", "new line\n" * 50)], max_chars=100)
+    assert (rewritten.lines_added, rewritten.lines_removed, rewritten.headings) == (50, 50, ["(top)"])
+    assert len(rewritten.summary) < 140 and rewritten.summary.endswith("more diff lines omitted]")
@@ -0,0 +1,126 @@
+"""Tests for documentation update monitoring."""
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from nyxdocs.database.models import (
+    DocumentationTable,
+    DocumentBlobTable,
+    ProjectTable,
+    UpdateRecordTable,
+)
+from nyxdocs.models import DocumentationType, ScrapeStatus
+from nyxdocs.scrapers import WebScraper
+from nyxdocs.services.cache import ResponseCache
+from nyxdocs.services.job_queue import JOB_COMPLETED, JobQueue, WorkerPool
+from nyxdocs.services.update_service import DocumentationUpdater
+
+
+class _DocsSite:
+    """Serves one page with an ETag and answers conditional requests."""
+
+    def __init__(self):
+        self.version = 1
+        self.conditional = []
+
+    def handler(self, request):
+        if request.url.path == "/robots.txt":
+            return httpx.Response(404)
+        etag = f'"v{self.version}"'
+        self.conditional.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        body = f"<html><title>Guide</title><main><p>Version {self.version} of the guide.</p></main></html>"
+        return httpx.Response(200, text=body, headers={"ETag": etag, "Content-Type": "text/html"})
+
+
+async def test_conditional_rescrape_records_every_check(db_manager):
+    """304s skip extraction but still leave an unchanged update record."""
+    async with db_manager.get_session() as session:
+        session.add(ProjectTable(id="aave", name="Aave"))
+        session.add(DocumentationTable(
+            id="aave-guide", project_id="aave", title="Guide", url="https://docs.aave.com/guide",
+            doc_type=DocumentationType.DOCS_SITE, scrape_status=ScrapeStatus.SUCCESS,
+        ))
+        await session.commit()
+
+    site = _DocsSite()
+    scraper = WebScraper()
+    scraper.client = httpx.AsyncClient(transport=httpx.MockTransport(site.handler))
+    updater = DocumentationUpdater(db_manager, scrapers=[scraper])
+
+    extracted = []
+    original_process = scraper.process
+
+    async def process(url, result):
+        extracted.append(url)
+        return await original_process(url, result)
+
+    scraper.process = process
+
+    try:
+        first = await updater.check("aave-guide")
+        second = await updater.check("aave-guide")
+        site.version = 2
+        third = await updater.check("aave-guide")
+    finally:
+        await scraper.client.aclose()
+
+    assert [first.changes_detected, second.changes_detected, third.changes_detected] == [True, False, True]
+    assert site.conditional == [None, '"v1"', '"v1"']
+    assert len(extracted) == 2
+    assert second.new_hash == first.new_hash
+
+    async with db_manager.get_session() as session:
+        doc = await session.get(DocumentationTable, "aave-guide", options=[
+            selectinload(DocumentationTable.blob).selectinload(DocumentBlobTable.segments)
+        ])
+        assert doc.etag == '"v2"'
+        assert "Version 2" in doc.content
+        records = (await session.scalars(select(UpdateRecordTable))).all()
+        assert sorted(record.changes_detected for record in records) == [False, True, True]
+        diffs = sorted(
+            (record.segments_added, record.segments_removed, record.segments_unchanged)
+            for record in records if record.changes_detected
+        )
+        assert diffs == [(1, 0, 0), (1, 1, 0)]
+    assert (third.segments_removed, third.lines_added, third.lines_removed) == (1, 1, 1)
+    assert third.diff_summary.splitlines()[1:] == ["-Version 1 of the guide.", "+Version 2 of the guide."]
+
+
+async def test_queued_update_invalidates_cached_responses(db_manager):
+    """A change found by a worker-run job drops cached docs and search responses."""
+    async with db_manager.get_session() as session:
+        session.add(ProjectTable(id="aave", name="Aave"))
+        session.add(DocumentationTable(
+            id="aave-guide", project_id="aave", title="Guide", url="https://docs.aave.com/guide",
+            doc_type=DocumentationType.DOCS_SITE, scrape_status=ScrapeStatus.SUCCESS,
+        ))
+        await session.commit()
+
+    cache = ResponseCache(db_manager)
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        return "cached"
+
+    for kind in ("docs", "search", "projects"):
+        await cache.get_or_load(kind, f"{kind}:response", load, str)
+
+    scraper = WebScraper()
+    scraper.client = httpx.AsyncClient(transport=httpx.MockTransport(_DocsSite().handler))
+    updater = DocumentationUpdater(db_manager, scrapers=[scraper], cache=cache)
+    queue = JobQueue(db_manager)
+    await queue.enqueue("update", "aave", "aave-guide")
+    try:
+        await WorkerPool(queue, {"update": updater.handle_job}).run_until_empty()
+    finally:
+        await scraper.client.aclose()
+
+    assert await queue.counts() == {JOB_COMPLETED: 1}
+    for kind in ("docs", "search", "projects"):
+        await cache.get_or_load(kind, f"{kind}:response", load, str)
+    assert calls == 5